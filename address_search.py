@@ -6,10 +6,11 @@ from PyQt5.QtWidgets import (
     QSizePolicy, QProgressBar, QInputDialog, QTabWidget,
     QVBoxLayout, QTextEdit,
     QListWidget, QListWidgetItem, QDialog, QDialogButtonBox, QCompleter, QMenu,
+    QTableView,
 )
 from PyQt5.QtWidgets import QHBoxLayout, QCheckBox
 from PyQt5.QtGui import QColor, QBrush
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QAbstractTableModel, QModelIndex
 import os
 
 import requests
@@ -24,6 +25,21 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 import functools
 import traceback
+import re
+import numpy as np
+import threading
+import contextlib
+import json
+import hashlib
+import io
+import cProfile
+import pstats
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from abc import ABC, abstractmethod
+from requests.adapters import HTTPAdapter
+from html.parser import HTMLParser
+import codecs
 
 
 
@@ -34,7 +50,7 @@ class NumericItem(QTableWidgetItem):
             a = self.data(Qt.UserRole)
             b = other.data(Qt.UserRole)
             if a is not None and b is not None:
-                return int(a) < int(b)
+                return float(a) < float(b)
         except Exception:
             pass
         return super().__lt__(other)
@@ -111,10 +127,3564 @@ class ColumnSearchDialog(QDialog):
         return res
 
 
+class EcosBatchDialog(QDialog):
+    """불러온 통계표들의 세부 항목을 여러 개 골라 한 번에 조회하는 선택 다이얼로그
+
+    catalog: {stat_code: {'name': 통계표명, 'items': [세부항목 info dict(DISPLAY, ITEM_CODE, CYCLE, START_TIME, END_TIME)]}}
+    """
+    def __init__(self, parent, catalog):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.setWindowTitle("여러 항목 조회")
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("조회할 세부 항목 선택 (각 항목의 전체 기간을 조회)"))
+        self.edit = QLineEdit()
+        self.edit.setPlaceholderText("검색어 입력")
+        self.edit.textChanged.connect(self.update_list)
+        layout.addWidget(self.edit)
+        self.listw = QListWidget()
+        layout.addWidget(self.listw)
+        self.chk_plot = QCheckBox("완료 후 차트 생성")
+        self.chk_plot.setChecked(True)
+        layout.addWidget(self.chk_plot)
+        btns = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        btns.accepted.connect(self.accept)
+        btns.rejected.connect(self.reject)
+        layout.addWidget(btns)
+        self.setLayout(layout)
+        self._checked = set()
+        self.update_list()
+
+    def _remember_checks(self):
+        for i in range(self.listw.count()):
+            it = self.listw.item(i)
+            job = it.data(Qt.UserRole)
+            if it.checkState() == Qt.Checked:
+                self._checked.add(job)
+            else:
+                self._checked.discard(job)
+
+    def update_list(self):
+        self._remember_checks()
+        q = (self.edit.text() or "").strip().lower()
+        self.listw.clear()
+        for stat_code, ent in self.catalog.items():
+            for info in ent.get('items', []):
+                label = f"{ent.get('name', stat_code)} :: {info.get('DISPLAY', '')}"
+                if q and q not in label.lower():
+                    continue
+                job = ((stat_code, info.get('ITEM_CODE', ''), info.get('CYCLE', '')), label,
+                       info.get('START_TIME', ''), info.get('END_TIME', ''))
+                it = QListWidgetItem(label)
+                it.setFlags(it.flags() | Qt.ItemIsUserCheckable)
+                it.setCheckState(Qt.Checked if job in self._checked else Qt.Unchecked)
+                it.setData(Qt.UserRole, job)
+                self.listw.addItem(it)
+
+    def selected_jobs(self):
+        self._remember_checks()
+        return sorted(self._checked, key=lambda j: j[1])
+
+
+class CatalogSearchDialog(QDialog):
+    """ECOS·지표누리 통계 목록 통합 검색 (비모달; 결과를 더블클릭/Enter하면 chosen 발생)
+
+    index: CatalogSearchIndex 를 돌려주는 함수 (목록이 갱신되면 새 색인을 받도록 매 검색마다 호출)
+    """
+    chosen = pyqtSignal(object)
+    LIMIT = 200
+
+    def __init__(self, parent, index_fn):
+        super().__init__(parent)
+        self.index_fn = index_fn
+        self.setWindowTitle("통계 검색")
+        self.setModal(False)
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("통계표명 / 세부항목명 / 지표명 검색 (띄어쓰기 무시)"))
+        self.edit = QLineEdit()
+        self.edit.setPlaceholderText("검색어 입력")
+        self.edit.textChanged.connect(self.update_list)
+        self.edit.returnPressed.connect(self._choose_current)
+        layout.addWidget(self.edit)
+        self.listw = QListWidget()
+        self.listw.itemActivated.connect(lambda it: self.chosen.emit(it.data(Qt.UserRole)))
+        layout.addWidget(self.listw)
+        self.lbl_count = QLabel("")
+        layout.addWidget(self.lbl_count)
+        self.setLayout(layout)
+        self.resize(560, 480)
+
+    def update_list(self):
+        q = (self.edit.text() or "").strip()
+        self.listw.clear()
+        if not q:
+            self.lbl_count.setText("")
+            return
+        with perf_metrics.stage('catalog.search') as st:
+            hits = self.index_fn().search(q, self.LIMIT)
+            st['rows'] = len(hits)
+        for score, payload, label in hits:
+            it = QListWidgetItem(label)
+            it.setData(Qt.UserRole, payload)
+            self.listw.addItem(it)
+        if hits:
+            self.listw.setCurrentRow(0)
+        self.lbl_count.setText(f"{len(hits)}건" + (" (상위만 표시)" if len(hits) >= self.LIMIT else ""))
+
+    def _choose_current(self):
+        it = self.listw.currentItem()
+        if it is not None:
+            self.chosen.emit(it.data(Qt.UserRole))
+
+
+class PerfMetrics:
+    """단계별 타이머/카운터/오류 수집기 (워커 스레드에서도 호출되므로 잠금 사용)
+
+    stage(name): with 블록의 소요시간을 기록하고, yield된 dict에 bytes/rows를 넣으면 처리량도 누적
+    incr(name): 재시도/캐시 적중 등 카운터 증가
+    profile(action): 해당 action이 profile_actions에 있으면 cProfile(또는 pyinstrument)로 감싸 결과 보관
+    """
+    PROFILERS = ("cProfile", "pyinstrument")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.profile_actions = set()
+        self.profiler = "cProfile"
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self.counters = {}
+            self.errors = deque(maxlen=200)
+            self.profiles = {}
+            self.started = time.time()
+
+    def record(self, name, seconds, nbytes=0, rows=0):
+        with self._lock:
+            st = self.stages.get(name)
+            if st is None:
+                st = {'count': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0, 'bytes': 0, 'rows': 0}
+                self.stages[name] = st
+            st['count'] += 1
+            st['total'] += seconds
+            st['last'] = seconds
+            if seconds > st['max']:
+                st['max'] = seconds
+            st['bytes'] += int(nbytes or 0)
+            st['rows'] += int(rows or 0)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        info = {'bytes': 0, 'rows': 0}
+        t0 = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.record(name, time.perf_counter() - t0, info.get('bytes', 0), info.get('rows', 0))
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def error(self, where, exc):
+        with self._lock:
+            self.counters[f"error.{where}"] = self.counters.get(f"error.{where}", 0) + 1
+            self.errors.append({'ts': time.time(), 'where': where, 'error': f"{type(exc).__name__}: {exc}"})
+
+    @contextlib.contextmanager
+    def profile(self, action):
+        if action not in self.profile_actions:
+            yield
+            return
+        text = ''
+        if self.profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                Profiler = None
+            if Profiler is not None:
+                prof = Profiler()
+                prof.start()
+                try:
+                    yield
+                finally:
+                    prof.stop()
+                    text = prof.output_text(unicode=True)
+                    self._store_profile(action, "pyinstrument", text)
+                return
+            # pyinstrument 미설치: cProfile로 대체
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:
+            # 다른 프로파일러가 이미 동작 중이면 이번 실행은 측정하지 않음
+            yield
+            return
+        try:
+            yield
+        finally:
+            prof.disable()
+            buf = io.StringIO()
+            pstats.Stats(prof, stream=buf).sort_stats('cumulative').print_stats(30)
+            self._store_profile(action, "cProfile", buf.getvalue())
+
+    def _store_profile(self, action, profiler, text):
+        with self._lock:
+            self.profiles[action] = {'ts': time.time(), 'profiler': profiler, 'text': text}
+
+    def snapshot(self):
+        with self._lock:
+            stages = {}
+            for name, st in self.stages.items():
+                d = dict(st)
+                d['avg'] = st['total'] / st['count'] if st['count'] else 0.0
+                d['rows_per_s'] = st['rows'] / st['total'] if st['total'] > 0 else 0.0
+                stages[name] = d
+            return {
+                'started': self.started,
+                'exported': time.time(),
+                'stages': stages,
+                'counters': dict(self.counters),
+                'errors': list(self.errors),
+                'profiles': {k: dict(v) for k, v in self.profiles.items()},
+            }
+
+    def export_json(self, path):
+        with open(path, 'w', encoding='utf-8') as fw:
+            json.dump(self.snapshot(), fw, ensure_ascii=False, indent=2)
+
+
+perf_metrics = PerfMetrics()
+
+
+def perf_action(action):
+    """GUI 핸들러를 action 단위로 계측 (신호 인자는 원래 함수가 받는 개수만큼만 전달)"""
+    def deco(func):
+        nargs = func.__code__.co_argcount - 1
+
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            with perf_metrics.profile(action), perf_metrics.stage(f"action.{action}"):
+                return func(self, *args[:nargs])
+        return wrapper
+    return deco
+
+
+class AptRowStore:
+    """아파트 실거래 행(list of list)을 열 단위 numpy 배열로 보관하는 타입 저장소
+
+    month: year*12 + (month-1) (파싱 실패 시 -1), price: 거래금액/보증금(만원), rent: 월세(만원),
+    area: 전용면적(㎡), kind: 0=매매 1=전월세, region: regions 목록의 인덱스(sggCd)
+    """
+    KINDS = ("매매", "전월세")
+    RENT_KEYWORDS = ("전세", "월세", "jeonse", "rent", "임대")
+    _NON_DIGIT = re.compile(r"[^0-9]")
+    _DATE_SPLIT = re.compile(r"\D+")
+
+    def __init__(self, month, price, rent, area, kind, region, regions):
+        self.month = month
+        self.price = price
+        self.rent = rent
+        self.area = area
+        self.kind = kind
+        self.region = region
+        self.regions = regions
+        self.size = len(month)
+
+    @classmethod
+    def _to_int(cls, s):
+        if not s:
+            return 0
+        try:
+            return int(s)
+        except ValueError:
+            digits = cls._NON_DIGIT.sub("", s)
+            return int(digits) if digits else 0
+
+    @classmethod
+    def parse_month(cls, s):
+        """'2024-1-5', '2024.01.05', '20240105' 등 -> year*12 + month-1 (실패 시 -1)"""
+        if not s:
+            return -1
+        parts = cls._DATE_SPLIT.split(s.strip())
+        try:
+            if len(parts) >= 2 and len(parts[0]) == 4:
+                y, m = int(parts[0]), int(parts[1])
+            elif len(parts[0]) >= 6:
+                y, m = int(parts[0][:4]), int(parts[0][4:6])
+            else:
+                return -1
+        except ValueError:
+            return -1
+        if not 1 <= m <= 12:
+            return -1
+        return y * 12 + m - 1
+
+    @staticmethod
+    def month_label(ordinal):
+        ordinal = int(ordinal)
+        return f"{ordinal // 12:04d}-{ordinal % 12 + 1:02d}"
+
+    @classmethod
+    def is_rent_text(cls, text):
+        t = (text or "").lower()
+        return any(kw in t for kw in cls.RENT_KEYWORDS)
+
+    @classmethod
+    def from_rows(cls, rows, headers):
+        def col(name, default):
+            try:
+                return headers.index(name)
+            except (ValueError, AttributeError):
+                return default
+
+        i_area = col("전용면적", 2)
+        i_date = col("계약일", 3)
+        i_price = col("거래금액(만원)", 4)
+        i_rent = col("월세(만원)", 5)
+        i_region = col("지역코드", 10)
+        i_type = col("거래유형", 11)
+        n = len(rows)
+        month = np.full(n, -1, dtype=np.int32)
+        price = np.zeros(n, dtype=np.int64)
+        rent = np.zeros(n, dtype=np.int64)
+        area = np.zeros(n, dtype=np.float64)
+        kind = np.zeros(n, dtype=np.int8)
+        region = np.zeros(n, dtype=np.int32)
+        region_ids = {}
+        for r, row in enumerate(rows):
+            m = len(row)
+            month[r] = cls.parse_month(row[i_date] if i_date < m else "")
+            price[r] = cls._to_int(row[i_price] if i_price < m else "")
+            rent[r] = cls._to_int(row[i_rent] if i_rent < m else "")
+            try:
+                area[r] = float(row[i_area]) if i_area < m and row[i_area] else 0.0
+            except ValueError:
+                area[r] = 0.0
+            if i_type < m and cls.is_rent_text(row[i_type]):
+                kind[r] = 1
+            code = (row[i_region] if i_region < m else "") or ""
+            rid = region_ids.get(code)
+            if rid is None:
+                rid = region_ids[code] = len(region_ids)
+            region[r] = rid
+        regions = [None] * len(region_ids)
+        for code, rid in region_ids.items():
+            regions[rid] = code
+        return cls(month, price, rent, area, kind, region, regions)
+
+    @staticmethod
+    def group_quantile(inv, values, ngroups, q):
+        """그룹 번호(inv)별 values의 q 분위수 (numpy 기본과 같은 선형 보간), 빈 그룹은 NaN"""
+        counts = np.bincount(inv, minlength=ngroups)
+        res = np.full(ngroups, np.nan)
+        if not len(values):
+            return res
+        v = values[np.lexsort((values, inv))].astype(np.float64)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        has = counts > 0
+        pos = q * (counts[has] - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        base = starts[has]
+        vlo = v[base + lo]
+        res[has] = vlo + (v[base + hi] - vlo) * (pos - lo)
+        return res
+
+    def aggregate(self, index=None, by=('month', 'kind'), quantiles=(0.5,)):
+        """index(master 행 번호 목록, None이면 전체)를 by 열로 묶어 건수/합계/분위수/㎡당 가격을 한 번에 계산
+
+        반환: by 각 열과 count, sum, area_sum, ppa(합계/면적합), ppa_median, q{NN}, ppa_q{NN}, median 배열을 담은 dict
+        """
+        cols = {'month': self.month, 'kind': self.kind, 'region': self.region,
+                'price': self.price, 'area': self.area}
+        if index is not None:
+            sel = np.asarray(index, dtype=np.int64)
+            cols = {k: v[sel] for k, v in cols.items()}
+        valid = cols['month'] >= 0
+        cols = {k: v[valid] for k, v in cols.items()}
+        price = cols['price'].astype(np.float64)
+        area = cols['area']
+
+        combined = np.zeros(len(price), dtype=np.int64)
+        dims = []
+        for name in by:
+            u, inv = np.unique(cols[name], return_inverse=True)
+            combined = combined * max(1, len(u)) + inv
+            dims.append((name, u))
+        gkeys, ginv = np.unique(combined, return_inverse=True)
+        ng = len(gkeys)
+        out = {}
+        rem = gkeys.copy()
+        for name, u in reversed(dims):
+            size = max(1, len(u))
+            out[name] = u[rem % size] if len(u) else u
+            rem //= size
+        out['count'] = np.bincount(ginv, minlength=ng)
+        out['sum'] = np.bincount(ginv, weights=price, minlength=ng)
+        has_area = area > 0
+        out['area_sum'] = np.bincount(ginv[has_area], weights=area[has_area], minlength=ng)
+        price_with_area = np.bincount(ginv[has_area], weights=price[has_area], minlength=ng)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out['ppa'] = np.where(out['area_sum'] > 0, price_with_area / out['area_sum'], np.nan)
+            ppa_rows = price[has_area] / area[has_area]
+        out['ppa_median'] = self.group_quantile(ginv[has_area], ppa_rows, ng, 0.5)
+        for q in quantiles:
+            out[f"q{int(round(q * 100)):02d}"] = self.group_quantile(ginv, price, ng, q)
+            out[f"ppa_q{int(round(q * 100)):02d}"] = self.group_quantile(ginv[has_area], ppa_rows, ng, q)
+        out['median'] = out['q50'] if 'q50' in out else self.group_quantile(ginv, price, ng, 0.5)
+        return out
+
+    @staticmethod
+    def pivot(agg, row='month', col='kind', field='count', col_values=None, fill=0):
+        """aggregate 결과를 (row 값, col 값, 2차원 배열)로 펼침"""
+        rows_u = np.unique(agg[row])
+        cols_u = np.asarray(list(col_values)) if col_values is not None else np.unique(agg[col])
+        grid = np.full((len(rows_u), len(cols_u)), fill, dtype=np.float64)
+        if len(rows_u) and len(cols_u):
+            ri = np.searchsorted(rows_u, agg[row])
+            ci = np.searchsorted(cols_u, agg[col])
+            ok = (ci < len(cols_u))
+            ok[ok] = cols_u[ci[ok]] == agg[col][ok]
+            grid[ri[ok], ci[ok]] = agg[field][ok]
+        return rows_u, cols_u, grid
+
+
+class QuantileSketch:
+    """KLL 방식의 병합 가능한 스트리밍 분위수 스케치
+
+    레벨 h의 값은 가중치 2^h; 레벨이 용량을 넘으면 정렬 후 한 칸 건너 절반만 위 레벨로 올림.
+    값이 k개 이하이면 정확하고, 그 이상은 순위 오차 약 1/k 수준에서 보관 개수가 ~3k로 고정됨
+    """
+    K = 200
+
+    def __init__(self, k=None):
+        self.k = int(k or self.K)
+        self.levels = [[]]
+        self.n = 0
+        self._flip = False
+
+    def _capacity(self, h):
+        depth = len(self.levels) - h - 1
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def update(self, x):
+        self.levels[0].append(float(x))
+        self.n += 1
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def update_many(self, values):
+        vals = np.asarray(values, dtype=np.float64).ravel()
+        if not len(vals):
+            return
+        self.levels[0].extend(vals.tolist())
+        self.n += len(vals)
+        self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, buf in enumerate(other.levels):
+            self.levels[h].extend(buf)
+        self.n += other.n
+        self._compress()
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            buf = self.levels[h]
+            if len(buf) >= self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append([])
+                buf.sort()
+                keep = [buf.pop()] if len(buf) % 2 else []
+                # 짝/홀 선택을 번갈아 해서 한쪽으로 치우치는 오차를 상쇄
+                self._flip = not self._flip
+                self.levels[h + 1].extend(buf[int(self._flip)::2])
+                self.levels[h] = keep
+            h += 1
+
+    def quantiles(self, qs):
+        if not self.n:
+            return [float('nan')] * len(qs)
+        vals = []
+        wts = []
+        for h, buf in enumerate(self.levels):
+            vals.extend(buf)
+            wts.extend([1 << h] * len(buf))
+        v = np.asarray(vals)
+        order = np.argsort(v, kind='stable')
+        v = v[order]
+        cw = np.cumsum(np.asarray(wts, dtype=np.float64)[order])
+        idx = np.searchsorted(cw, np.asarray(qs, dtype=np.float64) * cw[-1], side='left')
+        return [float(v[min(int(i), len(v) - 1)]) for i in idx]
+
+    def quantile(self, q):
+        return self.quantiles((q,))[0]
+
+
+class _CubeCell:
+    __slots__ = ('count', 'sum', 'min', 'max', 'area_sum', 'area_price_sum', 'price_q', 'ppa_q')
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self.area_sum = 0.0
+        self.area_price_sum = 0.0
+        self.price_q = None  # QuantileSketch: 거래금액(보증금)
+        self.ppa_q = None    # QuantileSketch: ㎡당 가격 (면적 있는 행만)
+
+    def merge(self, other):
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        self.area_sum += other.area_sum
+        self.area_price_sum += other.area_price_sum
+        for name in ('price_q', 'ppa_q'):
+            sk = getattr(other, name)
+            if sk is not None:
+                mine = getattr(self, name)
+                if mine is None:
+                    mine = QuantileSketch(sk.k)
+                    setattr(self, name, mine)
+                mine.merge(sk)
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else float('nan')
+
+    @property
+    def ppa(self):
+        return self.area_price_sum / self.area_sum if self.area_sum > 0 else float('nan')
+
+
+class AptRollupCube:
+    """시군구 × 월 × 거래유형 × 전용면적대 사전 집계 큐브 (행 수집 시 증분 갱신)
+
+    cells: (region sggCd, month ordinal, kind, band) -> _CubeCell(count/sum/min/max/면적합 + 분위수 스케치)
+    rollup(dims, where): 원시 거래를 다시 훑지 않고 셀만 합쳐 원하는 단면을 얻음
+    """
+    DIMS = ('region', 'month', 'kind', 'band')
+    AREA_BANDS = (60.0, 85.0, 135.0)
+    BAND_LABELS = ("60㎡ 이하", "60~85㎡", "85~135㎡", "135㎡ 초과")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.cells = {}
+        self.size = 0
+
+    @classmethod
+    def band_label(cls, band):
+        return cls.BAND_LABELS[band] if 0 <= band < len(cls.BAND_LABELS) else "면적 미상"
+
+    def add_rows(self, rows, headers):
+        store = AptRowStore.from_rows(rows, headers)
+        self.add_store(store)
+
+    def add_store(self, store, index=None):
+        month, price, area, kind, region = store.month, store.price, store.area, store.kind, store.region
+        if index is not None:
+            sel = np.asarray(index, dtype=np.int64)
+            month, price, area, kind, region = month[sel], price[sel], area[sel], kind[sel], region[sel]
+        n_rows = len(month)
+        valid = month >= 0
+        month, price, area, kind, region = month[valid], price[valid], area[valid], kind[valid], region[valid]
+        if len(month):
+            band = np.where(area > 0, np.digitize(area, self.AREA_BANDS, right=True), -1)
+            keys, inv = np.unique(np.stack([region, month, kind, band], axis=1).astype(np.int64),
+                                  axis=0, return_inverse=True)
+            inv = inv.reshape(-1)
+            order = np.argsort(inv, kind='stable')
+            p_sorted = price[order].astype(np.float64)
+            counts = np.bincount(inv, minlength=len(keys))
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            sums = np.bincount(inv, weights=price.astype(np.float64), minlength=len(keys))
+            mins = np.minimum.reduceat(p_sorted, starts)
+            maxs = np.maximum.reduceat(p_sorted, starts)
+            has_area = area > 0
+            area_sums = np.bincount(inv[has_area], weights=area[has_area], minlength=len(keys))
+            area_price = np.bincount(inv[has_area], weights=price[has_area].astype(np.float64), minlength=len(keys))
+            # ㎡당 가격도 셀 순서로 정렬해 두고 구간별로 스케치에 투입
+            inv_a = inv[has_area]
+            order_a = np.argsort(inv_a, kind='stable')
+            ppa_sorted = (price[has_area] / area[has_area])[order_a]
+            counts_a = np.bincount(inv_a, minlength=len(keys))
+            starts_a = np.concatenate(([0], np.cumsum(counts_a)[:-1]))
+            batch = []
+            for g, (rid, m, k, b) in enumerate(keys.tolist()):
+                cell = _CubeCell()
+                cell.count = int(counts[g])
+                cell.sum = float(sums[g])
+                cell.min = float(mins[g])
+                cell.max = float(maxs[g])
+                cell.area_sum = float(area_sums[g])
+                cell.area_price_sum = float(area_price[g])
+                cell.price_q = QuantileSketch()
+                cell.price_q.update_many(p_sorted[starts[g]:starts[g] + counts[g]])
+                if counts_a[g]:
+                    cell.ppa_q = QuantileSketch()
+                    cell.ppa_q.update_many(ppa_sorted[starts_a[g]:starts_a[g] + counts_a[g]])
+                batch.append(((store.regions[rid], m, k, b), cell))
+        else:
+            batch = []
+        with self._lock:
+            for key, cell in batch:
+                cur = self.cells.get(key)
+                if cur is None:
+                    self.cells[key] = cell
+                else:
+                    cur.merge(cell)
+            self.size += n_rows
+
+    def rollup(self, dims, where=None):
+        """dims 순서의 키 튜플 -> 합쳐진 _CubeCell; where={'kind': {0}} 처럼 차원별 허용값 지정"""
+        pos = [self.DIMS.index(d) for d in dims]
+        conds = [(self.DIMS.index(d), set(v)) for d, v in (where or {}).items()]
+        with self._lock:
+            items = list(self.cells.items())
+        out = {}
+        for key, cell in items:
+            if any(key[i] not in allowed for i, allowed in conds):
+                continue
+            k = tuple(key[i] for i in pos)
+            acc = out.get(k)
+            if acc is None:
+                acc = out[k] = _CubeCell()
+            acc.merge(cell)
+        return out
+
+
+class RtmsEndpoint:
+    """국토교통부 실거래가 API 한 종류의 스키마: 서비스 이름 + 결과 표 열(apt_default_headers) <- XML 태그 후보
+
+    모든 종류가 같은 열 배치의 행을 만들고 마지막 '부동산유형' 열에 종류(세부 유형)를 적는다.
+    이름 열(아파트명)에는 단지/건물명(없으면 지목·건물용도), 전용면적 열에는 그 종류의 대표 면적을 넣음.
+    """
+    BASE = 'https://apis.data.go.kr/1613000'
+    TYPE_COLUMN = '부동산유형'
+    COMMON = {
+        '층': ('floor', '층'),
+        '건축년도': ('buildYear', '건축년도'),
+        '법정동': ('umdNm', '법정동'),
+        '지번': ('jibun', '지번'),
+        '지역코드': ('sggCd', '지역코드'),
+        '거래유형': ('dealingGbn', 'tradeType', '거래유형', 'dealType'),
+        '중개사소재지': ('estateAgentSggNm', 'bcnstAddr', 'brokerAddr', '중개사소재지'),
+        '등기일자': ('rgstDate', 'registDay', '등기일자', 'registrationDate'),
+        '거래주체_매도자': ('slerGbn', 'seller', '거래주체정보_매도자', '매도자', 'tradePartSeller'),
+        '거래주체_매수자': ('buyerGbn', 'buyer', '거래주체정보_매수자', '매수자', 'tradePartBuyer'),
+    }
+    TRADE = {'거래금액(만원)': ('dealAmount', '거래금액')}
+    RENT = {
+        '거래금액(만원)': ('deposit', '보증금', '전세금', 'rentMoney', 'depositAmount'),
+        '월세(만원)': ('monthlyRent', '월세', 'rentFee'),
+        '계약기간': ('contractTerm', '계약기간'),
+        'ContractType': ('contractType', 'ContractType'),
+        '갱신권사용': ('useRRRight', '갱신권사용'),
+        '종전보증금': ('preDeposit', '종전보증금'),
+        '종전월세': ('preMonthlyRent', '종전월세'),
+    }
+    AMOUNT_COLUMNS = ('거래금액(만원)', '월세(만원)')
+    # 종류: (이름 태그, 면적 태그, 세부 유형 태그, 매매 서비스, 전월세 서비스 또는 None, 종류별 추가 열)
+    TYPES = (
+        ('아파트', ('aptNm', 'aptName', '단지명'), ('excluUseAr', '전용면적'), (),
+         'RTMSDataSvcAptTrade', 'RTMSDataSvcAptRent',
+         {'아파트동': ('aptDong', '단지동', '동', 'apt_dong'),
+          '토지임대부여부': ('landLeaseholdGbn', 'rentYn', '토지임대부', 'landLease', 'isLandLeaseApt')}),
+        ('오피스텔', ('offiNm', '단지명'), ('excluUseAr', '전용면적'), (),
+         'RTMSDataSvcOffiTrade', 'RTMSDataSvcOffiRent', {}),
+        ('연립다세대', ('mhouseNm', '연립다세대'), ('excluUseAr', '전용면적'), ('houseType',),
+         'RTMSDataSvcRHTrade', 'RTMSDataSvcRHRent', {}),
+        ('단독다가구', (), ('totalFloorAr', '연면적'), ('houseType',),
+         'RTMSDataSvcSHTrade', 'RTMSDataSvcSHRent', {}),
+        ('토지', ('jimok', '지목'), ('dealArea', '거래면적'), ('landUse', '용도지역'),
+         'RTMSDataSvcLandTrade', None, {}),
+        ('상업업무용', ('buildingUse', '건물주용도'), ('buildingAr', '건물면적'), ('buildingType', '유형'),
+         'RTMSDataSvcNrgTrade', None, {}),
+        ('분양권', ('aptNm', '단지'), ('excluUseAr', '전용면적'), ('ownershipGbn', '구분'),
+         'RTMSDataSvcSilvTrade', None, {}),
+    )
+    TYPE_NAMES = tuple(t[0] for t in TYPES)
+    _NON_DIGIT = re.compile(r"[^0-9]")
+    _YMD = re.compile(r"^(\d{2}|\d{4})[.\-/](\d{1,2})[.\-/](\d{1,2})$")
+
+    def __init__(self, type_name, service, rent, fields, subtype):
+        self.type_name = type_name
+        self.service = service
+        self.rent = rent
+        self.fields = fields
+        self.subtype = subtype
+
+    def __repr__(self):
+        return f"RtmsEndpoint({self.service})"
+
+    @property
+    def url(self):
+        return f"{self.BASE}/{self.service}/get{self.service}"
+
+    @classmethod
+    def for_types(cls, type_names, include_rent=False):
+        """선택한 종류 -> 엔드포인트 목록 (매매는 항상, 전월세는 include_rent이고 API가 있을 때)"""
+        out = []
+        for name, name_tags, area_tags, subtype, trade, rent, extra in cls.TYPES:
+            if name not in type_names:
+                continue
+            for service, is_rent in ((trade, False), (rent, True)):
+                if not service or (is_rent and not include_rent):
+                    continue
+                fields = dict(cls.COMMON)
+                fields.update(cls.RENT if is_rent else cls.TRADE)
+                fields.update(extra)
+                fields['아파트명'] = name_tags
+                fields['전용면적'] = area_tags
+                if is_rent:
+                    fields.pop('거래유형', None)
+                out.append(cls(name, service, is_rent, fields, subtype))
+        return out
+
+    @classmethod
+    def _norm_rgst(cls, s):
+        m = cls._YMD.match((s or '').strip())
+        if not m:
+            return (s or '').strip()
+        yyyy = int(m.group(1))
+        yyyy = 2000 + yyyy if yyyy < 100 else yyyy
+        return f"{yyyy:04d}-{int(m.group(2)):02d}-{int(m.group(3)):02d}"
+
+    def row(self, item, headers):
+        """<item> 요소 -> headers 순서의 행 (마지막 부동산유형 열 포함)"""
+        tags = {c.tag: (c.text or '').strip() for c in item}
+
+        def first(cands):
+            return next((tags[c] for c in cands if tags.get(c)), '')
+
+        out = []
+        for h in headers:
+            if h == '계약일':
+                v = f"{tags.get('dealYear', '')}-{tags.get('dealMonth', '')}-{tags.get('dealDay', '')}"
+            elif h == self.TYPE_COLUMN:
+                sub = first(self.subtype)
+                v = f"{self.type_name}({sub})" if sub else self.type_name
+            elif h == '거래유형' and self.rent:
+                v = '전월세'
+            else:
+                v = first(self.fields.get(h, ()))
+                if h in self.AMOUNT_COLUMNS:
+                    v = self._NON_DIGIT.sub('', v)
+                elif h == '등기일자':
+                    v = self._norm_rgst(v)
+            out.append(v)
+        return out
+
+
+class RtmsCache:
+    """실거래가 응답 디스크 캐시: (서비스, 지역코드, 계약년월)마다 변환된 행 JSON 한 개
+
+    신고기한(계약 후 30일)과 정정·해제 반영 여유를 두고, 계약월이 끝난 뒤 FINAL_DAYS가 지나서 저장한
+    달은 다시 받지 않음. 그보다 최근 달은 TTL 동안만 재사용.
+    """
+    VERSION = 1
+    DIRNAME = 'rtms_cache'
+    TTL = 12 * 3600
+    FINAL_DAYS = 90
+    VOLUME_FILE = 'volume.json'
+
+    def __init__(self, dirpath=None):
+        self.dirpath = dirpath or os.path.join(os.getcwd(), self.DIRNAME)
+        self._lock = threading.Lock()
+        self._volume = None  # {서비스: {지역코드: 월평균 행 수}} — 일괄 조회 계획의 부하 추정용
+
+    def _path(self, service, lawd, ym):
+        return os.path.join(self.dirpath, f"{service}_{lawd}_{ym}.json")
+
+    @classmethod
+    def _final_after(cls, ym):
+        y, m = int(ym[:4]), int(ym[4:6])
+        month_end = datetime.datetime(y + m // 12, m % 12 + 1, 1)
+        return (month_end + datetime.timedelta(days=cls.FINAL_DAYS)).timestamp()
+
+    def load(self, service, lawd, ym, headers):
+        """최신 캐시 행 또는 None (열 배치가 다르면 None)"""
+        try:
+            with open(self._path(service, lawd, ym), encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            return None
+        if data.get('version') != RtmsCache.VERSION or data.get('headers') != list(headers):
+            return None
+        saved = data.get('saved', 0)
+        try:
+            final = saved >= self._final_after(ym)
+        except ValueError:
+            final = False
+        if not final and time.time() - saved > self.TTL:
+            return None
+        return data.get('rows')
+
+    def fresh(self, service, lawd, ym):
+        """파일을 열지 않고 수정 시각만으로 load()가 재사용할지 추정 (계획용)"""
+        try:
+            mtime = os.path.getmtime(self._path(service, lawd, ym))
+        except OSError:
+            return False
+        try:
+            if mtime >= self._final_after(ym):
+                return True
+        except ValueError:
+            pass
+        return time.time() - mtime <= self.TTL
+
+    def _load_volume(self):
+        if self._volume is None:
+            try:
+                with open(os.path.join(self.dirpath, self.VOLUME_FILE), encoding='utf-8') as f:
+                    self._volume = json.load(f)
+            except Exception:
+                self._volume = {}
+        return self._volume
+
+    def volume(self, service, lawd=None):
+        """지역의 월평균 거래 행 수 (lawd 생략 시 그 서비스의 {지역코드: 행 수})"""
+        with self._lock:
+            vol = self._load_volume().get(service, {})
+            return dict(vol) if lawd is None else vol.get(lawd)
+
+    def record_volume(self, service, lawd, n):
+        with self._lock:
+            vol = self._load_volume().setdefault(service, {})
+            old = vol.get(lawd)
+            # 지수 평균: 같은 달을 다시 받아도 값이 한쪽으로 쌓이지 않게
+            vol[lawd] = n if old is None else round(0.7 * old + 0.3 * n, 1)
+
+    def save_volume(self):
+        with self._lock:
+            if self._volume is None:
+                return
+            os.makedirs(self.dirpath, exist_ok=True)
+            path = os.path.join(self.dirpath, self.VOLUME_FILE)
+            with open(path + '.tmp', 'w', encoding='utf-8') as fw:
+                json.dump(self._volume, fw, ensure_ascii=False)
+            os.replace(path + '.tmp', path)
+
+    def save(self, service, lawd, ym, headers, rows):
+        os.makedirs(self.dirpath, exist_ok=True)
+        path = self._path(service, lawd, ym)
+        data = {'version': self.VERSION, 'saved': time.time(), 'headers': list(headers), 'rows': rows}
+        with open(path + '.tmp', 'w', encoding='utf-8') as fw:
+            json.dump(data, fw, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+
+
+class RtmsApiError(Exception):
+    """실거래가 API가 resultCode 오류(또는 게이트웨이 returnReasonCode)를 돌려준 경우"""
+
+
+class RtmsQuotaError(RtmsApiError):
+    """키 단위 오류(일일 한도 초과, 미등록/만료 키, 401/403 등) — 다른 키로는 다시 시도할 수 있음
+
+    429/5xx 같은 일시적 제한은 여기에 넣지 않음 (RtmsClient가 같은 키로 잠시 뒤 재시도)
+    """
+
+
+class ServiceKeyPool:
+    """공공데이터포털 인증키 여러 개의 일일 사용량을 나눠 관리
+
+    acquire(서비스): 그 서비스(API)를 오늘 가장 적게 쓴 키를 골라 1회 사용으로 기록. 서버가 한도 초과/키 오류를
+    알려 exhaust()된 키만 다음 날까지 제외하고, 남은 키가 없으면 RtmsQuotaError.
+    quota(DAILY_QUOTA)는 남은 호출 수/필요 일수 계산에만 쓰는 추정치라 요청을 막지 않음
+    (승인 트래픽이 더 큰 키는 서버가 받아 주는 만큼 계속 사용).
+    사용량은 날짜별로 FILE에 저장(키는 해시로만 기록)해 재실행해도 이어서 계산.
+    """
+    FILE = 'key_usage.json'
+    DAILY_QUOTA = 10000  # 공공데이터포털 개발계정 기본 일일 트래픽 (API(서비스)별), 계획용
+    SAVE_EVERY = 50
+
+    def __init__(self, keys=(), path=None, quota=None):
+        self.path = path or os.path.join(os.getcwd(), self.FILE)
+        self.quota = quota or self.DAILY_QUOTA
+        self._lock = threading.Lock()
+        self._day = None
+        self._usage = {}  # {키 해시: {서비스: 사용 횟수}}
+        self._exhausted = {}  # {키 해시: [서버가 한도/키 오류를 알린 서비스]}
+        self._dirty = 0
+        self.keys = []
+        self.set_keys(keys)
+
+    @staticmethod
+    def parse(text):
+        """입력창 문자열 -> 키 목록 (쉼표/세미콜론/공백 구분)"""
+        return [k for k in re.split(r'[\s,;]+', text or '') if k]
+
+    @staticmethod
+    def _id(key):
+        # 인코딩/디코딩된 같은 키를 같은 키로 취급
+        return hashlib.sha1(requests.utils.unquote(key).encode('utf-8')).hexdigest()[:12]
+
+    def set_keys(self, keys):
+        seen = set()
+        out = []
+        for k in keys:
+            kid = self._id(k)
+            if kid not in seen:
+                seen.add(kid)
+                out.append(k)
+        with self._lock:
+            self.keys = out
+
+    def _today_locked(self):
+        today = datetime.date.today().isoformat()
+        if self._day != today:
+            usage, exhausted = {}, {}
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('day') == today:
+                    usage = data.get('usage') or {}
+                    exhausted = data.get('exhausted') or {}
+            except Exception:
+                pass
+            self._day, self._usage, self._exhausted, self._dirty = today, usage, exhausted, 0
+        return self._usage
+
+    def _open_locked(self, key, service):
+        return service not in self._exhausted.get(self._id(key), ())
+
+    def _save_locked(self):
+        if self._day is None:
+            return
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as fw:
+            json.dump({'day': self._day, 'usage': self._usage, 'exhausted': self._exhausted}, fw)
+        os.replace(self.path + '.tmp', self.path)
+        self._dirty = 0
+
+    def used(self, key, service):
+        with self._lock:
+            return self._today_locked().get(self._id(key), {}).get(service, 0)
+
+    def remaining(self, service):
+        """오늘 남은 호출 수 추정 (quota 기준, exhaust()된 키는 0, 모든 키 합)"""
+        with self._lock:
+            usage = self._today_locked()
+            return sum(max(0, self.quota - usage.get(self._id(k), {}).get(service, 0))
+                       for k in self.keys if self._open_locked(k, service))
+
+    def capacity(self):
+        """하루 호출 가능 수 (서비스별, 모든 키 합)"""
+        return self.quota * len(self.keys)
+
+    def acquire(self, service):
+        with self._lock:
+            usage = self._today_locked()
+            best, best_used = None, None
+            for k in self.keys:
+                if not self._open_locked(k, service):
+                    continue
+                n = usage.get(self._id(k), {}).get(service, 0)
+                if best is None or n < best_used:
+                    best, best_used = k, n
+            if best is None:
+                raise RtmsQuotaError(f"모든 인증키가 오늘 한도 초과/키 오류로 제외됐습니다 ({service})")
+            usage.setdefault(self._id(best), {})[service] = best_used + 1
+            self._dirty += 1
+            if self._dirty >= self.SAVE_EVERY:
+                try:
+                    self._save_locked()
+                except Exception as e:
+                    perf_metrics.error('apt.key_usage', e)
+            return best
+
+    def exhaust(self, key, service):
+        """한도 초과/키 오류 응답을 받은 키를 오늘 그 서비스에서 제외"""
+        with self._lock:
+            self._today_locked()
+            services = self._exhausted.setdefault(self._id(key), [])
+            if service not in services:
+                services.append(service)
+                self._dirty += 1
+
+    def save(self):
+        with self._lock:
+            if self._dirty:
+                self._save_locked()
+
+
+class RtmsClient:
+    """국토교통부 실거래가 API 클라이언트: (엔드포인트, 지역코드, 계약년월) 한 건을 페이지 끝까지 받아 행으로 변환
+
+    연결은 Session 하나를 여러 작업 스레드가 공유(POOL_SIZE), 결과는 RtmsCache에 저장/재사용.
+    페이지마다 ServiceKeyPool에서 키를 받고, 키 단위 오류면 그 키를 빼고 다음 키로 같은 페이지를 다시 요청
+    (페이지당 키 수만큼만). 429(초당 호출 제한)와 5xx는 키 문제가 아니므로 같은 키로 RETRIES번까지
+    Retry-After(없으면 지수 대기)를 지켜 다시 요청하고, 그래도 안 되면 일반 오류로 끝냄.
+    """
+    PAGE_SIZE = 1000
+    POOL_SIZE = 8
+    OK_CODES = ('00', '000')
+    NO_DATA_CODES = ('03',)
+    # 20 접근거부, 22 요청 한도 초과, 30 미등록 키, 31 기한 만료, 32 미등록 IP
+    KEY_ERROR_CODES = ('20', '22', '30', '31', '32')
+    KEY_ERROR_STATUS = (401, 403)  # 새 게이트웨이의 미등록/권한 없는 키
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+    RETRIES = 4
+    BACKOFF = 1.0
+    MAX_BACKOFF = 30.0
+    DEBUG_DUMP = False  # True: 모든 응답을 debug_logs에 저장 (오류 응답은 항상 저장)
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+        "Accept": "application/xml, text/xml, */*;q=0.01",
+    }
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.session = requests.Session()
+        self.session.headers.update(self.HEADERS)
+        self.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=self.POOL_SIZE))
+
+    @staticmethod
+    def _dump(endpoint, lawd, ym, page, resp):
+        try:
+            logs_dir = os.path.join(os.getcwd(), "debug_logs")
+            os.makedirs(logs_dir, exist_ok=True)
+            base = os.path.join(logs_dir, f"debug_response_{endpoint.service}_{lawd}_{ym}_p{page}_{int(time.time())}")
+            with open(base + ".xml", "wb") as fw:
+                fw.write(resp.content)
+            with open(base + ".meta.txt", "w", encoding='utf-8') as fm:
+                fm.write(f"url: {resp.url}\nstatus: {resp.status_code}\nheaders: {dict(resp.headers)}\n")
+        except Exception as e:
+            perf_metrics.error('apt.debug_dump', e)
+
+    @classmethod
+    def _retry_delay(cls, resp, attempt):
+        """Retry-After(초 또는 HTTP 날짜) 우선, 없으면 BACKOFF * 2^attempt; MAX_BACKOFF로 제한"""
+        delay = cls.BACKOFF * (2 ** attempt)
+        ra = (resp.headers.get('Retry-After') or '').strip()
+        if ra:
+            try:
+                delay = float(ra)
+            except ValueError:
+                try:
+                    from email.utils import parsedate_to_datetime
+                    delay = parsedate_to_datetime(ra).timestamp() - time.time()
+                except Exception:
+                    pass
+        return max(0.0, min(delay, cls.MAX_BACKOFF))
+
+    def get_page(self, endpoint, service_key, lawd, ym, page):
+        """한 페이지 요청 -> (item 요소 목록, totalCount 또는 None)"""
+        params = {
+            "serviceKey": requests.utils.unquote(service_key),
+            "LAWD_CD": lawd,
+            "DEAL_YMD": ym,
+            "pageNo": str(page),
+            "numOfRows": str(self.PAGE_SIZE),
+        }
+        with perf_metrics.stage('apt.request') as st:
+            for attempt in range(self.RETRIES + 1):
+                resp = self.session.get(endpoint.url, params=params, timeout=30)
+                if resp.status_code not in self.RETRY_STATUS or attempt == self.RETRIES:
+                    break
+                perf_metrics.incr('apt.request.retry')
+                time.sleep(self._retry_delay(resp, attempt))
+            if resp.status_code in self.KEY_ERROR_STATUS:
+                raise RtmsQuotaError(f"{resp.status_code} 인증키 거부 ({endpoint.service})")
+            resp.raise_for_status()
+            st['bytes'] = len(resp.content)
+        if self.DEBUG_DUMP:
+            self._dump(endpoint, lawd, ym, page, resp)
+        try:
+            root = ET.fromstring(resp.content)
+        except Exception as e:
+            self._dump(endpoint, lawd, ym, page, resp)
+            raise RtmsApiError(f"XML parse error ({endpoint.type_name} {lawd} {ym} p{page}): {e}")
+        code = (root.findtext('header/resultCode') or '').strip()
+        reason = (root.findtext('.//returnReasonCode') or '').strip()
+        if not reason and code in self.NO_DATA_CODES:
+            return [], 0
+        if reason or (code and code not in self.OK_CODES):
+            self._dump(endpoint, lawd, ym, page, resp)
+            msg = root.findtext('header/resultMsg') or root.findtext('.//returnAuthMsg') or ''
+            err = RtmsQuotaError if (reason or code).lstrip('0').zfill(2) in self.KEY_ERROR_CODES else RtmsApiError
+            raise err(f"{code or reason} {msg.strip()}".strip())
+        total = root.findtext('body/totalCount')
+        try:
+            total = int(total)
+        except (TypeError, ValueError):
+            total = None
+        return root.findall("body/items/item"), total
+
+    def get_page_pooled(self, endpoint, keys, lawd, ym, page):
+        """get_page를 키 풀로: 키 단위 오류면 그 키를 제외하고 다른 키로 재시도
+
+        한 페이지에 키 수만큼만 시도 (acquire가 매번 사용량을 세므로 같은 페이지가 모든 키 한도를 깎지 않도록).
+        모두 실패하거나 남은 키가 없으면 RtmsQuotaError.
+        """
+        err = None
+        for _ in range(max(1, len(keys.keys))):
+            key = keys.acquire(endpoint.service)
+            try:
+                return self.get_page(endpoint, key, lawd, ym, page)
+            except RtmsQuotaError as e:
+                perf_metrics.error('apt.key_exhausted', e)
+                keys.exhaust(key, endpoint.service)
+                err = e
+        raise err
+
+    def fetch(self, endpoint, keys, lawd, ym, headers):
+        """한 건의 전체 행 -> (행 목록, 새로 받았으면 True); 캐시에 있으면 요청하지 않음 (keys: ServiceKeyPool)"""
+        if self.cache is not None:
+            rows = self.cache.load(endpoint.service, lawd, ym, headers)
+            if rows is not None:
+                perf_metrics.incr('apt.cache.hit')
+                return rows, False
+        rows = []
+        page = 1
+        while True:
+            items, total = self.get_page_pooled(endpoint, keys, lawd, ym, page)
+            with perf_metrics.stage('apt.parse') as st:
+                rows.extend(endpoint.row(it, headers) for it in items)
+                st['rows'] = len(items)
+            # totalCount가 없으면 한 페이지가 가득 찼는지로 판단
+            if not items or len(items) < self.PAGE_SIZE or (total is not None and page * self.PAGE_SIZE >= total):
+                break
+            page += 1
+        if self.cache is not None:
+            self.cache.record_volume(endpoint.service, lawd, len(rows))
+            try:
+                self.cache.save(endpoint.service, lawd, ym, headers, rows)
+            except Exception as e:
+                perf_metrics.error('apt.cache.save', e)
+        return rows, True
+
+
+class RtmsBulkPlanner:
+    """전국 일괄 조회 계획: 전체 시군구 지역코드 x 계약년월 x 엔드포인트 작업 목록과 호출 수 추정
+
+    지역코드는 브이월드 행정코드(시도 -> 시군구)에서 받아 LAWD_FILE에 보관(LAWD_TTL).
+    작업은 예상 행 수(RtmsCache.volume 월평균, 모르면 그 서비스의 중앙값)가 큰 것부터 정렬:
+    스레드 풀이 비는 순서대로 가져가므로 가장 큰 작업이 마지막에 홀로 남는 일을 줄임(LPT).
+    캐시가 최신인 작업은 호출 0건으로 보고 맨 뒤에 둠.
+    """
+    LAWD_FILE = 'lawd_codes.json'
+    LAWD_TTL = 30 * 24 * 3600
+    VWORLD_BASE = 'http://api.vworld.kr/ned/data'
+
+    def __init__(self, cache, path=None):
+        self.cache = cache
+        self.path = path or os.path.join(os.getcwd(), self.LAWD_FILE)
+
+    @staticmethod
+    def leaf_codes(pairs):
+        """(이름, 행정코드) -> 중복 없는 5자리 지역코드 [(코드, 이름)]; 구가 있는 시(41110 수원시 등)는 구만 남김"""
+        out = {}
+        for name, code in pairs:
+            c = (code or '')[:5]
+            if len(c) == 5 and c.isdigit() and not c.endswith('000'):
+                out.setdefault(c, name or '')
+        parents = {c for c in out if c[4] == '0' and any(o != c and o[:4] == c[:4] for o in out)}
+        return sorted((c, n) for c, n in out.items() if c not in parents)
+
+    def lawd_codes(self, vworld_key, refresh=False):
+        if not refresh:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    data = json.load(f)
+                if time.time() - data.get('saved', 0) <= self.LAWD_TTL and data.get('codes'):
+                    return [tuple(c) for c in data['codes']]
+            except Exception:
+                pass
+        with requests.Session() as sess:
+            def _pairs(service, **params):
+                params.update({'key': vworld_key, 'format': 'json', 'numOfRows': '1000', 'pageNo': '1'})
+                resp = sess.get(f"{self.VWORLD_BASE}/{service}", params=params, timeout=10)
+                resp.raise_for_status()
+                out = []
+
+                def _walk(obj):
+                    if isinstance(obj, dict):
+                        if obj.get('admCode'):
+                            out.append((obj.get('lowestAdmCodeNm') or obj.get('admCodeNm'), obj['admCode']))
+                        for v in obj.values():
+                            _walk(v)
+                    elif isinstance(obj, list):
+                        for v in obj:
+                            _walk(v)
+
+                _walk(resp.json())
+                return out
+
+            pairs = []
+            for _, sido in _pairs('admCodeList'):
+                if sido:
+                    pairs.extend(_pairs('admSiList', admCode=sido[:2]))
+        codes = self.leaf_codes(pairs)
+        if not codes:
+            raise ValueError("시군구 지역코드를 받지 못했습니다.")
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as fw:
+            json.dump({'saved': time.time(), 'codes': codes}, fw, ensure_ascii=False)
+        os.replace(self.path + '.tmp', self.path)
+        return codes
+
+    @staticmethod
+    def days_needed(calls, service, keys=None):
+        """예상 호출 수 -> 필요 일수 (keys가 있으면 오늘 남은 한도 + 키 수만큼의 하루 한도로 계산)"""
+        if calls <= 0:
+            return 0
+        if keys is None or not keys.keys:
+            return -(-calls // ServiceKeyPool.DAILY_QUOTA)
+        left = calls - keys.remaining(service)
+        return 1 if left <= 0 else 1 + -(-left // keys.capacity())
+
+    def plan(self, endpoints, lawds, months, keys=None):
+        """-> {'jobs': [(엔드포인트, 지역코드, 년월)] 큰 작업 먼저, 'calls': {서비스: 예상 호출 수},
+        'cached': 캐시로 끝나는 작업 수, 'days': 일일 한도(keys: ServiceKeyPool) 기준 필요 일수}"""
+        weighted = []
+        calls = {}
+        cached = 0
+        for ep in endpoints:
+            vol = self.cache.volume(ep.service)
+            known = sorted(vol.values())
+            default = known[len(known) // 2] if known else 0
+            n_calls = 0
+            for lawd in lawds:
+                rows = vol.get(lawd, default)
+                pages = max(1, -(-int(rows) // RtmsClient.PAGE_SIZE))
+                for ym in months:
+                    if self.cache.fresh(ep.service, lawd, ym):
+                        cached += 1
+                        weighted.append((-1, ep, lawd, ym))
+                    else:
+                        n_calls += pages
+                        weighted.append((rows, ep, lawd, ym))
+            calls[ep.service] = n_calls
+        weighted.sort(key=lambda w: -w[0])
+        return {
+            'jobs': [(ep, lawd, ym) for _, ep, lawd, ym in weighted],
+            'calls': calls,
+            'cached': cached,
+            'days': max((self.days_needed(n, svc, keys) for svc, n in calls.items()), default=0),
+        }
+
+
+# SeriesFetchWorker가 여러 시리즈를 동시에 받는 스레드에서는 클라이언트 안쪽 페이지 병렬 조회를 끄고
+# 순서대로 받음 (바깥 6 x 안쪽 4로 연결 풀을 넘겨 keep-alive 연결이 버려지는 것을 막음)
+_fanout = threading.local()
+
+
+def _mark_fanout_thread():
+    _fanout.active = True
+
+
+def _page_map(fn, ranges, max_workers):
+    """구간별 fn 결과를 요청 순서대로; 바깥 병렬 조회 스레드 안이거나 구간이 하나면 순차 실행"""
+    if getattr(_fanout, 'active', False) or max_workers <= 1 or len(ranges) <= 1:
+        return [fn(r) for r in ranges]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(ranges))) as pool:
+        return list(pool.map(fn, ranges))
+
+
+class EcosApiError(Exception):
+    """ECOS가 RESULT/CODE 오류를 돌려준 경우 (INFO-200 '해당 데이터 없음'은 빈 결과로 처리)"""
+
+
+class EcosClient:
+    """한국은행 ECOS Open API 클라이언트 (연결 재사용 + list_total_count 기반 병렬 페이지 조회)
+
+    URL: BASE/서비스/인증키/xml/kr/시작건수/종료건수/추가경로...
+    첫 페이지에서 전체 건수를 읽고 남은 구간을 동시에 요청한 뒤 요청 순서대로 이어 붙임
+    """
+    BASE = 'https://ecos.bok.or.kr/api'
+    PAGE_SIZE = 5000
+    MAX_WORKERS = 4
+    POOL_SIZE = 16  # 여러 항목 동시 조회(SeriesFetchWorker, 안쪽 페이지는 순차)까지 연결을 재사용할 수 있도록 여유 있게
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=self.POOL_SIZE))
+
+    def url(self, service, key, start, end, *tail):
+        parts = [self.BASE, service, key, 'xml', 'kr', str(start), str(end)]
+        parts.extend(str(t) for t in tail)
+        return '/'.join(parts)
+
+    def get_page(self, service, key, start, end, tail=(), stage='ecos', timeout=30):
+        """한 페이지 요청 -> (행 노드 목록, list_total_count)"""
+        with perf_metrics.stage(stage + '.request') as st:
+            resp = self.session.get(self.url(service, key, start, end, *tail), timeout=timeout)
+            resp.raise_for_status()
+            data = resp.content
+            st['bytes'] = len(data)
+        with perf_metrics.stage(stage + '.parse') as st:
+            root = ET.fromstring(data)
+            nodes = root.findall('.//list') or root.findall('.//row') or root.findall('.//item')
+            st['rows'] = len(nodes)
+        if not nodes:
+            code = (root.findtext('CODE') if root.tag == 'RESULT' else root.findtext('.//RESULT/CODE')) or ''
+            if code and code.strip() != 'INFO-200':
+                raise EcosApiError(f"{code.strip()} {root.findtext('.//MESSAGE') or ''}".strip())
+        total = (root.findtext('list_total_count') or root.findtext('.//list_total_count') or '').strip()
+        return nodes, (int(total) if total.isdigit() else len(nodes))
+
+    def fetch_all(self, service, key, tail=(), page_size=None, stage='ecos', timeout=30):
+        """모든 페이지를 받아 (행 노드 목록, 전체 건수) 반환"""
+        page_size = page_size or self.PAGE_SIZE
+        nodes, total = self.get_page(service, key, 1, page_size, tail, stage, timeout)
+        if total <= page_size or len(nodes) < page_size:
+            return nodes, total
+        ranges = [(s, min(s + page_size - 1, total)) for s in range(page_size + 1, total + 1, page_size)]
+        perf_metrics.incr(stage + '.extra_pages', len(ranges))
+        pages = _page_map(lambda r: self.get_page(service, key, r[0], r[1], tail, stage, timeout)[0],
+                          ranges, self.max_workers)
+        for page in pages:
+            nodes.extend(page)
+        return nodes, total
+
+    def statistic_search(self, key, stat_code, cycle, start, end, item_codes=()):
+        # 통계표코드/주기/검색시작/검색종료/통계항목코드1..3 (빈 항목은 '?')
+        items = [c or '?' for c in (list(item_codes) + ['?', '?', '?'])[:3]]
+        return self.fetch_all('StatisticSearch', key, [stat_code, cycle, start, end] + items, stage='ecos.search')
+
+
+class EcosCatalog:
+    """ECOS 통계표 목록(StatisticTableList)/세부항목 목록(StatisticItemList) 디스크 캐시
+
+    파일 형식 버전(VERSION)이 다르면 버리고 새로 받는다. 목록마다 저장 시각을 두고,
+    화면은 캐시로 바로 채운 뒤 TTL이 지난 목록만 백그라운드(CatalogWorker)에서 갱신.
+    """
+    VERSION = 1
+    TTL = 24 * 3600
+    FILENAME = 'ecos_catalog.json'
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(os.getcwd(), self.FILENAME)
+        self._lock = threading.Lock()
+        self._data = {'version': self.VERSION, 'tables': None, 'items': {}}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION and isinstance(data.get('items'), dict):
+                with self._lock:
+                    self._data = data
+        except Exception:
+            pass
+
+    def save(self):
+        # 작업 스레드 여러 개가 동시에 저장할 수 있으므로 직렬화 + 임시 파일 교체
+        with self._lock:
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as fw:
+                json.dump(self._data, fw, ensure_ascii=False)
+            os.replace(tmp, self.path)
+
+    def _entry(self, stat_code=None):
+        return self._data['tables'] if stat_code is None else self._data['items'].get(stat_code)
+
+    def tables(self):
+        ent = self._entry()
+        return ent['rows'] if ent else None
+
+    def items(self, stat_code):
+        ent = self._entry(stat_code)
+        return ent['rows'] if ent else None
+
+    def is_stale(self, stat_code=None):
+        ent = self._entry(stat_code)
+        return not ent or time.time() - ent.get('saved', 0) > self.TTL
+
+    def update(self, rows, stat_code=None):
+        """목록 교체 후 저장; 내용이 바뀌었으면 True"""
+        with self._lock:
+            old = self._entry(stat_code)
+            ent = {'saved': time.time(), 'rows': rows}
+            if stat_code is None:
+                self._data['tables'] = ent
+            else:
+                self._data['items'][stat_code] = ent
+        try:
+            self.save()
+        except Exception as e:
+            perf_metrics.error('ecos.catalog.save', e)
+        return not old or old.get('rows') != rows
+
+    @staticmethod
+    def rows_from_nodes(nodes):
+        return [{c.tag: (c.text or '').strip() for c in node} for node in nodes]
+
+    def refresh_tables(self, client, key):
+        nodes, _ = client.fetch_all('StatisticTableList', key, stage='ecos.table_list')
+        return self.update(self.rows_from_nodes(nodes))
+
+    def refresh_items(self, client, key, stat_code):
+        nodes, _ = client.fetch_all('StatisticItemList', key, [stat_code], stage='ecos.item_list')
+        return self.update(self.rows_from_nodes(nodes), stat_code)
+
+    @staticmethod
+    def item_info(row):
+        """세부항목 행 -> 콤보/여러 항목 조회에서 쓰는 정보 dict (DISPLAY 포함)"""
+        info = {k: (row.get(k) or '').strip() for k in ('ITEM_NAME', 'CYCLE', 'ITEM_CODE', 'START_TIME', 'END_TIME', 'P_ITEM_CODE')}
+        # display as ITEM_NAME_CYCLE_START_TIME_END_TIME (underscore-separated)
+        parts = [info['ITEM_NAME'], info['CYCLE'], info['START_TIME'], info['END_TIME']]
+        info['DISPLAY'] = "_".join([p for p in parts if p]) or ' '.join(v for v in row.values() if v)[:100]
+        return info
+
+    def item_catalog(self):
+        """캐시된 세부항목이 있는 통계표 -> {'name', 'items': [item_info]} (여러 항목 조회 대화상자용)"""
+        with self._lock:
+            tables = (self._data['tables'] or {}).get('rows') or []
+            items = dict(self._data['items'])
+        names = {t.get('STAT_CODE', ''): t.get('STAT_NAME', '') for t in tables}
+        return {code: {'name': names.get(code) or code, 'items': [self.item_info(r) for r in ent['rows']]}
+                for code, ent in items.items() if ent.get('rows')}
+
+
+class KosisApiError(Exception):
+    """KOSIS가 err/errMsg 오류를 돌려준 경우 (err 30 '데이터가 존재하지 않습니다'는 빈 결과로 처리)"""
+
+
+class KosisClient:
+    """통계청 KOSIS Open API 클라이언트 (EcosClient처럼 연결 재사용 + 기간 분할 병렬 조회)
+
+    응답은 jsonVD=Y 형식 JSON 배열. 자료 조회는 한 번에 MAX_CELLS 셀까지만 돌려주므로
+    (항목 x 분류값 조합 수)로 기간 구간을 나눠 동시에 요청하고 요청 순서대로 이어 붙인다.
+    수록시점(PRD_DE)은 ECOS TIME 형식으로 바꿔 EcosSeries/EcosPeriods를 그대로 쓴다.
+    """
+    BASE = 'https://kosis.kr/openapi'
+    MAX_CELLS = 40000
+    MAX_WORKERS = 4
+    POOL_SIZE = 8
+    MAX_LEVELS = 8  # objL1..objL8
+    RECENT = 120  # 기간을 정하지 않으면 최근 N개 시점
+    MAX_SERIES = 50  # 한 번에 저장 목록에 추가할 (항목 x 분류값) 조합 수 상한
+    # KOSIS 수록주기 -> ECOS 주기 (F 다년/IR 부정기는 시계열 축이 없어 미지원)
+    CYCLES = {'Y': 'A', 'H': 'S', 'Q': 'Q', 'M': 'M', 'D': 'D'}
+    CYCLE_NAMES = {'Y': '년', 'H': '반기', 'Q': '분기', 'M': '월', 'D': '일'}
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=self.POOL_SIZE))
+
+    def get(self, path, params, stage='kosis', timeout=30):
+        """GET BASE/path -> 레코드(dict) 목록"""
+        query = dict(params, format='json', jsonVD='Y')
+        with perf_metrics.stage(stage + '.request') as st:
+            resp = self.session.get(f"{self.BASE}/{path}", params=query, timeout=timeout)
+            resp.raise_for_status()
+            data = resp.content
+            st['bytes'] = len(data)
+        with perf_metrics.stage(stage + '.parse') as st:
+            out = json.loads(data)
+            if isinstance(out, dict):
+                err = str(out.get('err') or '').strip()
+                if err == '30':
+                    out = []
+                elif err:
+                    raise KosisApiError(f"{err} {out.get('errMsg') or ''}".strip())
+                else:
+                    out = [out]
+            st['rows'] = len(out)
+        return out
+
+    def stat_list(self, key, parent_id='', view='MT_ZTITLE'):
+        """통계목록 한 단계: LIST_ID가 있으면 하위 목록, TBL_ID가 있으면 통계표"""
+        return self.get('statisticsList.do', {'method': 'getList', 'apiKey': key, 'vwCd': view,
+                                              'parentListId': parent_id}, stage='kosis.list')
+
+    def table_meta(self, key, org_id, tbl_id, kind='ITM'):
+        """통계표 메타 (kind: ITM 항목/분류, PRD 수록주기/시점, TBL 통계표명 ...)"""
+        return self.get('statisticsData.do', {'method': 'getMeta', 'type': kind, 'apiKey': key,
+                                              'orgId': org_id, 'tblId': tbl_id}, stage='kosis.meta')
+
+    @classmethod
+    def to_time(cls, prd_se, prd_de):
+        """KOSIS 수록시점 -> ECOS TIME 코드 (분기 YYYY0n -> YYYYQn, 반기 YYYY0n -> YYYYSn)"""
+        de = str(prd_de or '').strip()
+        if prd_se in ('Q', 'H') and len(de) == 6 and de.isdigit():
+            return f"{de[:4]}{'Q' if prd_se == 'Q' else 'S'}{int(de[4:])}"
+        return de
+
+    @classmethod
+    def from_time(cls, prd_se, code):
+        code = str(code or '').strip()
+        if prd_se in ('Q', 'H') and len(code) == 6 and code[4] in 'QS':
+            return f"{code[:4]}{int(code[5]):02d}"
+        return code
+
+    @classmethod
+    def year_bounds(cls, prd_se, start_year, end_year):
+        """연도 범위 -> 주기에 맞는 (시작, 종료) ECOS TIME 코드"""
+        first, last = {'Y': ('', ''), 'H': ('S1', 'S2'), 'Q': ('Q1', 'Q4'), 'M': ('01', '12'),
+                       'D': ('0101', '1231')}[prd_se]
+        return f"{start_year}{first}", f"{end_year}{last}"
+
+    @staticmethod
+    def _param(codes):
+        if not codes or codes == 'ALL':
+            return 'ALL'
+        return ''.join(f"{c}+" for c in codes)
+
+    def windows(self, prd_se, start, end, cells=1):
+        """ECOS TIME 구간 -> 셀 한도에 맞춘 KOSIS 수록시점 구간 목록"""
+        freq = self.CYCLES[prd_se]
+        _, o = EcosPeriods.parse([start, end], freq)
+        if EcosPeriods.NA in o.tolist() or o[0] > o[1]:
+            raise ValueError(f"잘못된 기간: {start} ~ {end}")
+        step = max(1, self.MAX_CELLS // max(1, cells))
+        out = []
+        for a in range(int(o[0]), int(o[1]) + 1, step):
+            lo, hi = EcosPeriods.labels(freq, [a, min(a + step - 1, int(o[1]))])
+            out.append((self.from_time(prd_se, lo), self.from_time(prd_se, hi)))
+        return out
+
+    def data(self, key, org_id, tbl_id, prd_se, start='', end='', itm_ids='ALL', objs=(), cells=1):
+        """자료 조회 -> KOSIS 레코드 목록 (요청 구간 순)
+
+        itm_ids/objs[i]: 코드 목록 또는 'ALL'. start/end(ECOS TIME)가 없으면 최근 RECENT개 시점.
+        cells: 시점 하나당 예상 셀 수 (항목 x 분류값 조합) — 구간 분할 기준
+        """
+        params = {'method': 'getList', 'apiKey': key, 'orgId': org_id, 'tblId': tbl_id, 'prdSe': prd_se,
+                  'itmId': self._param(itm_ids)}
+        for lv in range(self.MAX_LEVELS):
+            params[f'objL{lv + 1}'] = self._param(objs[lv]) if lv < len(objs) else ''
+        if not start or not end:
+            return self.get('Param/statisticsParameterData.do', dict(params, newEstPrdCnt=self.RECENT), stage='kosis.data')
+        ranges = self.windows(prd_se, start, end, cells)
+        if len(ranges) > 1:
+            perf_metrics.incr('kosis.data.extra_pages', len(ranges) - 1)
+
+        def _one(r):
+            return self.get('Param/statisticsParameterData.do', dict(params, startPrdDe=r[0], endPrdDe=r[1]),
+                            stage='kosis.data')
+
+        if len(ranges) == 1:
+            return _one(ranges[0])
+        out = []
+        for page in _page_map(_one, ranges, self.max_workers):
+            out.extend(page)
+        return out
+
+    @classmethod
+    def to_rows(cls, prd_se, records):
+        """KOSIS 레코드 -> StatisticSearch와 같은 열 이름의 (columns, rows)
+
+        ITEM_CODE1/ITEM_NAME1 = 항목(ITM_ID/ITM_NM), ITEM_CODE2.. = 분류 C1.., TIME = ECOS 형식 시점
+        """
+        levels = 0
+        for rec in records:
+            while levels < cls.MAX_LEVELS and f'C{levels + 1}' in rec:
+                levels += 1
+        columns = ['STAT_CODE', 'STAT_NAME']
+        for n in range(1, levels + 2):
+            columns += [f'ITEM_CODE{n}', f'ITEM_NAME{n}']
+        columns += ['UNIT_NAME', 'TIME', 'DATA_VALUE']
+        rows = []
+        for rec in records:
+            row = [f"{rec.get('ORG_ID', '')}_{rec.get('TBL_ID', '')}", rec.get('TBL_NM', ''),
+                   rec.get('ITM_ID', ''), rec.get('ITM_NM', '')]
+            for lv in range(1, levels + 1):
+                row += [rec.get(f'C{lv}', ''), rec.get(f'C{lv}_NM', '')]
+            row += [rec.get('UNIT_NM', ''), cls.to_time(prd_se, rec.get('PRD_DE')), str(rec.get('DT', '')).strip()]
+            rows.append(tuple('' if v is None else str(v) for v in row))
+        return columns, rows
+
+    @staticmethod
+    def split_series(org_id, tbl_id, prd_se, columns, rows):
+        """(항목, 분류값...) 조합마다 EcosSeries 하나 — 키 ('KOSIS:기관/통계표', '항목/분류..', ECOS 주기)"""
+        code_idx = [i for i, c in enumerate(columns) if c.startswith('ITEM_CODE')]
+        name_idx = [i for i, c in enumerate(columns) if c.startswith('ITEM_NAME')]
+        groups = {}
+        for r in rows:
+            groups.setdefault(tuple(r[i] for i in code_idx), []).append(r)
+        out = []
+        stat_name_i = columns.index('STAT_NAME')
+        for codes, grp in groups.items():
+            key = (f"KOSIS:{org_id}/{tbl_id}", '/'.join(c for c in codes if c), KosisClient.CYCLES[prd_se])
+            names = [grp[0][i] for i in name_idx if grp[0][i]]
+            label = f"{grp[0][stat_name_i] or tbl_id} :: {' / '.join(names)}"
+            out.append(EcosSeries(key, label, columns, grp))
+        return out
+
+
+class KosisCatalog:
+    """KOSIS 통계목록(단계별)/통계표 메타 디스크 캐시 (kosis_catalog.json, 항목마다 저장 시각 + TTL)"""
+    VERSION = 1
+    TTL = 7 * 24 * 3600
+    FILENAME = 'kosis_catalog.json'
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(os.getcwd(), self.FILENAME)
+        self._lock = threading.Lock()
+        self._data = {'version': self.VERSION, 'entries': {}}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION and isinstance(data.get('entries'), dict):
+                self._data = data
+        except Exception:
+            pass
+
+    @staticmethod
+    def list_key(parent_id):
+        return 'list:' + (parent_id or '')
+
+    @staticmethod
+    def meta_key(org_id, tbl_id):
+        return f"meta:{org_id}/{tbl_id}"
+
+    def get(self, key):
+        with self._lock:
+            ent = self._data['entries'].get(key)
+        return ent['value'] if ent else None
+
+    def is_stale(self, key):
+        with self._lock:
+            ent = self._data['entries'].get(key)
+        return not ent or time.time() - ent.get('saved', 0) > self.TTL
+
+    def update(self, key, value):
+        """저장 후 내용이 바뀌었으면 True"""
+        with self._lock:
+            old = self._data['entries'].get(key)
+            self._data['entries'][key] = {'saved': time.time(), 'value': value}
+            try:
+                tmp = self.path + '.tmp'
+                with open(tmp, 'w', encoding='utf-8') as fw:
+                    json.dump(self._data, fw, ensure_ascii=False)
+                os.replace(tmp, self.path)
+            except Exception as e:
+                perf_metrics.error('kosis.catalog.save', e)
+        return not old or old.get('value') != value
+
+    def refresh_list(self, client, service_key, parent_id=''):
+        rows = client.stat_list(service_key, parent_id)
+        return self.update(self.list_key(parent_id), rows)
+
+    def refresh_meta(self, client, service_key, org_id, tbl_id):
+        """항목/분류(ITM) + 수록주기(PRD) 메타; PRD 조회 실패는 빈 목록으로 둠"""
+        itm = client.table_meta(service_key, org_id, tbl_id, 'ITM')
+        try:
+            prd = client.table_meta(service_key, org_id, tbl_id, 'PRD')
+        except Exception as e:
+            perf_metrics.error('kosis.meta.prd', e)
+            prd = []
+        return self.update(self.meta_key(org_id, tbl_id), {'itm': itm, 'prd': prd})
+
+    @staticmethod
+    def levels(itm_meta):
+        """ITM 메타 -> [(OBJ_ID, OBJ_NM, [(코드, 이름, 단위)])]; 첫 단계는 항목(OBJ_ID 'ITEM')"""
+        groups = {}
+        order = []
+        for rec in itm_meta:
+            obj = rec.get('OBJ_ID', '')
+            if obj not in groups:
+                groups[obj] = (rec.get('OBJ_NM', '') or obj, [], rec.get('OBJ_ID_SN'))
+                order.append(obj)
+            groups[obj][1].append((rec.get('ITM_ID', ''), rec.get('ITM_NM', ''), rec.get('UNIT_NM', '') or ''))
+
+        def _sn(obj):
+            try:
+                return int(groups[obj][2])
+            except (TypeError, ValueError):
+                return order.index(obj) + 1
+        objs = sorted((o for o in order if o != 'ITEM'), key=_sn)
+        head = ['ITEM'] if 'ITEM' in groups else []
+        return [(o, groups[o][0], groups[o][1]) for o in head + objs]
+
+    @staticmethod
+    def cycles(prd_meta):
+        """PRD 메타 -> 수록주기 코드 목록 (나온 순서)"""
+        out = []
+        for rec in prd_meta or []:
+            se = str(rec.get('PRD_SE', '')).strip().upper()
+            # 일부 응답은 '월', '년' 같은 이름으로 옴
+            se = {v: k for k, v in KosisClient.CYCLE_NAMES.items()}.get(se, se)
+            if se in KosisClient.CYCLES and se not in out:
+                out.append(se)
+        return out
+
+
+class IndCatalog:
+    """지표누리 지표 목록 디스크 캐시 + 한 번 훑는(iterparse) 추출기
+
+    캐시 파일(ind_catalog.json)은 URL별로 콤보 항목(entries)과 목록 표(columns/rows)를 보관.
+    entries: [라벨(지표명_통계표명_수정일), 지표코드, 통계표코드, 수정일, 정렬키(YYYYMMDD)] 수정일 내림차순
+    """
+    VERSION = 1
+    TTL = 24 * 3600
+    FILENAME = 'ind_catalog.json'
+    UPD_TAGS = ('수치수정일', '수정일', '수정Dt', '수치수정일자', 'lastUpdDt', 'updateDate', 'dataUpdtDt')
+    IND_TAGS = ('지표', 'indicator')
+    TABLE_TAGS = ('통계표', 'table')
+    FLAT_TAGS = ('item', 'list', 'row')
+    _DATE_RE = re.compile(r'(\d{4})[^\d]?(\d{2})[^\d]?(\d{2})')
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(os.getcwd(), self.FILENAME)
+        self._data = {'version': self.VERSION, 'lists': {}}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION and isinstance(data.get('lists'), dict):
+                self._data = data
+        except Exception:
+            pass
+
+    def get(self, url):
+        return self._data['lists'].get(url)
+
+    def is_stale(self, url):
+        ent = self.get(url)
+        return not ent or time.time() - ent.get('saved', 0) > self.TTL
+
+    def update(self, url, parsed):
+        """파싱 결과 저장; 콤보 항목이나 표가 바뀌었으면 True"""
+        old = self.get(url)
+        ent = dict(parsed, saved=time.time())
+        self._data['lists'][url] = ent
+        try:
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as fw:
+                json.dump(self._data, fw, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            perf_metrics.error('ind.catalog.save', e)
+        return not old or any(old.get(k) != parsed.get(k) for k in ('entries', 'columns', 'rows'))
+
+    @classmethod
+    def _upd_key(cls, upd):
+        # compute sortable key (YYYYMMDD int) else 0
+        m = cls._DATE_RE.search(upd)
+        return int(m.group(1) + m.group(2) + m.group(3)) if m else 0
+
+    @classmethod
+    def _first(cls, fields, tags):
+        return next((fields[t] for t in tags if fields.get(t)), '')
+
+    @classmethod
+    def extract(cls, source):
+        """XML 스트림(파일 객체)을 한 번만 훑어 {'entries', 'columns', 'rows'} 생성
+
+        지표(또는 item/list/row) 요소가 끝날 때 바로 값을 뽑고 clear()로 메모리를 비움.
+        지표 요소의 직접 자식 태그가 목록 표의 열, 통계표 자식이 콤보 항목이 됨.
+        """
+        entries, columns, rows = [], [], []
+        col_index = {}
+        stack = []  # 열린 요소 태그
+        rec = None  # 현재 지표/평면 레코드: {'depth', 'fields', 'tables', 'flat'}
+        table = None  # 현재 통계표 자식 필드
+        for event, elem in ET.iterparse(source, events=('start', 'end')):
+            tag = elem.tag
+            if event == 'start':
+                stack.append(tag)
+                # 지표 요소가 item/list 등으로 감싸여 있으면 지표 쪽을 레코드로 사용
+                if ((rec is None or rec['flat']) and tag in cls.IND_TAGS) or (rec is None and tag in cls.FLAT_TAGS):
+                    rec = {'depth': len(stack), 'fields': {}, 'tables': [], 'flat': tag in cls.FLAT_TAGS}
+                elif rec is not None and not rec['flat'] and table is None and (
+                        tag in cls.TABLE_TAGS or (len(stack) == rec['depth'] + 1 and ('통계' in tag or 'table' in tag))):
+                    table = {'depth': len(stack), 'fields': {}}
+                continue
+            depth = len(stack)
+            stack.pop()
+            if rec is None:
+                continue
+            text = (elem.text or '').strip()
+            if table is not None:
+                if depth == table['depth'] + 1:
+                    table['fields'].setdefault(tag, text)
+                elif depth == table['depth']:
+                    rec['tables'].append(table['fields'])
+                    table = None
+            if depth == rec['depth'] + 1:
+                rec['fields'].setdefault(tag, text)
+                if tag not in col_index:
+                    col_index[tag] = len(columns)
+                    columns.append(tag)
+            if depth == rec['depth']:
+                f = rec['fields']
+                rows.append([f.get(c, '') for c in columns])
+                title = cls._first(f, ('지표명', 'STAT_NAME', 'INDEX_NAME'))
+                ixcode = cls._first(f, ('지표코드', '지표코', 'INDEX_CODE'))
+                # prefer parent 수정일; fall back to table-level if parent missing
+                parent_upd = cls._first(f, cls.UPD_TAGS)
+                for t in (rec['tables'] if not rec['flat'] else [f]):
+                    tname = cls._first(t, ('통계표명', 'tableName'))
+                    if title and tname:
+                        tcode = cls._first(t, ('통계표코드', '통계표코', 'tableCode'))
+                        upd = parent_upd or cls._first(t, cls.UPD_TAGS)
+                        entries.append([f"{title}_{tname}_{upd}".strip('_'), ixcode, tcode, upd, cls._upd_key(upd)])
+                rec = None
+                elem.clear()
+        # 행 길이를 최종 열 수에 맞춤 (뒤에 처음 나온 태그는 앞 행에서 빈 값)
+        rows = [r + [''] * (len(columns) - len(r)) for r in rows]
+        # sort entries by 수정일 (key at index 4) descending
+        entries.sort(key=lambda e: e[4], reverse=True)
+        return {'entries': entries, 'columns': columns, 'rows': rows}
+
+    @classmethod
+    def fetch(cls, url, timeout=20):
+        """응답을 내려받는 동안 바로 iterparse (받은 바이트는 일반 표 대체 경로용으로만 보관)"""
+        class _Tee:
+            def __init__(self, raw):
+                self.raw, self.chunks = raw, []
+
+            def read(self, n=-1):
+                b = self.raw.read(n)
+                self.chunks.append(b)
+                return b
+
+        with perf_metrics.stage('ind.list.stream') as st:
+            resp = requests.get(url, timeout=timeout, stream=True)
+            resp.raise_for_status()
+            resp.raw.decode_content = True
+            tee = _Tee(resp.raw)
+            parsed = cls.extract(tee)
+            data = b''.join(tee.chunks)
+            st['bytes'] = len(data)
+            if not parsed['rows']:
+                parsed = cls.extract_generic(data)
+            st['rows'] = len(parsed['rows'])
+        return parsed
+
+    @staticmethod
+    def extract_generic(data):
+        """지표/item 요소가 없는 응답: 가장 많이 반복되는 자식 태그를 행으로, 없으면 루트 자식 한 행"""
+        root = ET.fromstring(data)
+        items = []
+        for parent in root.iter():
+            child_tags = [c.tag for c in list(parent) if c.tag]
+            if not child_tags:
+                continue
+            from collections import Counter
+            most_common_tag, count = Counter(child_tags).most_common(1)[0]
+            if count > 1:
+                items = parent.findall(most_common_tag)
+                if items:
+                    break
+        if not items:
+            cols = [c.tag for c in list(root)]
+            rows = [[(c.text or '').strip() for c in list(root)]] if cols else []
+            return {'entries': [], 'columns': cols, 'rows': rows}
+        cols = []
+        for it in items:
+            for child in list(it):
+                if child.tag not in cols:
+                    cols.append(child.tag)
+        rows = [[(it.findtext(c) or '').strip() for c in cols] for it in items]
+        return {'entries': [], 'columns': cols, 'rows': rows}
+
+
+class HtmlTableExtractor(HTMLParser):
+    """HTML 응답에서 첫 번째 데이터 표(2행·2열 이상)를 한 번에 훑어 {'columns', 'rows', 'types', 'values'}로 변환
+
+    rowspan/colspan은 격자에 펼쳐 채우고, thead 또는 앞쪽의 th 전용 행들을 여러 줄 머리글로 보고
+    열마다 위에서 아래로 이어 붙인다. 표가 끝나면 나머지 문서는 읽지 않음.
+    types: 열마다 'num'(빈칸/'-' 제외 전부 숫자) 또는 'text'.
+    rows는 서버가 준 문자열 그대로(표시용), values는 rows와 같은 모양으로 'num' 열 칸만 추출할 때
+    한 번 float로 바꿔 둔 값(빈칸과 'text' 열은 None; 정렬·그래프용).
+    """
+    CHUNK = 64 * 1024
+    _NUM_RE = re.compile(r'^[-+]?(\d{1,3}(,\d{3})+|\d+)?(\.\d+)?%?$')
+    _CODE_RE = re.compile(r'^0\d+$')
+    _EMPTY = ('', '-', '…', '..', 'x', 'X')
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.depth = 0          # 표 중첩 깊이 (안쪽 표의 글자는 바깥 칸에 합침)
+        self.done = False
+        self.grid = []          # [(cells, is_header)]
+        self._spans = {}        # col -> [남은 행 수, text, is_th]
+        self._row = None        # [(text, is_th, rowspan, colspan)]
+        self._cell = None       # [parts, is_th, rowspan, colspan]
+        self._in_thead = False
+        self._fallback = None
+
+    @staticmethod
+    def _span(attrs, name):
+        for k, v in attrs:
+            if k == name:
+                try:
+                    return max(1, min(int(str(v).strip() or 1), 1000))
+                except Exception:
+                    return 1
+        return 1
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'table':
+            self.depth += 1
+            return
+        if self.depth != 1:
+            if tag == 'br' and self._cell is not None:
+                self._cell[0].append(' ')
+            return
+        if tag == 'thead':
+            self._in_thead = True
+        elif tag in ('tbody', 'tfoot'):
+            self._end_row()
+            self._in_thead = False
+        elif tag == 'tr':
+            self._end_row()
+            self._row = []
+        elif tag in ('td', 'th'):
+            self._end_cell()
+            if self._row is None:
+                self._row = []
+            self._cell = [[], tag == 'th', self._span(attrs, 'rowspan'), self._span(attrs, 'colspan')]
+        elif tag == 'br' and self._cell is not None:
+            self._cell[0].append(' ')
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == 'br' and self._cell is not None and not self.done:
+            self._cell[0].append(' ')
+
+    def handle_endtag(self, tag):
+        if self.done or not self.depth:
+            return
+        if tag == 'table':
+            self.depth -= 1
+            if not self.depth:
+                self._end_row()
+                # 1행/1열짜리 레이아웃 표는 건너뛰고 다음 표를 봄 (없으면 대체 후보로 사용)
+                if len(self.grid) >= 2 and max(len(cells) for cells, _ in self.grid) >= 2:
+                    self.done = True
+                else:
+                    if self.grid and self._fallback is None:
+                        self._fallback = self.grid
+                    self.grid, self._spans = [], {}
+            return
+        if self.depth != 1:
+            return
+        if tag in ('td', 'th'):
+            self._end_cell()
+        elif tag == 'tr':
+            self._end_row()
+        elif tag == 'thead':
+            self._end_row()
+            self._in_thead = False
+
+    def handle_data(self, data):
+        if self._cell is not None and not self.done:
+            self._cell[0].append(data)
+
+    def _end_cell(self):
+        c = self._cell
+        if c is None:
+            return
+        self._cell = None
+        self._row.append((' '.join(''.join(c[0]).split()), c[1], c[2], c[3]))
+
+    def _end_row(self):
+        self._end_cell()
+        row, self._row = self._row, None
+        if row is None:
+            return
+        cells, spans = [], self._spans
+        all_th = bool(row)
+        col = 0
+
+        def carry():
+            nonlocal col
+            while col in spans:
+                ent = spans[col]
+                cells.append(ent[1])
+                ent[0] -= 1
+                if ent[0] <= 0:
+                    del spans[col]
+                col += 1
+
+        for text, is_th, rs, cs in row:
+            carry()
+            all_th = all_th and is_th
+            for _ in range(cs):
+                cells.append(text)
+                if rs > 1:
+                    spans[col] = [rs - 1, text, is_th]
+                col += 1
+        # 이 행 뒤쪽에 걸친 rowspan 칸
+        while spans and col <= max(spans):
+            if col in spans:
+                carry()
+            else:
+                cells.append('')
+                col += 1
+        if cells:
+            self.grid.append((cells, self._in_thead or all_th))
+
+    @classmethod
+    def to_number(cls, txt):
+        """'1,234.5' / '12.3%' -> float, 빈칸 표시('-' 등)나 숫자가 아니면 None"""
+        t = (txt or '').strip()
+        if t in cls._EMPTY or not cls._NUM_RE.match(t) or not any(ch.isdigit() for ch in t):
+            return None
+        try:
+            return float(t.rstrip('%').replace(',', ''))
+        except ValueError:
+            return None
+
+    @classmethod
+    def column_types(cls, ncols, rows):
+        """문자열 행 -> 열마다 'num' 또는 'text' (2020, 2020.01 같은 시점 열은 숫자로 보여도 'text')
+
+        네 자리 정수만 있는 열은 모두 1900~2100 사이일 때만 연도로 봄 (4036 같은 값 열 오판 방지).
+        '01'처럼 0으로 시작하는 정수가 있는 열은 코드로 보고 'text'.
+        """
+        types = []
+        for c in range(ncols):
+            seen = periods = odd_years = 0
+            kind = 'num'
+            for r in rows:
+                v = r[c] if c < len(r) else ''
+                if (v or '').strip() in cls._EMPTY:
+                    continue
+                seen += 1
+                if cls.to_number(v) is None or cls._CODE_RE.match(v.strip()):
+                    kind = 'text'
+                    break
+                # 시점 판별은 IndProvider 규칙과 같게 (숫자로 바꾸면 '2020.10'과 '2020.1'이 섞임)
+                if IndProvider.period_code(v):
+                    periods += 1
+                    t = v.strip()
+                    if t.isdigit() and len(t) == 4 and not 1900 <= int(t) <= 2100:
+                        odd_years += 1
+            if not seen or (periods >= 0.8 * seen and not odd_years):
+                kind = 'text'
+            types.append(kind)
+        return types
+
+    @classmethod
+    def typed(cls, columns, rows):
+        """문자열 표 -> {'columns', 'rows', 'types', 'values'}: 'num' 열 칸만 float(빈칸 None)로 한 번 변환
+
+        rows의 문자열은 그대로 둠 ('01', '12.5%', 자릿수 등 서버 표기 유지)
+        """
+        types = cls.column_types(len(columns), rows)
+        num_cols = [c for c, t in enumerate(types) if t == 'num']
+        num = cls.to_number
+        values = []
+        for r in rows:
+            vr = [None] * len(r)
+            for c in num_cols:
+                if c < len(r):
+                    vr[c] = num(r[c])
+            values.append(vr)
+        return {'columns': list(columns), 'rows': rows, 'types': types, 'values': values}
+
+    def result(self):
+        if self._row is not None or self._cell is not None:
+            self._end_row()
+        grid = self.grid or self._fallback or []
+        maxc = max((len(cells) for cells, _ in grid), default=0)
+        if not maxc:
+            return None
+        nhead = 0
+        while nhead < len(grid) - 1 and grid[nhead][1]:
+            nhead += 1
+        if nhead:
+            headers = []
+            for c in range(maxc):
+                parts = []
+                for cells, _ in grid[:nhead]:
+                    v = cells[c] if c < len(cells) else ''
+                    if v and (not parts or parts[-1] != v):
+                        parts.append(v)
+                headers.append(' '.join(parts) or f'col{c+1}')
+            body = [cells for cells, _ in grid[nhead:]]
+        elif all(grid[0][0]):
+            headers, body = list(grid[0][0]), [cells for cells, _ in grid[1:]]
+        else:
+            headers, body = [], [cells for cells, _ in grid]
+        headers = headers + [f'col{i+1}' for i in range(len(headers), maxc)]
+        rows = [list(r) + [''] * (maxc - len(r)) for r in body]
+        return self.typed(headers, rows)
+
+    @classmethod
+    def extract(cls, data):
+        """bytes/str -> {'columns', 'rows', 'types', 'values'} 또는 표가 없으면 None"""
+        p = cls()
+        if isinstance(data, (bytes, bytearray)):
+            head = bytes(data[:2048]).lower()
+            enc = 'cp949' if re.search(rb'charset\s*=\s*["\']?(euc-kr|ks_c_5601|cp949)', head) else 'utf-8'
+            dec = codecs.getincrementaldecoder(enc)(errors='replace')
+            for i in range(0, len(data), cls.CHUNK):
+                p.feed(dec.decode(data[i:i + cls.CHUNK]))
+                if p.done:
+                    break
+            else:
+                p.feed(dec.decode(b'', final=True))
+        else:
+            text = str(data)
+            for i in range(0, len(text), cls.CHUNK):
+                p.feed(text[i:i + cls.CHUNK])
+                if p.done:
+                    break
+        return p.result()
+
+
+class IndDetailCache:
+    """지표누리 상세 표(stblUserShow) 캐시: (지표코드, 통계표코드)마다 파싱한 열/행을 메모리+디스크에 보관
+
+    목록의 수정일이 캐시에 기록된 수정일과 같으면 최신으로 보고 다시 요청하지 않음
+    (수정일을 모르는 항목은 TTL 동안만 유효). 작업 스레드(IndPrefetchWorker)와 공유하므로 잠금 사용.
+    """
+    VERSION = 3  # 3: 원래 문자열(rows)과 숫자 열 값(values)을 함께 저장
+    TTL = 24 * 3600
+    DIRNAME = 'ind_detail_cache'
+    URL = "https://www.index.go.kr/unity/openApi/stblUserShow.do"
+
+    def __init__(self, dirpath=None):
+        self.dirpath = dirpath or os.path.join(os.getcwd(), self.DIRNAME)
+        self._lock = threading.Lock()
+        self._mem = {}
+
+    def _path(self, ixcode, statscode):
+        return os.path.join(self.dirpath, re.sub(r'[^0-9A-Za-z]+', '_', f"{ixcode}_{statscode}") + '.json')
+
+    def get(self, ixcode, statscode, upd=''):
+        """최신 캐시 항목({'columns', 'rows', 'upd', 'saved'}) 또는 None"""
+        key = (ixcode, statscode)
+        with self._lock:
+            ent = self._mem.get(key)
+        if ent is None:
+            try:
+                with open(self._path(ixcode, statscode), encoding='utf-8') as f:
+                    ent = json.load(f)
+                if ent.get('version') != self.VERSION:
+                    ent = None
+            except Exception:
+                ent = None
+            if ent is not None:
+                with self._lock:
+                    self._mem[key] = ent
+        if ent is None:
+            return None
+        if upd:
+            return ent if ent.get('upd') == upd else None
+        return ent if time.time() - ent.get('saved', 0) <= self.TTL else None
+
+    def put(self, ixcode, statscode, upd, parsed):
+        ent = {'version': self.VERSION, 'upd': upd or '', 'saved': time.time(),
+               'columns': parsed['columns'], 'rows': parsed['rows'], 'types': parsed.get('types') or [],
+               'values': parsed.get('values') or []}
+        with self._lock:
+            self._mem[(ixcode, statscode)] = ent
+        try:
+            os.makedirs(self.dirpath, exist_ok=True)
+            path = self._path(ixcode, statscode)
+            with open(path + '.tmp', 'w', encoding='utf-8') as fw:
+                json.dump(ent, fw, ensure_ascii=False)
+            os.replace(path + '.tmp', path)
+        except Exception as e:
+            perf_metrics.error('ind.detail.save', e)
+        return ent
+
+    def fetch(self, service_key, ixcode, statscode, upd=''):
+        """요청 + 파싱 + 저장 -> 캐시 항목. 파싱 실패는 ValueError"""
+        params = {'idntfcId': service_key, 'ixCode': ixcode, 'statsCode': statscode}
+        with perf_metrics.stage('ind.detail.request') as st:
+            resp = requests.get(self.URL, params=params, timeout=20)
+            resp.raise_for_status()
+            data = resp.content
+            st['bytes'] = len(data)
+        with perf_metrics.stage('ind.detail.parse') as st:
+            parsed = self.parse(data)
+            st['rows'] = len(parsed['rows'])
+        return self.put(ixcode, statscode, upd, parsed)
+
+    @staticmethod
+    def parse(data):
+        """상세 응답(XML, 아니면 HTML 표) -> {'columns', 'rows', 'types', 'values'}; 어느 쪽으로도 읽을 수 없으면 ValueError"""
+        try:
+            root = ET.fromstring(data)
+        except ET.ParseError:
+            root = None
+        if root is None:
+            parsed = HtmlTableExtractor.extract(data)
+            if parsed is None:
+                raise ValueError('세부 API 파싱 실패')
+            return parsed
+
+        # find repeated item nodes (item/list/row, else the most repeated child tag)
+        items = root.findall('.//item') or root.findall('.//list') or root.findall('.//row') or []
+        if not items:
+            # 잘 짜인(well-formed) HTML 문서도 XML로 읽히므로 표가 있으면 HTML 경로로
+            if root.tag.lower() == 'html' or root.find('.//table') is not None:
+                parsed = HtmlTableExtractor.extract(data)
+                if parsed is not None:
+                    return parsed
+            generic = IndCatalog.extract_generic(data)
+            return HtmlTableExtractor.typed(generic.get('columns') or [], generic.get('rows') or [])
+        # Build column set from all items' child tags
+        col_set = []
+        for it in items:
+            for child in list(it):
+                if child.tag not in col_set:
+                    col_set.append(child.tag)
+        rows = [[(it.findtext(tag) or '').strip() for tag in col_set] for it in items]
+        return HtmlTableExtractor.typed(col_set, rows)
+
+
+class CatalogSearchIndex:
+    """통계 목록(ECOS 통계표/세부항목, 지표누리 지표_통계표) 이름 전문 검색용 역색인
+
+    한글은 띄어쓰기가 제각각이라 단어 대신 글자 bigram(한 글자 단어는 그대로)을 토큰으로 쓴다.
+    점수 = 질의 bigram의 idf 가중 포함 비율 + 질의 문자열이 그대로 들어 있으면(앞부분이면 더) 가산점
+    """
+    MIN_COVERAGE = 0.5
+
+    def __init__(self):
+        self.docs = []  # (payload, label)
+        self._norm = []
+        self._postings = {}
+        self._frozen = None
+
+    @staticmethod
+    def normalize(text):
+        return re.findall(r'[0-9a-z가-힣]+', (text or '').lower())
+
+    @classmethod
+    def grams(cls, text):
+        out = set()
+        for word in cls.normalize(text):
+            if len(word) == 1:
+                out.add(word)
+            else:
+                out.update(word[i:i + 2] for i in range(len(word) - 1))
+        return out
+
+    def add(self, label, payload, text=None):
+        doc_id = len(self.docs)
+        self.docs.append((payload, label))
+        self._norm.append(''.join(self.normalize(text or label)))
+        for g in self.grams(text or label):
+            self._postings.setdefault(g, []).append(doc_id)
+        self._frozen = None
+        return doc_id
+
+    def _freeze(self):
+        if self._frozen is None:
+            n = max(1, len(self.docs))
+            self._frozen = {g: (np.asarray(ids, dtype=np.int32), float(np.log(1.0 + n / len(ids))))
+                            for g, ids in self._postings.items()}
+        return self._frozen
+
+    def search(self, query, limit=100):
+        """-> [(score, payload, label)] 점수 내림차순"""
+        n = len(self.docs)
+        qnorm = ''.join(self.normalize(query))
+        if not n or not qnorm:
+            return []
+        if len(qnorm) == 1:
+            # 한 글자 질의는 bigram이 없으므로 정규화 문자열 부분일치로
+            hits = [i for i, t in enumerate(self._norm) if qnorm in t]
+            hits.sort(key=lambda i: len(self._norm[i]))
+            return [(1.0, self.docs[i][0], self.docs[i][1]) for i in hits[:limit]]
+        postings = self._freeze()
+        qgrams = self.grams(query)
+        scores = np.zeros(n, dtype=np.float64)
+        total = 0.0
+        for g in qgrams:
+            ent = postings.get(g)
+            if ent is None:
+                total += float(np.log(1.0 + n))
+                continue
+            ids, w = ent
+            scores[ids] += w
+            total += w
+        scores /= total
+        ranked = []
+        for i in np.nonzero(scores >= self.MIN_COVERAGE)[0].tolist():
+            text = self._norm[i]
+            bonus = (0.5 if text.startswith(qnorm) else 1.0 / 3) if qnorm in text else 0.0
+            ranked.append((float(scores[i]) + bonus, -len(text), i))
+        ranked.sort(reverse=True)
+        return [(s, self.docs[i][0], self.docs[i][1]) for s, _, i in ranked[:limit]]
+
+
+class EcosPeriods:
+    """ECOS TIME 코드 <-> 정수 기간 서수(ordinal) 변환과 여러 시리즈의 공통 달력 정렬 (numpy 벡터 연산)
+
+    서수: A=년, S=년*2+반기-1, Q=년*4+분기-1, M=년*12+월-1, SM=(년*12+월-1)*2+상하순-1, D=1970-01-01 기준 일수
+    해석할 수 없는 코드는 NA. 세밀한 주기 -> 거친 주기는 구간에 묶고(마지막 값), 반대는 구간 시작 시점에 놓음.
+    """
+    ORDER = ('A', 'S', 'Q', 'M', 'SM', 'D')  # 거친 주기 -> 세밀한 주기
+    MONTHS = {'A': 12, 'S': 6, 'Q': 3, 'M': 1}
+    NA = np.iinfo(np.int64).min
+    _EPOCH_MONTH = 1970 * 12
+
+    @staticmethod
+    def detect(code):
+        s = str(code or '').strip().upper()
+        if len(s) == 4:
+            return 'A'
+        if len(s) == 6:
+            return 'Q' if s[4] == 'Q' else ('S' if s[4] == 'S' else 'M')
+        if len(s) == 8:
+            return 'SM' if s[6] == 'S' else 'D'
+        return None
+
+    @classmethod
+    def parse(cls, times, freq=None):
+        """TIME 코드 목록 -> (freq, int64 서수 배열). freq가 없으면 첫 유효 코드로 판정"""
+        labels = [str(t).replace('-', '').replace('.', '').strip().upper() for t in times]
+        if freq is None:
+            freq = next((f for f in map(cls.detect, labels) if f), None)
+        freq = (freq or '').upper()
+        if freq not in cls.ORDER or not labels:
+            return freq or None, np.full(len(labels), cls.NA, dtype=np.int64)
+        width = {'A': 4, 'S': 6, 'Q': 6, 'M': 6, 'SM': 8, 'D': 8}[freq]
+        arr = np.array(labels, dtype=f'U{width}')
+        # 고정폭 유니코드 배열을 글자 코드 행렬로 보고 자릿수를 한 번에 계산
+        d = arr.view(np.uint32).reshape(len(arr), width).astype(np.int64) - 48
+        digit_pos = [i for i in range(width) if not (freq in ('S', 'Q') and i == 4) and not (freq == 'SM' and i == 6)]
+        valid = (np.char.str_len(arr) == width) & np.all((d[:, digit_pos] >= 0) & (d[:, digit_pos] <= 9), axis=1)
+        y = d[:, 0] * 1000 + d[:, 1] * 100 + d[:, 2] * 10 + d[:, 3]
+        if freq == 'A':
+            ords = y
+        elif freq in ('S', 'Q'):
+            per = 2 if freq == 'S' else 4
+            k = d[:, 5]
+            valid &= (k >= 1) & (k <= per)
+            ords = y * per + k - 1
+        else:
+            m = d[:, 4] * 10 + d[:, 5]
+            valid &= (m >= 1) & (m <= 12)
+            months = y * 12 + m - 1
+            if freq == 'M':
+                ords = months
+            elif freq == 'SM':
+                h = d[:, 7]
+                valid &= (h >= 1) & (h <= 2)
+                ords = months * 2 + h - 1
+            else:
+                day = d[:, 6] * 10 + d[:, 7]
+                valid &= (day >= 1) & (day <= 31)
+                ords = np.where(valid, months - cls._EPOCH_MONTH, 0).astype('datetime64[M]').astype('datetime64[D]').astype(np.int64) + day - 1
+                valid &= cls._day_of_month(ords) == day  # 20230230 같은 없는 날짜
+        return freq, np.where(valid, ords, cls.NA)
+
+    @classmethod
+    def to_months(cls, freq, ords):
+        """각 기간의 시작 월 서수(년*12+월-1)"""
+        if freq in cls.MONTHS:
+            return ords * cls.MONTHS[freq]
+        if freq == 'SM':
+            return ords // 2
+        return ords.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) + cls._EPOCH_MONTH
+
+    @classmethod
+    def convert(cls, freq, ords, target):
+        """서수를 target 주기 서수로 변환 (NA 유지)"""
+        ords = np.asarray(ords, dtype=np.int64)
+        if freq == target:
+            return ords
+        valid = ords != cls.NA
+        o = np.where(valid, ords, 0)
+        if target in cls.MONTHS:
+            out = cls.to_months(freq, o) // cls.MONTHS[target]
+        elif target == 'SM':
+            half = (cls._day_of_month(o) >= 16) if freq == 'D' else 0
+            out = cls.to_months(freq, o) * 2 + half
+        else:
+            out = (cls.to_months(freq, o) - cls._EPOCH_MONTH).astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+            if freq == 'SM':
+                out = out + (o % 2) * 15
+        return np.where(valid, out, cls.NA)
+
+    @staticmethod
+    def _day_of_month(days):
+        days = np.asarray(days, dtype=np.int64)
+        return days - days.astype('datetime64[D]').astype('datetime64[M]').astype('datetime64[D]').astype(np.int64) + 1
+
+    @classmethod
+    def labels(cls, freq, ords):
+        """서수 -> ECOS TIME 코드 문자열 목록"""
+        ords = np.asarray(ords, dtype=np.int64)
+        if freq == 'A':
+            return [str(o) for o in ords.tolist()]
+        if freq in ('S', 'Q'):
+            per = 2 if freq == 'S' else 4
+            return [f"{o // per}{freq}{o % per + 1}" for o in ords.tolist()]
+        if freq == 'M':
+            return [f"{o // 12}{o % 12 + 1:02d}" for o in ords.tolist()]
+        if freq == 'SM':
+            return [f"{o // 24}{o // 2 % 12 + 1:02d}S{o % 2 + 1}" for o in ords.tolist()]
+        return [s.replace('-', '') for s in np.datetime_as_string(ords.astype('datetime64[D]')).tolist()]
+
+    @classmethod
+    def shift(cls, freq, code, n):
+        """TIME 코드 하나를 주기 단위로 n만큼 이동"""
+        freq, o = cls.parse([code], freq)
+        if o[0] == cls.NA:
+            raise ValueError(f"invalid TIME {code!r} for cycle {freq}")
+        return cls.labels(freq, o + n)[0]
+
+    @classmethod
+    def finest(cls, freqs):
+        freqs = [f for f in freqs if f in cls.ORDER]
+        return max(freqs, key=cls.ORDER.index) if freqs else None
+
+    @classmethod
+    def align(cls, series, target=None, parsed=None):
+        """[(times, values)] -> (freq, 공통 축 서수, (시리즈 수 x 축 길이) 값 행렬; 빈 칸은 NaN)
+
+        target이 없으면 가장 세밀한 주기를 공통 달력으로 사용. 같은 칸에 여러 값이 떨어지면 마지막 값.
+        parsed: 이미 해석한 [(freq, 서수)]가 있으면 TIME 파싱 생략
+        """
+        parsed = parsed or [cls.parse(times) for times, _ in series]
+        target = target or cls.finest([f for f, _ in parsed])
+        if target is None:
+            return None, np.zeros(0, dtype=np.int64), np.full((len(series), 0), np.nan)
+        conv = [cls.convert(f, o, target) if f else o for f, o in parsed]
+        allv = np.concatenate([c[c != cls.NA] for c in conv]) if conv else np.zeros(0, dtype=np.int64)
+        axis = np.unique(allv)
+        Y = np.full((len(series), len(axis)), np.nan)
+        for i, (c, (_, values)) in enumerate(zip(conv, series)):
+            vals = np.asarray(values, dtype=np.float64)
+            ok = np.nonzero(c != cls.NA)[0]
+            if not len(ok):
+                continue
+            pos = np.searchsorted(axis, c[ok])
+            # 같은 칸의 마지막 값만: 뒤집어서 첫 등장 위치 사용
+            u, first = np.unique(pos[::-1], return_index=True)
+            Y[i, u] = vals[ok[len(ok) - 1 - first]]
+        return target, axis, Y
+
+    @classmethod
+    def year_starts(cls, freq, ords):
+        """공통 축에서 각 연도가 처음 나오는 위치 (눈금용)"""
+        if not len(ords):
+            return np.zeros(0, dtype=np.int64)
+        years = cls.to_months(freq, np.asarray(ords, dtype=np.int64)) // 12
+        return np.nonzero(np.diff(years, prepend=years[0] - 1))[0]
+
+
+class EcosSeries:
+    """StatisticSearch 조회 한 건: 원본 열/문자열 행과 typed TIME/DATA_VALUE 배열"""
+    META_COLUMNS = ('UNIT_NAME', 'STAT_NAME', 'ITEM_NAME1')
+
+    def __init__(self, key, label, columns, rows):
+        self.key = key
+        self.label = label
+        self.columns = list(columns)
+        self.rows = rows  # list of tuples aligned with columns
+        self._col_index = {c: i for i, c in enumerate(self.columns)}
+        ti = self._col_index.get('TIME')
+        vi = self._col_index.get('DATA_VALUE')
+        self.times = [r[ti] for r in rows] if ti is not None else [''] * len(rows)
+        self.values = np.full(len(rows), np.nan)
+        if vi is not None:
+            for i, r in enumerate(rows):
+                try:
+                    self.values[i] = float(r[vi].replace(',', ''))
+                except ValueError:
+                    pass
+        self.meta = {}
+        for m in self.META_COLUMNS:
+            mi = self._col_index.get(m)
+            if mi is not None:
+                self.meta[m] = next((r[mi] for r in rows if r[mi]), '')
+
+    @classmethod
+    def from_nodes(cls, key, label, nodes):
+        cols = []
+        for n in nodes:
+            for child in list(n):
+                if child.tag not in cols:
+                    cols.append(child.tag)
+        rows = []
+        for n in nodes:
+            children = {c.tag: (c.text or '') for c in list(n)}
+            rows.append(tuple(children.get(c, '') for c in cols))
+        return cls(key, label, cols, rows)
+
+    @classmethod
+    def from_arrays(cls, key, label, freq, ords, values, meta=None):
+        """기간 서수/값 배열로 만든 시리즈 (파생 시리즈용; 행은 TIME/DATA_VALUE만)"""
+        times = EcosPeriods.labels(freq, ords)
+        rows = [(t, '' if np.isnan(v) else repr(float(v))) for t, v in zip(times, values.tolist())]
+        ser = cls.__new__(cls)
+        ser.key, ser.label = key, label
+        ser.columns = ['TIME', 'DATA_VALUE']
+        ser.rows = rows
+        ser._col_index = {'TIME': 0, 'DATA_VALUE': 1}
+        ser.times = times
+        ser.values = np.asarray(values, dtype=np.float64)
+        ser.meta = dict(meta or {})
+        ser._periods = (freq, np.asarray(ords, dtype=np.int64))
+        return ser
+
+    def periods(self):
+        """(주기, TIME 기간 서수 배열) — 한 번만 해석해 보관"""
+        if getattr(self, '_periods', None) is None:
+            self._periods = EcosPeriods.parse(self.times)
+        return self._periods
+
+    def __len__(self):
+        return len(self.rows)
+
+    def cell(self, i, col):
+        ci = self._col_index.get(col)
+        return self.rows[i][ci] if ci is not None else ''
+
+
+class EcosSeriesCache:
+    """StatisticSearch 결과 디스크 캐시: 시리즈(STAT_CODE, ITEM_CODE, CYCLE)마다 JSON 한 개
+
+    다시 조회하면 캐시된 마지막 TIME에서 OVERLAP 기간만큼 앞부터만 요청해 개정값을 덮어쓰고,
+    요청 구간이 캐시보다 앞에서 시작하면 그 앞쪽 빈 구간만 추가로 받는다.
+    covered_from: 이미 요청해 본 가장 이른 시작 시점 — 자료가 그보다 늦게 시작해도(앞쪽 요청이 빈 응답)
+    기록해 두어 같은 앞쪽 구간을 매번 다시 요청하지 않음.
+    """
+    VERSION = 1
+    DIRNAME = 'ecos_series_cache'
+    # 주기별 개정 반영용 겹침 기간 수
+    OVERLAP = {'A': 1, 'S': 1, 'Q': 2, 'M': 3, 'SM': 4, 'D': 10}
+    ROW_KEY = ('TIME', 'ITEM_CODE1', 'ITEM_CODE2', 'ITEM_CODE3', 'ITEM_CODE4')
+
+    def __init__(self, dirpath=None):
+        self.dirpath = dirpath or os.path.join(os.getcwd(), self.DIRNAME)
+
+    def _path(self, key):
+        return os.path.join(self.dirpath, re.sub(r'[^0-9A-Za-z]+', '_', '_'.join(key)) + '.json')
+
+    def load(self, key):
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION and data.get('rows'):
+                return data
+        except Exception:
+            pass
+        return None
+
+    def save(self, key, columns, rows, covered_from=None):
+        os.makedirs(self.dirpath, exist_ok=True)
+        ti = columns.index('TIME')
+        first = rows[0][ti]
+        data = {'version': self.VERSION, 'key': list(key), 'saved': time.time(),
+                'first': first, 'last': rows[-1][ti],
+                'covered_from': first if covered_from is None else min(covered_from, first),
+                'columns': columns, 'rows': rows}
+        path = self._path(key)
+        with open(path + '.tmp', 'w', encoding='utf-8') as fw:
+            json.dump(data, fw, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+
+    def _merge(self, old_cols, old_rows, new_cols, new_rows):
+        """행 식별키(TIME, ITEM_CODE1..4)로 병합: 새 행이 같은 키의 캐시 행을 덮어씀, TIME 순 정렬"""
+        cols = list(old_cols)
+        for c in new_cols:
+            if c not in cols:
+                cols.append(c)
+        key_idx = [cols.index(c) for c in self.ROW_KEY if c in cols] or list(range(len(cols)))
+        merged = {}
+        for src_cols, src_rows in ((old_cols, old_rows), (new_cols, new_rows)):
+            pos = [src_cols.index(c) if c in src_cols else None for c in cols]
+            for r in src_rows:
+                row = tuple(r[p] if p is not None else '' for p in pos)
+                merged[tuple(row[i] for i in key_idx)] = row
+        return cols, sorted(merged.values(), key=lambda r: r[key_idx[0]])
+
+    @staticmethod
+    def _cycle(key):
+        return key[2]
+
+    @staticmethod
+    def _request(client, service_key, key, start, end):
+        """한 구간 요청 -> (columns, rows)"""
+        stat_code, item_code, cycle = key
+        nodes, _ = client.statistic_search(service_key, stat_code, cycle, start, end, [item_code])
+        fresh = EcosSeries.from_nodes(key, '', nodes)
+        return fresh.columns, fresh.rows
+
+    def fetch(self, client, service_key, key, start, end):
+        """캐시 + 필요한 구간만 요청해 [start, end] 행 반환 -> (columns, rows, 요청해서 받은 행 수)"""
+        cycle = self._cycle(key)
+        cached = self.load(key)
+        cols, rows = (cached['columns'], [tuple(r) for r in cached['rows']]) if cached else ([], [])
+        # 요청 구간: 캐시가 없으면 전체, 있으면 아직 요청해 본 적 없는 앞쪽 구간 + (마지막 - OVERLAP)부터 뒤쪽
+        windows = [(start, end)]
+        covered = (cached.get('covered_from') or cached['first']) if cached else None
+        if cached:
+            try:
+                overlap = self.OVERLAP.get((cycle or '').upper(), 1)
+                windows = [(max(start, EcosPeriods.shift(cycle, cached['last'], -overlap)), end)]
+                if start < covered:
+                    windows.insert(0, (start, min(end, EcosPeriods.shift(cycle, cached['first'], -1))))
+            except Exception:
+                windows = [(start, end)]
+        perf_metrics.incr('ecos.series_cache.' + ('tail' if cached else 'full'))
+        fetched = 0
+        covered_from = covered
+        for req_start, req_end in windows:
+            if req_start > req_end:
+                continue
+            new_cols, new_rows = self._request(client, service_key, key, req_start, req_end)
+            covered_from = req_start if covered_from is None else min(covered_from, req_start)
+            if not new_rows:
+                continue
+            fetched += len(new_rows)
+            with perf_metrics.stage('ecos.series_cache.merge') as st:
+                cols, rows = self._merge(cols, rows, new_cols, new_rows)
+                st['rows'] = len(new_rows)
+        if rows and (fetched or covered_from != covered):
+            try:
+                self.save(key, cols, rows, covered_from)
+            except Exception as e:
+                perf_metrics.error('ecos.series_cache.save', e)
+        if not rows or 'TIME' not in cols:
+            return cols, rows, fetched
+        ti = cols.index('TIME')
+        return cols, [r for r in rows if (not start or r[ti] >= start) and (not end or r[ti] <= end)], fetched
+
+
+class KosisSeriesCache(EcosSeriesCache):
+    """KOSIS 자료 조회 디스크 캐시: 요청(통계표, 주기, 항목/분류 선택)마다 JSON 한 개
+
+    키: (기관ID, 통계표ID, KOSIS 수록주기, itmId, objL1..) 요청 파라미터. 끝부분만 다시 받는 방식은 ECOS와 같음.
+    """
+    DIRNAME = 'kosis_series_cache'
+    ROW_KEY = ('TIME',) + tuple(f'ITEM_CODE{n}' for n in range(1, KosisClient.MAX_LEVELS + 2))
+
+    def _path(self, key):
+        name = re.sub(r'[^0-9A-Za-z]+', '_', '_'.join(key))
+        if len(name) > 120:
+            name = name[:80] + '_' + hashlib.sha1('\x1f'.join(key).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.dirpath, name + '.json')
+
+    @staticmethod
+    def _cycle(key):
+        return KosisClient.CYCLES[key[2]]
+
+    def __init__(self, dirpath=None):
+        super().__init__(dirpath)
+        self._cells = {}
+
+    def fetch(self, client, service_key, key, start, end, cells=1):
+        """cells: 시점 하나당 예상 셀 수 (KosisClient.data의 구간 분할 기준)"""
+        self._cells[key] = cells
+        return super().fetch(client, service_key, key, start, end)
+
+    def _request(self, client, service_key, key, start, end):
+        org_id, tbl_id, prd_se, itm = key[:4]
+        objs = [('ALL' if v == 'ALL' else [c for c in v.split('+') if c]) for v in key[4:]]
+        records = client.data(service_key, org_id, tbl_id, prd_se, start, end,
+                              'ALL' if itm == 'ALL' else [c for c in itm.split('+') if c], objs,
+                              self._cells.get(key, 1))
+        return KosisClient.to_rows(prd_se, records)
+
+    @staticmethod
+    def request_key(org_id, tbl_id, prd_se, itm_ids, objs):
+        return (org_id, tbl_id, prd_se, KosisClient._param(itm_ids)) + tuple(KosisClient._param(o) for o in objs)
+
+
+class EcosDerived:
+    """ECOS 시리즈 파생 연산(전년동기비/전기비/이동평균/주기 변환) — 원본 시리즈 + 연산 체인별 memo
+
+    키: 원본 키 (STAT_CODE, ITEM_CODE, CYCLE) 뒤에 연산을 이어 붙인 튜플
+        예) (..., 'yoy'), (..., 'agg:Q:mean', 'pop')
+    체인의 각 단계가 따로 memo되고, 원본이 다시 조회돼 저장소의 객체가 바뀌면 그 원본의 memo는 무효.
+    """
+    OPS = (
+        ('yoy', '전년동기비(%)'),
+        ('pop', '전기비(%)'),
+        ('ma:3', '3기 이동평균'),
+        ('ma:12', '12기 이동평균'),
+        ('agg:Q:mean', '분기평균'),
+        ('agg:Q:sum', '분기합계'),
+        ('agg:A:mean', '연평균'),
+        ('agg:A:sum', '연합계'),
+    )
+    LAG_YEAR = {'A': 1, 'S': 2, 'Q': 4, 'M': 12, 'SM': 24}
+
+    def __init__(self, store):
+        self.store = store
+        self._memo = {}
+
+    @classmethod
+    def op_label(cls, op):
+        return dict(cls.OPS).get(op, op)
+
+    def get(self, key):
+        """키 -> EcosSeries (원본 또는 파생), 원본이 없으면 None. 계산 불가 연산은 ValueError"""
+        key = tuple(key)
+        src = self.store.series.get(key[:3])
+        if src is None or len(key) == 3:
+            return src
+        hit = self._memo.get(key)
+        if hit is not None and hit[0] is src:
+            perf_metrics.incr('ecos.derived.hit')
+            return hit[1]
+        parent = self.get(key[:-1])
+        with perf_metrics.stage('ecos.derived') as st:
+            out = self._apply(parent, key[-1], key)
+            st['rows'] = len(out)
+        self._memo[key] = (src, out)
+        return out
+
+    def discard(self, base_key):
+        for k in [k for k in self._memo if k[:3] == tuple(base_key)]:
+            del self._memo[k]
+
+    @staticmethod
+    def _lookup(ords, vals, target):
+        """ords(정렬) 에서 target 서수 위치의 값 (없으면 NaN)"""
+        idx = np.clip(np.searchsorted(ords, target), 0, max(0, len(ords) - 1))
+        ok = (ords[idx] == target) if len(ords) else np.zeros(len(target), dtype=bool)
+        return np.where(ok, vals[idx] if len(vals) else np.nan, np.nan)
+
+    def _apply(self, ser, op, key):
+        freq, ords = ser.periods()
+        ok = ords != EcosPeriods.NA
+        ords, vals = ords[ok], ser.values[ok]
+        order = np.argsort(ords, kind='stable')
+        ords, vals = ords[order], vals[order]
+        unit = ser.meta.get('UNIT_NAME', '')
+        name = op.split(':')[0]
+        if name in ('yoy', 'pop'):
+            if name == 'yoy' and freq == 'D':
+                # 일별: 1년 전 같은 날짜, 휴일이면 그 이전 가장 가까운 관측치(7일 이내)
+                months = EcosPeriods.to_months('D', ords) - 12
+                start = (months - EcosPeriods._EPOCH_MONTH).astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+                target = start + EcosPeriods._day_of_month(ords) - 1
+                idx = np.searchsorted(ords, target, side='right') - 1
+                ok = (idx >= 0) & (target - ords[np.maximum(idx, 0)] < 7)
+                prev = np.where(ok, vals[np.maximum(idx, 0)], np.nan)
+            elif name == 'yoy':
+                prev = self._lookup(ords, vals, ords - self.LAG_YEAR.get(freq, 1))
+            elif freq == 'D':
+                # 일별 전기비는 직전 관측치 대비 (휴일 공백 무시)
+                prev = np.concatenate(([np.nan], vals[:-1]))
+            else:
+                prev = self._lookup(ords, vals, ords - 1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out = np.where(prev != 0, (vals / prev - 1.0) * 100.0, np.nan)
+            unit = '%'
+        elif name == 'ma':
+            n = int(op.split(':')[1])
+            filled = np.where(np.isnan(vals), 0.0, vals)
+            csum = np.concatenate(([0.0], np.cumsum(filled)))
+            ccnt = np.concatenate(([0], np.cumsum(~np.isnan(vals))))
+            out = np.full(len(vals), np.nan)
+            if len(vals) >= n:
+                full = (ccnt[n:] - ccnt[:-n]) == n
+                out[n - 1:] = np.where(full, (csum[n:] - csum[:-n]) / n, np.nan)
+        elif name == 'agg':
+            _, target, how = op.split(':')
+            if EcosPeriods.ORDER.index(target) >= EcosPeriods.ORDER.index(freq):
+                raise ValueError(f"{freq} 주기를 {target} 주기로 묶을 수 없습니다")
+            groups = EcosPeriods.convert(freq, ords, target)
+            uniq, inv = np.unique(groups, return_inverse=True)
+            good = ~np.isnan(vals)
+            sums = np.bincount(inv, weights=np.where(good, vals, 0.0), minlength=len(uniq))
+            cnts = np.bincount(inv, weights=good.astype(np.float64), minlength=len(uniq))
+            out = sums / np.maximum(cnts, 1) if how == 'mean' else sums
+            # 기간이 덜 찬 칸(올해 등)은 비움: 월/분기/반기 원본만 개수를 알 수 있음
+            if freq in EcosPeriods.MONTHS:
+                need = EcosPeriods.MONTHS[target] // EcosPeriods.MONTHS[freq]
+                out = np.where(cnts >= need, out, np.nan)
+            else:
+                out = np.where(cnts > 0, out, np.nan)
+            freq, ords = target, uniq
+        else:
+            raise ValueError(f"알 수 없는 연산: {op}")
+        meta = dict(ser.meta)
+        meta['UNIT_NAME'] = unit
+        return EcosSeries.from_arrays(key, f"{ser.label} [{self.op_label(op)}]", freq, ords, out, meta)
+
+
+class StatsProvider(ABC):
+    """통계 출처(ECOS/KOSIS/지표누리) 공통 인터페이스
+
+    catalog(node) / catalog_stale(node) / refresh_catalog(key, node): 목록 한 단계의 캐시 조회와 갱신
+    (node 의미는 출처마다 다름). fetch(key, spec, start, end) -> (EcosSeries 목록, 새로 받은 행 수):
+    캐시, 페이지/구간 분할은 출처별 구현 안에서 처리. 받은 시리즈는 모두 한 저장소(EcosSeriesStore)에
+    들어가 한 차트 경로(on_bok_plot)로 그린다. 시리즈 키는 (통계표, 항목, 주기) 세 칸이고
+    ECOS가 아닌 출처는 통계표 칸에 KEY_PREFIX를 붙여 구분.
+    """
+    NAME = ''
+    KEY_PREFIX = ''
+
+    def owns(self, series_key):
+        return bool(self.KEY_PREFIX) and str(series_key[0]).startswith(self.KEY_PREFIX)
+
+    @abstractmethod
+    def catalog(self, node=None):
+        """캐시된 목록 한 단계 (없으면 None)"""
+
+    @abstractmethod
+    def catalog_stale(self, node=None):
+        """목록 캐시를 다시 받아야 하면 True"""
+
+    @abstractmethod
+    def refresh_catalog(self, service_key, node=None):
+        """목록 한 단계를 받아 캐시 갱신 -> 바뀌었으면 True"""
+
+    @abstractmethod
+    def fetch(self, service_key, spec, start='', end=''):
+        """-> (EcosSeries 목록, 새로 받은 행 수)"""
+
+
+class EcosProvider(StatsProvider):
+    """node: None(통계표 목록) 또는 STAT_CODE(세부항목 목록); spec: (시리즈 키, 라벨)"""
+    NAME = 'ECOS'
+
+    def __init__(self, client, catalog, cache):
+        self.client = client
+        self.catalog_cache = catalog
+        self.cache = cache
+
+    def owns(self, series_key):
+        return ':' not in str(series_key[0])
+
+    def catalog(self, node=None):
+        return self.catalog_cache.tables() if node is None else self.catalog_cache.items(node)
+
+    def catalog_stale(self, node=None):
+        return self.catalog_cache.is_stale(node)
+
+    def refresh_catalog(self, service_key, node=None):
+        if node is None:
+            return self.catalog_cache.refresh_tables(self.client, service_key)
+        return self.catalog_cache.refresh_items(self.client, service_key, node)
+
+    def fetch(self, service_key, spec, start='', end=''):
+        series_key, label = spec
+        columns, rows, fetched = self.cache.fetch(self.client, service_key, series_key, start, end)
+        return [EcosSeries(series_key, label or ' / '.join(filter(None, series_key)), columns, rows)], fetched
+
+
+class KosisProvider(StatsProvider):
+    """node: KosisCatalog 키('list:상위ID' / 'meta:기관/통계표'); spec: {'org_id', 'tbl_id', 'prd_se', 'itm_ids', 'objs', 'cells'}"""
+    NAME = 'KOSIS'
+    KEY_PREFIX = 'KOSIS:'
+
+    def __init__(self, client, catalog, cache):
+        self.client = client
+        self.catalog_cache = catalog
+        self.cache = cache
+
+    def catalog(self, node=None):
+        return self.catalog_cache.get(node or self.catalog_cache.list_key(''))
+
+    def catalog_stale(self, node=None):
+        return self.catalog_cache.is_stale(node or self.catalog_cache.list_key(''))
+
+    def refresh_catalog(self, service_key, node=None):
+        kind, _, arg = (node or 'list:').partition(':')
+        if kind == 'meta':
+            org_id, tbl_id = arg.split('/', 1)
+            return self.catalog_cache.refresh_meta(self.client, service_key, org_id, tbl_id)
+        return self.catalog_cache.refresh_list(self.client, service_key, arg)
+
+    def fetch(self, service_key, spec, start='', end=''):
+        key = self.cache.request_key(spec['org_id'], spec['tbl_id'], spec['prd_se'], spec['itm_ids'], spec['objs'])
+        columns, rows, fetched = self.cache.fetch(self.client, service_key, key, start, end, spec.get('cells', 1))
+        if not rows:
+            return [], fetched
+        return KosisClient.split_series(spec['org_id'], spec['tbl_id'], spec['prd_se'], columns, rows), fetched
+
+
+class IndProvider(StatsProvider):
+    """지표누리: node = 목록 URL; spec = (지표코드, 통계표코드, 수정일, 라벨)
+
+    상세 표(IndDetailCache)를 시리즈로 바꿈: 시점 열이 있는 긴 표는 (분류 글자 열 조합 x 숫자 열)마다,
+    머리글이 시점인 넓은 표는 행마다 시리즈 하나. 기간 지정 없이 표 전체를 사용.
+    """
+    NAME = '지표누리'
+    KEY_PREFIX = 'IND:'
+    MAX_SERIES = 50
+    _PERIOD_RES = (
+        (re.compile(r'^(\d{4})\s*년?$'), 'A'),
+        (re.compile(r'^(\d{4})\s*[.\-/년]\s*(\d{1,2})\s*월?$'), 'M'),
+        (re.compile(r'^(\d{4})(\d{2})$'), 'M'),
+        (re.compile(r'^(\d{4})\s*[.\-/년]?\s*([1-4])\s*(?:/\s*4|분기|Q)$', re.I), 'Q'),
+        (re.compile(r'^(\d{4})\s*[.\-/ ]?\s*Q([1-4])$', re.I), 'Q'),
+        (re.compile(r'^(\d{4})\s*[.\-/년]?\s*(상|하|[12])\s*반기$'), 'S'),
+        (re.compile(r'^(\d{4})[.\-/]?(\d{2})[.\-/]?(\d{2})$'), 'D'),
+    )
+
+    def __init__(self, catalog, detail_cache):
+        self.catalog_cache = catalog
+        self.cache = detail_cache
+
+    def catalog(self, node=None):
+        return self.catalog_cache.get(node) if node else None
+
+    def catalog_stale(self, node=None):
+        return self.catalog_cache.is_stale(node)
+
+    def refresh_catalog(self, service_key, node=None):
+        return self.catalog_cache.update(node, IndCatalog.fetch(node))
+
+    @classmethod
+    def period_code(cls, text):
+        """'2020', '2020.01', '2020년 1분기', '2020 1/4', '2020.01.31' ... -> (주기, ECOS TIME 코드) 또는 None"""
+        t = re.sub(r'\(.*?\)|[pP]$', '', str(text or '')).strip()
+        for rx, freq in cls._PERIOD_RES:
+            m = rx.match(t)
+            if not m:
+                continue
+            g = m.groups()
+            if freq == 'A':
+                return freq, g[0]
+            if freq == 'M':
+                return freq, f"{g[0]}{int(g[1]):02d}"
+            if freq == 'Q':
+                return freq, f"{g[0]}Q{g[1]}"
+            if freq == 'S':
+                return freq, f"{g[0]}S{1 if g[1] in ('상', '1') else 2}"
+            return freq, f"{g[0]}{g[1]}{g[2]}"
+        return None
+
+    @staticmethod
+    def _make(key, label, freq, codes, values, meta):
+        _, ords = EcosPeriods.parse(codes, freq)
+        vals = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        ok = ords != EcosPeriods.NA
+        ords, vals = ords[ok], vals[ok]
+        order = np.argsort(ords, kind='stable')
+        return EcosSeries.from_arrays(key, label, freq, ords[order], vals[order], meta)
+
+    def to_series(self, ixcode, statscode, label, ent):
+        columns, rows = ent.get('columns') or [], ent.get('rows') or []
+        types, values = ent.get('types'), ent.get('values')
+        if not types or values is None or len(values) != len(rows):
+            typed = HtmlTableExtractor.typed(columns, rows)
+            types, values = typed['types'], typed['values']
+        table_key = f"{self.KEY_PREFIX}{ixcode}/{statscode}"
+        # 숫자 열 값은 추출할 때 values에 float/None으로 변환돼 있음
+        is_num = [c < len(types) and types[c] == 'num' for c in range(len(columns))]
+        out = []
+        # 넓은 표: 머리글 두 개 이상이 시점
+        heads = [self.period_code(c) for c in columns]
+        pcols = [i for i, h in enumerate(heads) if h]
+        if len(pcols) >= 2:
+            freq = max({heads[i][0] for i in pcols}, key=[heads[i][0] for i in pcols].count)
+            pcols = [i for i in pcols if heads[i][0] == freq]
+            lcols = [i for i in range(len(columns)) if i not in pcols]
+            for r, vr in zip(rows[:self.MAX_SERIES], values):
+                name = ' / '.join(r[i] for i in lcols if r[i]) or str(len(out) + 1)
+                out.append(self._make((table_key, name, freq), f"{label} :: {name}", freq,
+                                      [heads[i][1] for i in pcols], [vr[i] if i < len(vr) else None for i in pcols],
+                                      {'STAT_NAME': label, 'ITEM_NAME1': name}))
+            return out
+        # 긴 표: 값의 80% 이상이 시점인 첫 열
+        ti, freq = None, None
+        for c in range(len(columns)):
+            if is_num[c]:
+                continue
+            vals = [r[c] for r in rows if c < len(r) and r[c]]
+            hits = [self.period_code(v) for v in vals]
+            hits = [h[0] for h in hits if h]
+            if len(vals) >= 2 and len(hits) >= 0.8 * len(vals):
+                ti, freq = c, max(set(hits), key=hits.count)
+                break
+        if ti is None:
+            return out
+        vcols = [c for c in range(len(columns)) if is_num[c] and c != ti]
+        gcols = [c for c in range(len(columns)) if not is_num[c] and c != ti]
+        groups = {}
+        for r, vr in zip(rows, values):
+            groups.setdefault(tuple(r[c] for c in gcols), []).append((r, vr))
+        for g, grp in groups.items():
+            for c in vcols:
+                if len(out) >= self.MAX_SERIES:
+                    return out
+                name = ' / '.join([v for v in g if v] + [columns[c]])
+                codes = [(self.period_code(r[ti]) or ('', ''))[1] for r, _ in grp]
+                out.append(self._make((table_key, name, freq), f"{label} :: {name}", freq, codes,
+                                      [vr[c] for _, vr in grp], {'STAT_NAME': label, 'ITEM_NAME1': columns[c]}))
+        return out
+
+    def fetch(self, service_key, spec, start='', end=''):
+        ixcode, statscode, upd, label = spec
+        ent = self.cache.get(ixcode, statscode, upd)
+        fetched = 0
+        if ent is None:
+            ent = self.cache.fetch(service_key, ixcode, statscode, upd)
+            fetched = len(ent['rows'])
+        return self.to_series(ixcode, statscode, label or f"{ixcode}/{statscode}", ent), fetched
+
+
+class EcosSeriesStore:
+    """시계열 저장소: (STAT_CODE, ITEM_CODE, CYCLE) -> EcosSeries (추가 순서 유지)
+
+    ECOS 외 출처(StatsProvider)의 시리즈도 STAT_CODE 칸에 출처 접두어('KOSIS:', 'IND:')를 붙여 함께 보관.
+    결과 표는 이 저장소의 뷰; 표 행 r은 시리즈 길이 누적 오프셋으로 (시리즈, 행)에 대응
+    """
+    def __init__(self):
+        self.series = {}
+        self.columns = []
+        self._offsets = None
+        self._order = None
+
+    def put(self, series):
+        self.series[series.key] = series
+        for c in series.columns:
+            if c not in self.columns:
+                self.columns.append(c)
+        self._offsets = None
+
+    def remove(self, key):
+        ser = self.series.pop(key, None)
+        self._offsets = None
+        return ser
+
+    def _index(self):
+        if self._offsets is None:
+            self._order = list(self.series.values())
+            self._offsets = np.concatenate(([0], np.cumsum([len(s) for s in self._order]))).astype(np.int64)
+        return self._order, self._offsets
+
+    @property
+    def row_count(self):
+        return int(self._index()[1][-1])
+
+    def span(self, key):
+        order, offsets = self._index()
+        for i, s in enumerate(order):
+            if s.key == key:
+                return int(offsets[i]), int(offsets[i + 1])
+        return None
+
+    def locate(self, row):
+        order, offsets = self._index()
+        i = int(np.searchsorted(offsets, row, side='right')) - 1
+        return order[i], row - int(offsets[i])
+
+
+class EcosSeriesModel(QAbstractTableModel):
+    """EcosSeriesStore를 표로 보여주는 읽기 전용 모델 (DATA_VALUE는 천 단위 구분 표시, UserRole은 숫자)"""
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.store.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store.columns)
+
+    @staticmethod
+    def format_value(val):
+        # DATA_VALUE with thousand separators, keeping the original decimals
+        try:
+            s = str(val).replace(',', '').strip()
+            if not s:
+                return val
+            sign = ''
+            if s.startswith(('+', '-')):
+                if s[0] == '-':
+                    sign = '-'
+                s = s[1:]
+            if '.' in s:
+                left, right = s.split('.', 1)
+                left_fmt = format(int(left), ',') if left.isdigit() else left
+                return sign + left_fmt + '.' + right
+            return sign + format(int(s), ',') if s.isdigit() else val
+        except Exception:
+            return val
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.UserRole):
+            return None
+        ser, i = self.store.locate(index.row())
+        col = self.store.columns[index.column()]
+        if col == 'DATA_VALUE':
+            if role == Qt.UserRole:
+                v = ser.values[i]
+                return None if np.isnan(v) else float(v)
+            return self.format_value(ser.cell(i, col))
+        raw = ser.cell(i, col)
+        if role == Qt.UserRole:
+            try:
+                return float(raw.replace(',', ''))
+            except ValueError:
+                return None
+        return raw
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.store.columns[section] if section < len(self.store.columns) else None
+        return section + 1
+
+    def add_series(self, series):
+        """새 키면 끝에 행 블록을 추가하고 True, 이미 있는 키면 데이터를 교체하고 False"""
+        new_cols = [c for c in series.columns if c not in self.store.columns]
+        if series.key in self.store.series:
+            self.beginResetModel()
+            self.store.put(series)
+            self.endResetModel()
+            return False
+        if new_cols:
+            n = len(self.store.columns)
+            self.beginInsertColumns(QModelIndex(), n, n + len(new_cols) - 1)
+            self.store.columns.extend(new_cols)
+            self.endInsertColumns()
+        start = self.store.row_count
+        if len(series):
+            self.beginInsertRows(QModelIndex(), start, start + len(series) - 1)
+            self.store.put(series)
+            self.endInsertRows()
+        else:
+            self.store.put(series)
+        return True
+
+    def remove_series(self, key):
+        span = self.store.span(key)
+        if span is None:
+            return
+        start, end = span
+        if end > start:
+            self.beginRemoveRows(QModelIndex(), start, end - 1)
+            self.store.remove(key)
+            self.endRemoveRows()
+        else:
+            self.store.remove(key)
+
+
+class ChartHitIndex:
+    """차트 점들의 화면(픽셀) 좌표 격자 인덱스
+
+    add(ax, xs, ys, keys)로 점 묶음을 등록하면 nearest(px, py)는 커서 주변 3×3 격자 칸의 후보만 비교함.
+    픽셀 좌표는 축의 보기 범위/크기(확대, 이동, 창 크기 변경)가 바뀐 뒤 첫 조회에서만 다시 계산
+    """
+    def __init__(self, radius=10):
+        self.radius = float(radius)
+        self._groups = []  # (ax, xy[n, 2], keys)
+        self._artists = []
+        self._sig = None
+        self._cells = {}
+        self._pix = np.zeros((0, 2))
+        self._gid = np.zeros(0, dtype=np.int64)
+        self._pid = np.zeros(0, dtype=np.int64)
+
+    def add(self, ax, xs, ys, keys=None, artist=None):
+        """artist를 주면 그 artist(또는 축)가 숨겨진 동안 해당 점들은 조회에서 제외"""
+        xy = np.column_stack([np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)])
+        ok = np.isfinite(xy).all(axis=1) if len(xy) else np.zeros(0, dtype=bool)
+        keys = list(range(len(xy))) if keys is None else list(keys)
+        self._groups.append((ax, xy[ok], [k for k, good in zip(keys, ok) if good]))
+        self._artists.append(artist)
+        self._sig = None
+
+    def _visible_groups(self):
+        vis = np.ones(len(self._groups), dtype=bool)
+        for g, ((ax, _, _), art) in enumerate(zip(self._groups, self._artists)):
+            try:
+                vis[g] = ax.get_visible() and (art is None or art.get_visible())
+            except Exception:
+                pass
+        return vis
+
+    def _signature(self):
+        sig = []
+        for ax, _, _ in self._groups:
+            try:
+                sig.append((tuple(ax.viewLim.bounds), tuple(ax.bbox.bounds)))
+            except Exception:
+                sig.append(None)
+        return tuple(sig)
+
+    def _rebuild(self, sig):
+        pix, gid, pid = [], [], []
+        for g, (ax, xy, _) in enumerate(self._groups):
+            if not len(xy):
+                continue
+            pix.append(ax.transData.transform(xy))
+            gid.append(np.full(len(xy), g, dtype=np.int64))
+            pid.append(np.arange(len(xy), dtype=np.int64))
+        self._cells = {}
+        if pix:
+            self._pix = np.concatenate(pix)
+            self._gid = np.concatenate(gid)
+            self._pid = np.concatenate(pid)
+            cell = np.floor(self._pix / self.radius).astype(np.int64)
+            ucell, inv = np.unique(cell, axis=0, return_inverse=True)
+            inv = inv.reshape(-1)
+            order = np.argsort(inv, kind='stable')
+            bounds = np.concatenate(([0], np.cumsum(np.bincount(inv, minlength=len(ucell)))))
+            for c, (cx, cy) in enumerate(ucell.tolist()):
+                self._cells[(cx, cy)] = order[bounds[c]:bounds[c + 1]]
+        else:
+            self._pix = np.zeros((0, 2))
+        self._sig = sig
+        perf_metrics.incr('chart.hit_index.rebuild')
+
+    def nearest(self, px, py):
+        """반경 안의 가장 가까운 점의 key (없으면 None)"""
+        sig = self._signature()
+        if sig != self._sig:
+            self._rebuild(sig)
+        cx = int(np.floor(px / self.radius))
+        cy = int(np.floor(py / self.radius))
+        cand = [self._cells[k] for k in ((cx + i, cy + j) for i in (-1, 0, 1) for j in (-1, 0, 1)) if k in self._cells]
+        if not cand:
+            return None
+        cand = np.concatenate(cand)
+        cand = cand[self._visible_groups()[self._gid[cand]]]
+        if not len(cand):
+            return None
+        d2 = (self._pix[cand, 0] - px) ** 2 + (self._pix[cand, 1] - py) ** 2
+        best = int(np.argmin(d2))
+        if d2[best] > self.radius * self.radius:
+            return None
+        i = cand[best]
+        return self._groups[self._gid[i]][2][self._pid[i]]
+
+    @staticmethod
+    def bar_at(groups, px, py):
+        """x 위치가 0, 1, 2, … 인 막대 묶음 [(ax, bars)]에서 커서 아래 막대 (없으면 None)"""
+        for ax, bars in groups:
+            try:
+                if not ax.bbox.contains(px, py):
+                    continue
+                xd, yd = ax.transData.inverted().transform((px, py))
+            except Exception:
+                continue
+            i = int(round(xd))
+            if 0 <= i < len(bars):
+                b = bars[i]
+                y0 = b.get_y()
+                y1 = y0 + b.get_height()
+                if b.get_x() <= xd <= b.get_x() + b.get_width() and min(y0, y1) <= yd <= max(y0, y1):
+                    return b
+        return None
+
+
+class ChartBlitter:
+    """툴팁/가이드선처럼 마우스를 따라 움직이는 artist만 다시 그리는 blit 레이어
+
+    add()한 artist는 animated로 바뀌어 일반 그리기에서 빠지고, draw_event마다 정적 배경을 캡처해 둔 뒤
+    update()는 배경 복원 + animated artist만 그려 blit함 (blit 미지원 캔버스는 draw_idle로 대체)
+    """
+    def __init__(self, fig):
+        self.fig = fig
+        self._bg = None
+        self._artists = []
+        # 콜백 레지스트리는 figure에 붙어 있어 FigureCanvas(fig)로 다이얼로그에 옮겨도 유지됨
+        fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add(self, artist):
+        if artist is not None:
+            artist.set_animated(True)
+            self._artists.append(artist)
+        return artist
+
+    def _on_draw(self, event):
+        canvas = self.fig.canvas
+        try:
+            self._bg = canvas.copy_from_bbox(self.fig.bbox)
+        except Exception:
+            self._bg = None
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for a in self._artists:
+            if a.get_visible():
+                try:
+                    self.fig.draw_artist(a)
+                except Exception:
+                    pass
+
+    def clear(self):
+        self._artists = []
+        self._bg = None
+
+    def update(self):
+        canvas = self.fig.canvas
+        if self._bg is None or not getattr(canvas, 'supports_blit', False):
+            canvas.draw_idle()
+            return
+        with perf_metrics.stage('chart.blit'):
+            canvas.restore_region(self._bg)
+            self._draw_animated()
+            canvas.blit(self.fig.bbox)
+
+
+def minmax_downsample(x, y, n_buckets):
+    """x 오름차순 (x, y)를 x 구간 n_buckets개로 나눠 구간별 최소/최대 점(과 양 끝점)만 남김 (봉우리/골 보존)
+
+    NaN/inf 점은 최소/최대 계산에서 빼고, 끊긴 구간마다 첫 점만 따로 남겨 선이 끊기는 자리를 유지
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n <= 2 * n_buckets or n < 3:
+        return x, y
+    span = x[-1] - x[0]
+    if span <= 0:
+        return x, y
+    b = np.minimum(((x - x[0]) / span * n_buckets).astype(np.int64), n_buckets - 1)
+    finite = np.isfinite(y)
+    gaps = np.flatnonzero(~finite & np.r_[True, finite[:-1]])
+    idx = np.flatnonzero(finite)
+    parts = [gaps, [0, n - 1]]
+    if len(idx):
+        # lexsort는 NaN을 맨 뒤(최대 자리)로 보내므로 유한한 점만 정렬
+        order = idx[np.lexsort((y[idx], b[idx]))]
+        bs = b[order]
+        first = np.flatnonzero(np.r_[True, bs[1:] != bs[:-1]])
+        last = np.r_[first[1:] - 1, len(order) - 1]
+        parts += [order[first], order[last]]
+    keep = np.unique(np.concatenate(parts).astype(np.int64))
+    return x[keep], y[keep]
+
+
+class LineLOD:
+    """긴 시계열 Line2D를 현재 x 범위와 축 픽셀 폭에 맞춰 min/max 다운샘플해서 그림
+
+    원본 점은 보관해 두고 확대/이동(xlim_changed)이나 창 크기 변경 때 보이는 구간만 다시 줄임.
+    줄인 상태에서는 마커를 끄고, 점 수가 픽셀 폭 이하로 돌아오면 원본 마커로 복원
+    """
+    def __init__(self, ax, points_per_px=2):
+        self.ax = ax
+        self.points_per_px = points_per_px
+        self._lines = []
+        ax.callbacks.connect('xlim_changed', lambda _ax: self.refresh())
+        ax.figure.canvas.mpl_connect('resize_event', lambda _ev: self.refresh())
+
+    def add(self, line):
+        if line is None:
+            return
+        x, y = line.get_data()
+        self._lines.append({'line': line, 'x': np.asarray(x, dtype=np.float64),
+                            'y': np.asarray(y, dtype=np.float64), 'marker': line.get_marker()})
+
+    def refresh(self):
+        if not self._lines:
+            return
+        lo, hi = sorted(self.ax.get_xlim())
+        width = max(100, int(self.ax.bbox.width))
+        with perf_metrics.stage('chart.lod') as st:
+            drawn = 0
+            for ent in self._lines:
+                x, y, line = ent['x'], ent['y'], ent['line']
+                i0 = max(0, int(np.searchsorted(x, lo)) - 1)
+                i1 = min(len(x), int(np.searchsorted(x, hi, side='right')) + 1)
+                if i1 - i0 > width * self.points_per_px:
+                    xs, ys = minmax_downsample(x[i0:i1], y[i0:i1], width)
+                    line.set_data(xs, ys)
+                    line.set_marker('None')
+                    drawn += len(xs)
+                else:
+                    line.set_data(x, y)
+                    line.set_marker(ent['marker'])
+                    drawn += len(x)
+            st['rows'] = drawn
+
+
+class AptChartPanel(QDialog):
+    """월별 거래량/총액 차트 창 (비모달, 재사용)
+
+    figure/canvas/toolbar는 한 번만 만들고 update_data()는 막대 높이와 선 데이터만 바꿔 다시 그림.
+    차트 종류나 월 개수가 바뀔 때만 축과 artist를 새로 구성. 창이 열려 있는 동안은
+    apt_selection_changed 신호로 필터/검색 결과를 따라 자동 갱신됨
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setModal(False)
+        try:
+            self.setWindowFlags(self.windowFlags() | Qt.WindowMinMaxButtonsHint)
+        except Exception:
+            pass
+        from matplotlib.figure import Figure
+        self.fig = Figure(figsize=(12, 6))
+        self.canvas = FigureCanvas(self.fig)
+        lay = QVBoxLayout(self)
+        try:
+            lay.addWidget(NavigationToolbar(self.canvas, self))
+        except Exception:
+            pass
+        lay.addWidget(self.canvas)
+        self.resize(1000, 700)
+        self.blit = ChartBlitter(self.fig)
+        self.fig.canvas.mpl_connect('motion_notify_event', self._on_move)
+        self._layout_key = None
+        self._bars = {}
+        self._lines = {}
+        self._value_axes = []
+        self._tick_axes = []
+        self._line_index = None
+        self._bar_info = {}
+        self._bar_groups = []
+        self._annotators = {}
+        self._guides = {}
+
+    @property
+    def mode(self):
+        return self._layout_key[0] if self._layout_key else '기본(혼합)'
+
+    def _build(self, mode, n):
+        self.fig.clear()
+        self.blit.clear()
+        self._annotators = {}
+        self._guides = {}
+        x = list(range(n))
+        zeros = [0] * n
+        if mode == '서브플롯(4)':
+            axes = self.fig.subplots(2, 2)
+            self._bars = {
+                'rent': axes[0, 0].bar(x, zeros, color='orange', label='전월세 거래량'),
+                'buy': axes[0, 1].bar(x, zeros, color='blue', label='매매 거래량'),
+            }
+            axes[0, 0].set_title('월별 전월세 거래량')
+            axes[0, 1].set_title('월별 매매 거래량')
+            self._lines = {
+                'buy': axes[1, 0].plot(x, zeros, marker='o', label='매매 총액(억원)')[0],
+                'rent': axes[1, 1].plot(x, zeros, marker='o', color='orange', label='전월세 총액(억원)')[0],
+            }
+            axes[1, 0].set_title('월별 매매 총액')
+            axes[1, 1].set_title('월별 전월세 총액')
+            self._value_axes = list(axes.flatten())
+            self._tick_axes = list(axes.flatten())
+        else:
+            ax1 = self.fig.add_subplot(111)
+            self._bars = {
+                'rent': ax1.bar(x, zeros, label='전월세 거래량', color='orange', alpha=0.6),
+                'buy': ax1.bar(x, zeros, label='매매 거래량', color='blue', alpha=0.6, bottom=zeros),
+            }
+            ax1.set_xlabel('연-월')
+            ax1.set_ylabel('거래량')
+            ax2 = ax1.twinx()
+            self._lines = {
+                'buy': ax2.plot(x, zeros, label='매매 총액(억원)', color='navy', marker='o')[0],
+                'rent': ax2.plot(x, zeros, label='전월세 총액(억원)', color='darkorange', marker='o')[0],
+            }
+            ax2.set_ylabel('총액(억원)')
+            lines1, labels1 = ax1.get_legend_handles_labels()
+            lines2, labels2 = ax2.get_legend_handles_labels()
+            ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
+            ax2.set_title('월별 거래량 및 총액')
+            self._value_axes = [ax1, ax2]
+            self._tick_axes = [ax1]
+        for ax in self._tick_axes:
+            ax.set_xticks(x)
+            ax.tick_params(axis='x', rotation=45)
+        self._bar_groups = [(bars[0].axes, bars) for bars in self._bars.values() if len(bars)]
+        self._layout_key = (mode, n)
+
+    def update_data(self, mode, keys, buy_counts, rent_counts, buy_sums_y, rent_sums_y):
+        n = len(keys)
+        rebuilt = (mode, n) != self._layout_key
+        if rebuilt:
+            self._build(mode, n)
+        self.setWindowTitle(f"차트: {mode}")
+        stacked = mode != '서브플롯(4)'
+        for i, bar in enumerate(self._bars['rent']):
+            bar.set_height(rent_counts[i])
+        for i, bar in enumerate(self._bars['buy']):
+            if stacked:
+                bar.set_y(rent_counts[i])
+            bar.set_height(buy_counts[i])
+        self._lines['buy'].set_ydata(buy_sums_y)
+        self._lines['rent'].set_ydata(rent_sums_y)
+        for ax in self._tick_axes:
+            ax.set_xticklabels(keys)
+        for ax in self._value_axes:
+            ax.relim()
+            ax.autoscale_view()
+
+        # hover 대상: 선 점은 화면좌표 격자 인덱스, 막대는 x 위치 반올림
+        self._line_index = ChartHitIndex(radius=8)
+        for name, series, values in (('buy', '매매 총액(억원)', buy_sums_y), ('rent', '전월세 총액(억원)', rent_sums_y)):
+            line = self._lines[name]
+            pts = [{'series': series, 'x': keys[i], 'xpos': i, 'y': v, 'ax': line.axes} for i, v in enumerate(values)]
+            self._line_index.add(line.axes, range(n), values, keys=pts)
+        self._bar_info = {}
+        for name, series, values in (('rent', '전월세 거래량', rent_counts), ('buy', '매매 거래량', buy_counts)):
+            for i, bar in enumerate(self._bars[name]):
+                self._bar_info[bar] = {'series': series, 'x': keys[i], 'y': values[i]}
+        for a in list(self._annotators.values()) + list(self._guides.values()):
+            a.set_visible(False)
+        if rebuilt:
+            try:
+                self.fig.tight_layout()
+            except Exception:
+                pass
+        self.canvas.draw_idle()
+
+    def _annotator(self, ax):
+        annot = self._annotators.get(ax)
+        if annot is None:
+            annot = ax.annotate('', xy=(0, 0), xytext=(15, 15), textcoords='offset points',
+                                bbox=dict(boxstyle='round', fc='w'), zorder=10)
+            self._annotators[ax] = self.blit.add(annot)
+        return annot
+
+    def _guide(self, ax):
+        lg = self._guides.get(ax)
+        if lg is None:
+            lg = ax.plot([], [], color='gray', linestyle='--', linewidth=0.8, zorder=2)[0]
+            self._guides[ax] = self.blit.add(lg)
+        return lg
+
+    def _hide_tooltips(self, keep=None):
+        for ax, a in list(self._annotators.items()) + list(self._guides.items()):
+            if ax is not keep:
+                a.set_visible(False)
+
+    def _on_move(self, event):
+        try:
+            info = None
+            if event.inaxes is not None and self._line_index is not None:
+                # prefer line point proximity over bars
+                hit = self._line_index.nearest(event.x, event.y)
+                if hit is not None:
+                    ax = hit['ax']
+                    info = hit
+                    anchor = (hit['xpos'], hit['y'])
+                    text = f"{hit['series']}\n{hit['x']}\n{hit['y']:.2f}"
+                else:
+                    bar = ChartHitIndex.bar_at(self._bar_groups, event.x, event.y)
+                    if bar is not None:
+                        ax = bar.axes
+                        info = self._bar_info[bar]
+                        anchor = (bar.get_x() + bar.get_width() / 2.0, bar.get_y() + bar.get_height())
+                        text = f"{info['series']}\n{info['x']}\n{info['y']}"
+            if info is None:
+                self._hide_tooltips()
+                self.blit.update()
+                return
+            self._hide_tooltips(keep=ax)
+            annot = self._annotator(ax)
+            annot.xy = anchor
+            annot.set_text(text)
+            annot.set_visible(True)
+            # guide line from data point to tooltip
+            try:
+                tx, ty = ax.transData.inverted().transform((event.x + 15, event.y + 15))
+            except Exception:
+                tx, ty = anchor
+            lg = self._guide(ax)
+            lg.set_data([anchor[0], tx], [anchor[1], ty])
+            lg.set_visible(True)
+            self.blit.update()
+        except Exception:
+            pass
+
+
 class VWorldAdmCodeGUI(QWidget):
+    # 아파트 표시 행(필터/검색 결과)이 바뀔 때마다 발생 -> 열려 있는 차트 창이 구독해서 갱신
+    apt_selection_changed = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.init_ui()
+        self.apt_selection_changed.connect(self._on_apt_selection_changed)
 
     def init_ui(self):
         self.setWindowTitle("VWorld 행정구역 코드 조회")
@@ -187,6 +3757,13 @@ class VWorldAdmCodeGUI(QWidget):
             pass
         tr_layout.addWidget(self.chk_sale, 0, 0)
         tr_layout.addWidget(self.chk_rent, 1, 0)
+        # 조회할 부동산 종류 (매매/전월세 체크 오른쪽, 두 줄로 배치)
+        self.apt_type_checks = {}
+        for i, name in enumerate(RtmsEndpoint.TYPE_NAMES):
+            chk = QCheckBox(name)
+            chk.setChecked(name == '아파트')
+            self.apt_type_checks[name] = chk
+            tr_layout.addWidget(chk, i % 2, 1 + i // 2)
         group_tr_type.setLayout(tr_layout)
         layout.addWidget(group_tr_type, 2, 0)
         layout.addWidget(group_region, 2, 1)
@@ -201,7 +3778,7 @@ class VWorldAdmCodeGUI(QWidget):
         lbl_apt_key = QLabel("Service Key:")
         # 기본값 설정
         self.edit_apt_key = QLineEdit("Nv0jBnCHJXCT20iu910K%2FIGnF556Vt2w06icWR2uj66dF73AiTNBXaM7bIS9Nu9C0cmB7sGVgpnbCiK01Qkgeg%3D%3D")
-        self.edit_apt_key.setPlaceholderText("발급받은 인증키를 입력하세요 (URL 디코딩된 값 권장)")
+        self.edit_apt_key.setPlaceholderText("발급받은 인증키를 입력하세요 (URL 디코딩된 값 권장, 여러 개는 쉼표로 구분)")
 
         lbl_apt_lawd = QLabel("지역코드(LAWD_CD):")
         self.edit_apt_lawd = QLineEdit()
@@ -256,7 +3833,7 @@ class VWorldAdmCodeGUI(QWidget):
         self.btn_apt_chart.setEnabled(False)
 
         self.combo_chart_type = QComboBox()
-        self.combo_chart_type.addItems(["기본(혼합)", "서브플롯(4)"])
+        self.combo_chart_type.addItems(["기본(혼합)", "서브플롯(4)", "요약(지역×면적)", "가격분위(p10/중앙/p90)"])
         try:
             self.combo_chart_type.setMaxVisibleItems(8)
         except Exception:
@@ -277,6 +3854,10 @@ class VWorldAdmCodeGUI(QWidget):
         except Exception:
             pass
 
+        self.btn_apt_bulk = QPushButton("전국 일괄 갱신")
+        self.btn_apt_bulk.setToolTip("전체 시군구 x 조회기간 x 선택한 부동산 종류를 받아 캐시를 채웁니다 (표에는 표시하지 않음)")
+        self.btn_apt_bulk.clicked.connect(self.on_apt_bulk)
+
         self.btn_apt_cancel = QPushButton("취소")
         self.btn_apt_cancel.clicked.connect(self.on_apt_cancel)
         self.btn_apt_cancel.setEnabled(False)
@@ -299,8 +3880,14 @@ class VWorldAdmCodeGUI(QWidget):
         # insert 월세(만원) at index 5 (after 거래금액, before 층)
         apt_headers.insert(5, "월세(만원)")
         apt_headers.extend(extra_rent_cols)
+        # 부동산 종류(세부 유형): 여러 종류를 한 번에 조회할 때 구분용
+        apt_headers.append(RtmsEndpoint.TYPE_COLUMN)
         # 기본 헤더 보관: 필요 시 결과에 맞춰 재구성하는 기준으로 사용
         self.apt_default_headers = list(apt_headers)
+        self.rtms_cache = RtmsCache()
+        self.rtms_planner = RtmsBulkPlanner(self.rtms_cache)
+        self.rtms_key_pool = ServiceKeyPool()
+        self._apt_plan_worker = None
         self.apt_table.setColumnCount(len(apt_headers))
         self.apt_table.setHorizontalHeaderLabels(apt_headers)
         hdr = self.apt_table.horizontalHeader()
@@ -350,6 +3937,7 @@ class VWorldAdmCodeGUI(QWidget):
         # 최종 URL은 종료년월 다음 줄에 배치 (URL 필드는 2열을 차지)
         gr_layout.addWidget(lbl_apt_url, 3, 0)
         gr_layout.addWidget(self.edit_apt_url, 3, 1, 1, 2)
+        gr_layout.addWidget(self.btn_apt_bulk, 4, 0, 1, 3)
         group_range.setLayout(gr_layout)
         # 범위설정 프레임을 지역 프레임 오른쪽(거래유형 오른쪽)으로 배치
         layout.addWidget(group_range, 2, 2)
@@ -403,6 +3991,10 @@ class VWorldAdmCodeGUI(QWidget):
 
         group_layout.addWidget(lbl_bok_list, 1, 0)
         group_layout.addWidget(self.bok_combo, 1, 1, 1, 5)
+        # ECOS·지표누리 목록 통합 검색
+        self.btn_catalog_search = QPushButton("통계 검색")
+        self.btn_catalog_search.clicked.connect(self.on_catalog_search)
+        group_layout.addWidget(self.btn_catalog_search, 0, 2)
         # 세부 목록 콤보박스 (서비스 통계 목록 선택 시 채워짐)
         lbl_bok_detail = QLabel("세부 목록:")
         self.bok_detail_combo = QComboBox()
@@ -434,11 +4026,17 @@ class VWorldAdmCodeGUI(QWidget):
         group_layout.addWidget(self.combo_period_start, 3, 1)
         group_layout.addWidget(lbl_period_end, 3, 2)
         group_layout.addWidget(self.combo_period_end, 3, 3)
+        # 파생 시리즈: 저장된 목록에서 고른 항목에 변환(전년동기비/이동평균/주기 변환 등)을 적용해 목록에 추가
+        self.combo_bok_derive = QComboBox()
+        for op, text in EcosDerived.OPS:
+            self.combo_bok_derive.addItem(text, op)
+        self.btn_bok_derive = QPushButton("파생 추가")
+        self.btn_bok_derive.clicked.connect(self.on_bok_derive)
+        group_layout.addWidget(self.combo_bok_derive, 3, 4)
+        group_layout.addWidget(self.btn_bok_derive, 3, 5)
         # saved list box under Data 1: shows appended selections
         lbl_saved_list = QLabel("저장된 목록:")
         self.bok_listbox = QListWidget()
-        # storage for mapping listbox entries -> table row ranges
-        self.bok_saved_ranges = []
         try:
             self.bok_listbox.setFixedHeight(100)
         except Exception:
@@ -455,13 +4053,50 @@ class VWorldAdmCodeGUI(QWidget):
         group_data1.setLayout(group_layout)
         econ_layout.addWidget(group_data1, 0, 0, 1, 7)
 
+        # 여러 세부 항목을 골라 백그라운드에서 동시에 조회
+        self.btn_bok_batch = QPushButton("여러 항목 조회")
+        self.btn_bok_batch.clicked.connect(self.on_bok_batch)
+
         econ_layout.addWidget(self.btn_bok_print, 1, 0)
         econ_layout.addWidget(self.btn_bok_chart, 1, 1)
-
-        self.bok_result_table = QTableWidget()
-        self.bok_result_table.setColumnCount(0)
-        self.bok_result_table.setRowCount(0)
-        self.bok_result_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        econ_layout.addWidget(self.btn_bok_batch, 1, 3)
+        # 긴 시계열은 화면 픽셀 폭에 맞춰 min/max 다운샘플 (확대 시 재계산)
+        self.chk_bok_lod = QCheckBox("LOD(다운샘플)")
+        self.chk_bok_lod.setChecked(True)
+        econ_layout.addWidget(self.chk_bok_lod, 1, 2)
+
+        # 결과 표는 ECOS 시리즈 저장소를 보여주는 모델 뷰 (행은 저장소에만 존재)
+        self.ecos_client = EcosClient()
+        # 통계표/세부항목 목록은 디스크 캐시에서 바로 채우고 갱신은 백그라운드에서
+        self.ecos_catalog = EcosCatalog()
+        self.ecos_series_cache = EcosSeriesCache()
+        self._ecos_catalog_workers = {}
+        self._catalog_index = None  # CatalogSearchIndex; 목록이 바뀌면 None으로 두고 검색 때 다시 생성
+        self.ind_catalog = IndCatalog()
+        self.ind_detail_cache = IndDetailCache()
+        self.ind_index_to_code = {}
+        self.ind_index_to_upd = {}
+        self.kosis_client = KosisClient()
+        self.kosis_catalog = KosisCatalog()
+        self.kosis_series_cache = KosisSeriesCache()
+        # 출처별 목록 갱신(CatalogWorker)과 시리즈 조회(SeriesFetchWorker)는 모두 StatsProvider를 거침
+        self.stats_providers = {
+            'ecos': EcosProvider(self.ecos_client, self.ecos_catalog, self.ecos_series_cache),
+            'kosis': KosisProvider(self.kosis_client, self.kosis_catalog, self.kosis_series_cache),
+            'ind': IndProvider(self.ind_catalog, self.ind_detail_cache),
+        }
+        # 모든 출처의 시리즈가 한 저장소/결과 표/차트를 공유
+        self.ecos_store = EcosSeriesStore()
+        self.ecos_derived = EcosDerived(self.ecos_store)
+        self.bok_result_model = EcosSeriesModel(self.ecos_store, self)
+        self.bok_result_table = QTableView()
+        self.bok_result_table.setModel(self.bok_result_model)
+        self.bok_result_table.setEditTriggers(QTableView.NoEditTriggers)
+        try:
+            # resizeColumnsToContents가 전체 행을 훑지 않도록 표본 행 수 제한
+            self.bok_result_table.horizontalHeader().setResizeContentsPrecision(200)
+        except Exception:
+            pass
         econ_layout.addWidget(self.bok_result_table, 2, 0, 1, 7)
 
         tab_econ.setLayout(econ_layout)
@@ -481,19 +4116,47 @@ class VWorldAdmCodeGUI(QWidget):
         lbl_kostat_list = QLabel("서비스 목록:")
         self.kostat_combo = QComboBox()
         self.kostat_combo.setEditable(False)
+        # 목록은 한 단계씩: [목록] 항목을 고르면 하위 목록, 통계표를 고르면 아래 표에 항목/분류 메타
+        self.kostat_combo.activated.connect(self.on_kostat_select)
         kostat_layout.addWidget(lbl_kostat_list, 1, 0)
         kostat_layout.addWidget(self.kostat_combo, 1, 1, 1, 4)
+        self.btn_kostat_up = QPushButton("상위 목록")
+        self.btn_kostat_up.clicked.connect(self.on_kostat_up)
+        kostat_layout.addWidget(self.btn_kostat_up, 1, 5)
 
         self.btn_kostat_list = QPushButton("리스트받기")
         self.btn_kostat_list.clicked.connect(self.on_kostat_list)
         kostat_layout.addWidget(self.btn_kostat_list, 2, 0)
+        self.combo_kostat_cycle = QComboBox()
+        kostat_layout.addWidget(self.combo_kostat_cycle, 2, 1)
+        this_year = datetime.date.today().year
+        self.edit_kostat_start = QLineEdit(str(this_year - 10))
+        self.edit_kostat_start.setPlaceholderText("시작 연도 (YYYY)")
+        self.edit_kostat_end = QLineEdit(str(this_year))
+        self.edit_kostat_end.setPlaceholderText("종료 연도 (YYYY)")
+        kostat_layout.addWidget(self.edit_kostat_start, 2, 2)
+        kostat_layout.addWidget(self.edit_kostat_end, 2, 3)
+        # 받은 시리즈는 한국은행 탭의 저장 목록/결과 표에 추가돼 ECOS 시리즈와 함께 차트로 그림
+        self.btn_kostat_fetch = QPushButton("자료 조회(저장 목록에 추가)")
+        self.btn_kostat_fetch.clicked.connect(self.on_kostat_fetch)
+        kostat_layout.addWidget(self.btn_kostat_fetch, 2, 4, 1, 2)
 
         self.kostat_table = QTableWidget()
         self.kostat_table.setColumnCount(0)
         self.kostat_table.setRowCount(0)
         self.kostat_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        # 항목/분류값 여러 개 선택 (분류 단계에서 아무것도 고르지 않으면 전체)
+        self.kostat_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.kostat_table.setSelectionMode(QTableWidget.MultiSelection)
         kostat_layout.addWidget(self.kostat_table, 3, 0, 1, 6)
 
+        self._kosis_workers = {}
+        self._kosis_path = []  # 열어 본 상위 목록 ID 스택 (루트는 '')
+        self._kosis_table = None  # (기관ID, 통계표ID, 통계표명)
+        self._kosis_levels = []
+        self._kosis_data_worker = None
+        self._kosis_data_failed = False
+
         tab_kostat.setLayout(kostat_layout)
         self.tabs.addTab(tab_kostat, "통계청")
 
@@ -505,6 +4168,13 @@ class VWorldAdmCodeGUI(QWidget):
         self.edit_ind_key.setPlaceholderText("지표누리 인증키")
         ind_layout.addWidget(lbl_ind_key, 0, 0)
         ind_layout.addWidget(self.edit_ind_key, 0, 1)
+        btn_ind_search = QPushButton("통계 검색")
+        btn_ind_search.clicked.connect(self.on_catalog_search)
+        ind_layout.addWidget(btn_ind_search, 0, 2)
+        # 선택한 상세 표를 시리즈로 바꿔 경제지표 탭 저장 목록에 추가 (ECOS/KOSIS와 같은 차트)
+        self.btn_ind_series = QPushButton("차트 목록에 추가")
+        self.btn_ind_series.clicked.connect(self.on_ind_to_series)
+        ind_layout.addWidget(self.btn_ind_series, 0, 3)
         # URL input below the key (default value)
         lbl_ind_url = QLabel("지표누리 URL:")
         self.edit_ind_url = QLineEdit("https://www.index.go.kr/unity/openApi/xml_idx.do?userId=youngbbo&idntfcId=H4T022E22214155B")
@@ -629,6 +4299,10 @@ class VWorldAdmCodeGUI(QWidget):
         tab_source.setLayout(source_layout)
         self.tabs.addTab(tab_source, "출처")
 
+        # 성능 탭: 단계별 타이머/카운터/프로파일 결과 표시 및 JSON 내보내기
+        self.tab_metrics = self._init_metrics_tab()
+        self.tabs.addTab(self.tab_metrics, "성능")
+
         main_layout = QGridLayout()
         main_layout.addWidget(self.tabs, 0, 0)
         self.setLayout(main_layout)
@@ -684,6 +4358,7 @@ class VWorldAdmCodeGUI(QWidget):
         # 자동으로 요청 실행 (이벤트 루프가 시작된 직후 호출)
         QTimer.singleShot(0, self.send_request)
         QTimer.singleShot(0, self.on_bok_search)
+        QTimer.singleShot(0, self._show_cached_ind_list)
 
     def resizeEvent(self, event):
         try:
@@ -709,8 +4384,133 @@ class VWorldAdmCodeGUI(QWidget):
 
         # Note: do NOT clear worker handle here; resize should not affect worker lifecycle
 
+    # =========== 성능 계측 패널 ===========
+    def _init_metrics_tab(self):
+        tab = QWidget()
+        lay = QGridLayout()
+        self.metrics_stage_table = QTableWidget()
+        self.metrics_stage_table.setColumnCount(8)
+        self.metrics_stage_table.setHorizontalHeaderLabels(
+            ["단계", "횟수", "총(ms)", "평균(ms)", "최대(ms)", "바이트", "행", "행/초"])
+        self.metrics_stage_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.metrics_stage_table.setSortingEnabled(True)
+        lay.addWidget(self.metrics_stage_table, 0, 0, 1, 4)
+
+        self.metrics_counter_table = QTableWidget()
+        self.metrics_counter_table.setColumnCount(2)
+        self.metrics_counter_table.setHorizontalHeaderLabels(["카운터", "값"])
+        self.metrics_counter_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        lay.addWidget(self.metrics_counter_table, 1, 0, 1, 2)
+
+        # 프로파일링할 작업(action) 선택: 체크된 항목만 cProfile/pyinstrument로 감쌈
+        group_prof = QGroupBox("프로파일링")
+        prof_layout = QGridLayout()
+        self.metrics_profiler_combo = QComboBox()
+        self.metrics_profiler_combo.addItems(list(PerfMetrics.PROFILERS))
+        self.metrics_profiler_combo.currentTextChanged.connect(
+            lambda t: setattr(perf_metrics, 'profiler', t))
+        prof_layout.addWidget(QLabel("프로파일러:"), 0, 0)
+        prof_layout.addWidget(self.metrics_profiler_combo, 0, 1)
+        self.metrics_action_list = QListWidget()
+        for action in ("apt_fetch", "apt_chart", "bok_search", "bok_print", "bok_plot", "ind_list", "ind_select"):
+            it = QListWidgetItem(action)
+            it.setFlags(it.flags() | Qt.ItemIsUserCheckable)
+            it.setCheckState(Qt.Unchecked)
+            self.metrics_action_list.addItem(it)
+        self.metrics_action_list.itemChanged.connect(self._on_metrics_action_toggled)
+        prof_layout.addWidget(self.metrics_action_list, 1, 0, 1, 2)
+        group_prof.setLayout(prof_layout)
+        lay.addWidget(group_prof, 1, 2, 1, 2)
+
+        self.metrics_text = QTextEdit()
+        self.metrics_text.setReadOnly(True)
+        lay.addWidget(self.metrics_text, 2, 0, 1, 4)
+
+        btn_refresh = QPushButton("새로고침")
+        btn_refresh.clicked.connect(self.refresh_metrics_panel)
+        btn_reset = QPushButton("초기화")
+        btn_reset.clicked.connect(self.on_metrics_reset)
+        btn_export = QPushButton("JSON 내보내기")
+        btn_export.clicked.connect(self.on_metrics_export)
+        lay.addWidget(btn_refresh, 3, 0)
+        lay.addWidget(btn_reset, 3, 1)
+        lay.addWidget(btn_export, 3, 2)
+        tab.setLayout(lay)
+
+        # 성능 탭이 보이는 동안에만 1초마다 갱신
+        self._metrics_timer = QTimer(self)
+        self._metrics_timer.setInterval(1000)
+        self._metrics_timer.timeout.connect(self._on_metrics_timer)
+        self._metrics_timer.start()
+        return tab
+
+    def _on_metrics_action_toggled(self, item):
+        try:
+            if item.checkState() == Qt.Checked:
+                perf_metrics.profile_actions.add(item.text())
+            else:
+                perf_metrics.profile_actions.discard(item.text())
+        except Exception:
+            pass
+
+    def _on_metrics_timer(self):
+        try:
+            if self.tabs.currentWidget() is self.tab_metrics:
+                self.refresh_metrics_panel()
+        except Exception:
+            pass
+
+    def refresh_metrics_panel(self):
+        snap = perf_metrics.snapshot()
+        tbl = self.metrics_stage_table
+        tbl.setSortingEnabled(False)
+        tbl.setRowCount(len(snap['stages']))
+        for r, (name, st) in enumerate(sorted(snap['stages'].items())):
+            vals = [
+                st['count'], st['total'] * 1000.0, st['avg'] * 1000.0, st['max'] * 1000.0,
+                st['bytes'], st['rows'], st['rows_per_s'],
+            ]
+            tbl.setItem(r, 0, QTableWidgetItem(name))
+            for c, v in enumerate(vals, start=1):
+                txt = f"{v:,.1f}" if isinstance(v, float) else f"{v:,}"
+                it = QTableWidgetItem(txt)
+                it.setData(Qt.EditRole, v)
+                tbl.setItem(r, c, it)
+        tbl.setSortingEnabled(True)
+
+        ctbl = self.metrics_counter_table
+        ctbl.setRowCount(len(snap['counters']))
+        for r, (name, v) in enumerate(sorted(snap['counters'].items())):
+            ctbl.setItem(r, 0, QTableWidgetItem(name))
+            ctbl.setItem(r, 1, QTableWidgetItem(f"{v:,}"))
+
+        lines = []
+        for action, p in sorted(snap['profiles'].items()):
+            ts = datetime.datetime.fromtimestamp(p['ts']).strftime('%H:%M:%S')
+            lines.append(f"=== {action} ({p['profiler']}, {ts}) ===")
+            lines.append(p['text'])
+        if snap['errors']:
+            lines.append("=== 최근 오류 ===")
+            for e in list(snap['errors'])[-30:]:
+                ts = datetime.datetime.fromtimestamp(e['ts']).strftime('%H:%M:%S')
+                lines.append(f"[{ts}] {e['where']}: {e['error']}")
+        text = "\n".join(lines)
+        if text != self.metrics_text.toPlainText():
+            self.metrics_text.setPlainText(text)
+
+    def on_metrics_reset(self):
+        perf_metrics.reset()
+        self.refresh_metrics_panel()
+
+    def on_metrics_export(self):
+        filename = f"perf_metrics_{int(time.time())}.json"
+        try:
+            perf_metrics.export_json(filename)
+            QMessageBox.information(self, "저장 성공", f"{filename} 으로 저장되었습니다.")
+        except Exception as e:
+            QMessageBox.critical(self, "저장 실패", str(e))
+
 
- 
 
     def send_request(self):
         key = self.edit_key.text().strip()
@@ -1083,207 +4883,183 @@ class VWorldAdmCodeGUI(QWidget):
             QMessageBox.information(self, "결과 없음", "선택한 읍면동에 대한 결과가 없습니다.")
 
     # =========== 한국은행(ECOS) 통계표 목록 조회 ===========
+    @perf_action('bok_search')
     def on_bok_search(self):
-        # Use fixed parameters per requirements
-        service = "StatisticTableList"
-        key = self.edit_bok_key.text().strip()
-        req_type = "xml"
-        lang = "kr"
-        start = "1"
-        end = "1000"
-        stat_code = ""
+        """통계표 목록: 캐시가 있으면 즉시 채우고, 없거나 오래됐으면 전체 목록을 백그라운드에서 갱신"""
+        rows = self.ecos_catalog.tables()
+        if rows is not None:
+            perf_metrics.incr('ecos.catalog.hit')
+            self._populate_bok_tables(rows)
+        if rows is not None and not self.ecos_catalog.is_stale():
+            return
 
+        key = self.edit_bok_key.text().strip()
         if not key:
-            QMessageBox.warning(self, "입력 오류", "한국은행 인증키를 입력하세요.")
+            if rows is None:
+                QMessageBox.warning(self, "입력 오류", "한국은행 인증키를 입력하세요.")
             return
+        self._refresh_ecos_catalog(key)
 
-        base = "https://ecos.bok.or.kr/api"
-        parts = [base, service, key, req_type, lang, start, end]
-        if stat_code:
-            parts.append(stat_code)
-        url = "/".join(parts)
-
-        try:
-            resp = requests.get(url, timeout=15)
-            resp.raise_for_status()
-            data = resp.content
-        except Exception as e:
-            QMessageBox.critical(self, "요청 실패", f"API 요청 중 오류가 발생했습니다:\n{e}")
+    def _refresh_ecos_catalog(self, key, stat_code=None):
+        # 같은 목록을 받는 작업이 이미 돌고 있으면 그 결과를 기다린다
+        if stat_code in self._ecos_catalog_workers:
             return
-
-        try:
-            root = ET.fromstring(data)
-        except Exception as e:
-            QMessageBox.critical(self, "파싱 오류", f"응답 XML 파싱 실패:\n{e}")
+        worker = CatalogWorker(self.stats_providers['ecos'], key, stat_code, parent=self)
+        self._ecos_catalog_workers[stat_code] = worker
+        worker.done.connect(self._on_ecos_catalog_done)
+        worker.failed.connect(self._on_ecos_catalog_failed)
+        worker.finished.connect(lambda: self._ecos_catalog_workers.pop(stat_code, None))
+        worker.start()
+
+    def _on_ecos_catalog_done(self, stat_code, changed):
+        if changed:
+            self._catalog_index = None
+        if stat_code is None:
+            rows = self.ecos_catalog.tables() or []
+            if changed or self.bok_combo.count() == 0:
+                self._populate_bok_tables(rows)
+            if not rows:
+                QMessageBox.information(self, "결과 없음", "조회된 결과가 없습니다.")
             return
+        # 갱신된 통계표가 지금 선택돼 있을 때만 세부 목록을 다시 채움
+        if self.bok_index_to_code.get(self.bok_combo.currentIndex(), '') != stat_code:
+            return
+        if changed or self.bok_detail_combo.count() == 0:
+            self._populate_stat_items(stat_code, self.ecos_catalog.items(stat_code) or [])
 
-        nodes = root.findall('.//list') or root.findall('.//row') or root.findall('.//item')
-
-        self.bok_combo.clear()
-        self.bok_index_to_code.clear()
+    def _on_ecos_catalog_failed(self, stat_code, msg):
+        if stat_code is None:
+            if self.bok_combo.count() == 0:
+                QMessageBox.critical(self, "요청 실패", f"API 요청 중 오류가 발생했습니다:\n{msg}")
+            return
+        # show but don't block
+        try:
+            self.status_label.setText(f"세부목록 조회 실패: {msg}")
+        except Exception:
+            pass
 
-        for idx, node in enumerate(nodes):
-            name = node.findtext('STAT_NAME') or node.findtext('STAT_NM') or ''
-            srch = (node.findtext('SRCH_YN') or '').strip()
-            code = node.findtext('STAT_CODE') or node.findtext('STAT_ID') or ''
+    def _populate_bok_tables(self, rows):
+        prev = self.bok_index_to_code.get(self.bok_combo.currentIndex(), None)
+        self.bok_combo.blockSignals(True)
+        try:
+            self.bok_combo.clear()
+            self.bok_index_to_code.clear()
 
-            self.bok_combo.addItem(name)
-            # 색상 처리: SRCH_YN == 'Y'이면 항목 글씨를 빨갛게 설정
-            if srch.upper() == 'Y':
-                try:
-                    self.bok_combo.setItemData(idx, QBrush(QColor('red')), Qt.ForegroundRole)
-                except Exception:
-                    pass
+            for idx, row in enumerate(rows):
+                name = row.get('STAT_NAME') or row.get('STAT_NM') or ''
+                srch = (row.get('SRCH_YN') or '').strip()
+                code = row.get('STAT_CODE') or row.get('STAT_ID') or ''
 
-            self.bok_index_to_code[idx] = code
+                self.bok_combo.addItem(name)
+                # 색상 처리: SRCH_YN == 'Y'이면 항목 글씨를 빨갛게 설정
+                if srch.upper() == 'Y':
+                    try:
+                        self.bok_combo.setItemData(idx, QBrush(QColor('red')), Qt.ForegroundRole)
+                    except Exception:
+                        pass
 
-        if not nodes:
-            QMessageBox.information(self, "결과 없음", "조회된 결과가 없습니다.")
+                self.bok_index_to_code[idx] = code
+            # 목록이 갱신돼도 보던 통계표는 그대로 선택
+            sel = next((i for i, c in self.bok_index_to_code.items() if c == prev), 0 if rows else -1)
+            self.bok_combo.setCurrentIndex(sel)
+        finally:
+            self.bok_combo.blockSignals(False)
+        if self.bok_index_to_code.get(self.bok_combo.currentIndex(), None) != prev:
+            self.on_bok_select()
 
+    @perf_action('ind_list')
     def on_ind_list(self):
-        # Fetch and display XML from the 지표누리 URL in the ind tab
+        """지표누리 목록: 캐시가 있으면 즉시 표시하고, 받기는 백그라운드에서 (스트리밍 파싱 후 캐시 갱신)"""
         url = self.edit_ind_url.text().strip() if getattr(self, 'edit_ind_url', None) else ''
         if not url:
             QMessageBox.warning(self, "입력 오류", "지표누리 URL을 입력하세요.")
             return
-        try:
-            resp = requests.get(url, timeout=20)
-            resp.raise_for_status()
-            data = resp.content
-        except Exception as e:
-            QMessageBox.critical(self, "요청 실패", f"요청 중 오류가 발생했습니다:\n{e}")
+        if self.ind_combo.count() == 0:
+            self._show_cached_ind_list(url)
+        if getattr(self, '_ind_list_worker', None) is not None:
             return
-
-        try:
-            root = ET.fromstring(data)
-        except Exception as e:
-            QMessageBox.critical(self, "파싱 오류", f"응답 XML 파싱 실패:\n{e}")
+        worker = CatalogWorker(self.stats_providers['ind'], '', url, parent=self)
+        self._ind_list_worker = worker
+        self.btn_ind_list.setEnabled(False)
+        worker.done.connect(self._on_ind_list_done)
+        worker.failed.connect(self._on_ind_list_failed)
+
+        def _on_finished():
+            self._ind_list_worker = None
+            self.btn_ind_list.setEnabled(True)
+
+        worker.finished.connect(_on_finished)
+        worker.start()
+
+    def _show_cached_ind_list(self, url=None):
+        url = url or (self.edit_ind_url.text().strip() if getattr(self, 'edit_ind_url', None) else '')
+        ent = self.ind_catalog.get(url) if url else None
+        if not ent:
+            return False
+        perf_metrics.incr('ind.catalog.hit')
+        self._populate_ind_list(ent)
+        return True
+
+    def _on_ind_list_done(self, url, changed):
+        ent = self.ind_catalog.get(url)
+        if ent is None:
             return
-
-        # Prepare indicator combo entries
-        self.ind_combo.clear()
-        # mapping index -> 통계표코드
-        self.ind_index_to_code = {}
-
-        # Prefer top-level '지표' nodes which contain '통계표' children
-        items = []
-        ind_nodes = root.findall('.//지표') or root.findall('.//indicator') or []
-        entries = []
-        if ind_nodes:
-            for node in ind_nodes:
-                title = (node.findtext('지표명') or '').strip()
-                # Prefer to extract 수정일 from the parent 지표 node (applies to all its 통계표)
-                parent_upd = (node.findtext('수치수정일') or node.findtext('수정일') or node.findtext('수정Dt') or node.findtext('수치수정일자') or node.findtext('lastUpdDt') or node.findtext('updateDate') or node.findtext('dataUpdtDt') or '') or ''
-                parent_upd = (parent_upd or '').strip()
-                # find 통계표 children
-                tnodes = node.findall('.//통계표') or node.findall('.//table') or []
-                if not tnodes:
-                    # sometimes 통계표 may be direct children with different tags
-                    for child in list(node):
-                        if '통계' in (child.tag or '') or 'table' in (child.tag or ''):
-                            tnodes.append(child)
-                for t in tnodes:
-                    tname = (t.findtext('통계표명') or t.findtext('tableName') or '').strip()
-                    if title and tname:
-                        # determine 통계표코드 for this table and 지표코드 from parent
-                        tcode = (t.findtext('통계표코드') or t.findtext('통계표코') or t.findtext('tableCode') or '').strip()
-                        ixcode = (node.findtext('지표코드') or node.findtext('지표코') or node.findtext('지표코드') or node.findtext('INDEX_CODE') or '').strip()
-                        # prefer parent 수정일; fall back to table-level if parent missing
-                        upd = parent_upd or (t.findtext('수치수정일') or t.findtext('수정일') or t.findtext('수정Dt') or t.findtext('수치수정일자') or t.findtext('lastUpdDt') or t.findtext('updateDate') or t.findtext('dataUpdtDt') or '') or ''
-                        upd = (upd or '').strip()
-                        # compute sortable key (YYYYMMDD int) else 0
-                        try:
-                            import re
-                            m = re.search(r'(\d{4})[^\d]?(\d{2})[^\d]?(\d{2})', upd)
-                            if m:
-                                key = int(m.group(1) + m.group(2) + m.group(3))
-                            else:
-                                m2 = re.search(r'(\d{8})', upd)
-                                key = int(m2.group(1)) if m2 else 0
-                        except Exception:
-                            key = 0
-                        entries.append((f"{title}_{tname}_{upd}".strip('_'), ixcode, tcode, upd, key))
-            # expose the 지표 nodes as items for later table population
-            items = ind_nodes
+        if changed or self.ind_combo.count() == 0:
+            cur = self.ind_combo.currentIndex()
+            self._populate_ind_list(ent, keep=self.ind_index_to_code.get(cur) if cur > 0 else None)
+        if not ent['rows']:
+            QMessageBox.information(self, "결과 없음", "표로 표시할 반복 항목을 찾을 수 없습니다.")
+
+    def _on_ind_list_failed(self, url, msg):
+        if self.ind_combo.count() == 0:
+            QMessageBox.critical(self, "요청 실패", f"요청 중 오류가 발생했습니다:\n{msg}")
         else:
-            # Try common item containers
-            items = root.findall('.//item') or root.findall('.//list') or root.findall('.//row') or []
-            for it in items:
-                title = (it.findtext('지표명') or it.findtext('STAT_NAME') or it.findtext('INDEX_NAME') or '').strip()
-                tname = (it.findtext('통계표명') or it.findtext('tableName') or '').strip()
-                tcode = (it.findtext('통계표코드') or it.findtext('통계표코') or it.findtext('tableCode') or '').strip()
-                ixcode = (it.findtext('지표코드') or it.findtext('지표코') or it.findtext('INDEX_CODE') or '').strip()
-                if title and tname:
-                    upd = (it.findtext('수치수정일') or it.findtext('수정일') or it.findtext('수정Dt') or it.findtext('수치수정일자') or it.findtext('lastUpdDt') or it.findtext('updateDate') or it.findtext('dataUpdtDt') or '') or ''
-                    upd = (upd or '').strip()
-                    try:
-                        import re
-                        m = re.search(r'(\d{4})[^\d]?(\d{2})[^\d]?(\d{2})', upd)
-                        if m:
-                            key = int(m.group(1) + m.group(2) + m.group(3))
-                        else:
-                            m2 = re.search(r'(\d{8})', upd)
-                            key = int(m2.group(1)) if m2 else 0
-                    except Exception:
-                        key = 0
-                    entries.append((f"{title}_{tname}_{upd}".strip('_'), ixcode, tcode, upd, key))
-
-        # If none found, search for a parent with repeated child tags
-        if not items:
-            for parent in root.iter():
-                child_tags = [c.tag for c in list(parent) if c.tag]
-                if not child_tags:
-                    continue
-                # find tag with highest occurrence
-                from collections import Counter
-                cnt = Counter(child_tags)
-                most_common_tag, count = cnt.most_common(1)[0]
-                if count > 1:
-                    items = parent.findall(most_common_tag)
-                    if items:
-                        break
-
-        # If still no repeated items, treat root's immediate children as a single-row table
-        if not items:
-            cols = [c.tag for c in list(root)]
-            rows = [[(c.text or '').strip() if c is not None and c.text else '' for c in list(root)]] if cols else []
-            if not rows:
-                QMessageBox.information(self, "결과 없음", "표로 표시할 반복 항목을 찾을 수 없습니다.")
-                return
-            # populate table
-            self.ind_table.setColumnCount(len(cols))
-            self.ind_table.setHorizontalHeaderLabels(cols)
-            self.ind_table.setRowCount(len(rows))
-            for r, row in enumerate(rows):
-                for c, val in enumerate(row):
-                    self.ind_table.setItem(r, c, QTableWidgetItem(val))
-            return
+            try:
+                self.status_label.setText(f"지표누리 목록 갱신 실패(캐시 표시 중): {msg}")
+            except Exception:
+                pass
 
-        # Build column set from all items' child tags
-        col_set = []
-        for it in items:
-            for child in list(it):
-                if child.tag not in col_set:
-                    col_set.append(child.tag)
+    def _fill_ind_table(self, columns, rows, types=None, values=None):
+        with perf_metrics.stage('ind.table.fill') as st:
+            st['rows'] = len(rows)
+            # 정렬/다시 그리기를 끄고 한 번에 채움
+            self.ind_table.setSortingEnabled(False)
+            self.ind_table.setUpdatesEnabled(False)
+            try:
+                self.ind_table.clearContents()
+                self.ind_table.setColumnCount(len(columns))
+                self.ind_table.setHorizontalHeaderLabels(columns)
+                self.ind_table.setRowCount(len(rows))
+                num_cols = {c for c, t in enumerate(types or []) if t == 'num'}
+                if values is None or len(values) != len(rows):
+                    num_cols = set()
+                for r, row in enumerate(rows):
+                    for c, txt in enumerate(row):
+                        if not txt:
+                            continue
+                        if c in num_cols:
+                            # 숫자 열은 서버 표기 그대로 보여 주고 추출 때 변환한 값으로 정렬
+                            it = NumericItem(txt)
+                            it.setData(Qt.UserRole, values[r][c])
+                            it.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                            self.ind_table.setItem(r, c, it)
+                        else:
+                            self.ind_table.setItem(r, c, QTableWidgetItem(txt))
+            finally:
+                self.ind_table.setUpdatesEnabled(True)
+                self.ind_table.setSortingEnabled(True)
 
-        # populate rows
-        self.ind_table.setColumnCount(len(col_set))
-        self.ind_table.setHorizontalHeaderLabels(col_set)
-        self.ind_table.setRowCount(len(items))
-        for r, it in enumerate(items):
-            for c, tag in enumerate(col_set):
-                try:
-                    txt = it.findtext(tag) or ''
-                except Exception:
-                    txt = ''
-                txt = (txt or '').strip()
-                self.ind_table.setItem(r, c, QTableWidgetItem(txt))
+    def _populate_ind_list(self, ent, keep=None):
+        """캐시된 지표누리 목록 -> 목록 표 + 지표 콤보 (keep: 유지할 (지표코드, 통계표코드) 선택)"""
+        columns, rows, entries = ent.get('columns', []), ent.get('rows', []), ent.get('entries', [])
+        if keep is None:
+            self._fill_ind_table(columns, rows)
 
-        # sort entries by 수정일 (key at index 4) descending, then populate ind_combo
-        try:
-            entries.sort(key=lambda x: (x[4] if (isinstance(x, (list, tuple)) and len(x) > 4) else 0), reverse=True)
-        except Exception:
-            pass
+        # Prepare indicator combo entries
+        self.ind_combo.clear()
+        # mapping index -> 통계표코드 (and 수정일 for the detail cache freshness)
+        self.ind_index_to_code = {}
+        self.ind_index_to_upd = {}
 
         # populate ind_combo: insert a leading empty selection so the first real item
         # is not auto-selected when the list is refreshed.
@@ -1326,6 +5102,7 @@ class VWorldAdmCodeGUI(QWidget):
                         pass
                     # store both codes at the shifted index
                     self.ind_index_to_code[offset] = (ixcode, tcode)
+                    self.ind_index_to_upd[offset] = e[3] if isinstance(e, (list, tuple)) and len(e) > 3 else ''
                 except Exception:
                     pass
         except Exception:
@@ -1337,231 +5114,447 @@ class VWorldAdmCodeGUI(QWidget):
                 self.ind_combo.setCurrentIndex(0)
         except Exception:
             pass
+        # 백그라운드 갱신으로 다시 채울 때는 보던 항목 유지 (상세 표도 그대로)
+        if keep is not None:
+            offset = next((i for i, pair in self.ind_index_to_code.items() if tuple(pair) == tuple(keep)), 0)
+            self.ind_combo.blockSignals(True)
+            self.ind_combo.setCurrentIndex(offset)
+            self.ind_combo.blockSignals(False)
+        self._catalog_index = None
+
+    def _catalog_search_index(self):
+        """ECOS 통계표/캐시된 세부항목 + 지표누리 콤보 항목으로 검색 색인 생성 (목록이 바뀔 때까지 재사용)"""
+        if self._catalog_index is not None:
+            return self._catalog_index
+        index = CatalogSearchIndex()
+        with perf_metrics.stage('catalog.index') as st:
+            tables = self.ecos_catalog.tables() or []
+            names = {}
+            for row in tables:
+                code = row.get('STAT_CODE') or ''
+                names[code] = row.get('STAT_NAME') or code
+                index.add(f"[ECOS] {names[code]}", ('ecos', code, '', ''), names[code])
+            for code, ent in self.ecos_catalog.item_catalog().items():
+                name = names.get(code, ent['name'])
+                for info in ent['items']:
+                    index.add(f"[ECOS] {name} :: {info['DISPLAY']}",
+                              ('ecos', code, info['ITEM_CODE'], info['CYCLE']), f"{name} {info['ITEM_NAME']}")
+            # 지표누리 콤보 라벨은 지표명_통계표명_수정일
+            for offset in sorted(getattr(self, 'ind_index_to_code', {}) or {}):
+                label = self.ind_combo.itemText(offset)
+                parts = label.rsplit('_', 1) if label.count('_') >= 2 else [label]
+                index.add(f"[지표누리] {label}", ('ind', offset), parts[0])
+            st['rows'] = len(index.docs)
+        self._catalog_index = index
+        return index
+
+    def on_catalog_search(self):
+        dlg = getattr(self, '_catalog_search_dialog', None)
+        if dlg is None:
+            dlg = CatalogSearchDialog(self, self._catalog_search_index)
+            dlg.chosen.connect(self._on_catalog_search_chosen)
+            self._catalog_search_dialog = dlg
+        dlg.show()
+        dlg.raise_()
+        dlg.activateWindow()
+        dlg.edit.setFocus()
+        dlg.update_list()
+
+    def _show_tab_of(self, widget):
+        for i in range(self.tabs.count()):
+            if self.tabs.widget(i).isAncestorOf(widget):
+                self.tabs.setCurrentIndex(i)
+                return
+
+    def _on_catalog_search_chosen(self, payload):
+        """검색 결과 선택 -> 해당 탭으로 이동해 통계표/세부항목(또는 지표누리 항목) 선택"""
+        if not payload:
+            return
+        if payload[0] == 'ind':
+            self._show_tab_of(self.ind_combo)
+            if payload[1] < self.ind_combo.count():
+                self.ind_combo.setCurrentIndex(payload[1])
+            return
+        _, code, item_code, cycle = payload
+        self._show_tab_of(self.bok_combo)
+        idx = next((i for i, c in self.bok_index_to_code.items() if c == code), -1)
+        if idx < 0:
+            return
+        if idx != self.bok_combo.currentIndex():
+            self.bok_combo.setCurrentIndex(idx)
+        if not item_code:
+            return
+        for i, info in (getattr(self, 'bok_detail_index_to_info', {}) or {}).items():
+            if info.get('ITEM_CODE') == item_code and info.get('CYCLE') == cycle:
+                self.bok_detail_combo.setCurrentIndex(i)
+                break
 
     def on_kostat_list(self):
-        # Placeholder handler for 통계청 tab; implement KOSIS API calls as needed.
-        key = self.edit_kostat_key.text().strip() if getattr(self, 'edit_kostat_key', None) else ''
+        """KOSIS 통계목록(현재 단계): 캐시가 있으면 즉시 채우고, 없거나 오래됐으면 백그라운드에서 갱신"""
+        self._show_kosis_list(self._kosis_path[-1] if self._kosis_path else '')
+
+    def _show_kosis_list(self, parent_id):
+        ckey = self.kosis_catalog.list_key(parent_id)
+        rows = self.kosis_catalog.get(ckey)
+        if rows is not None:
+            perf_metrics.incr('kosis.catalog.hit')
+            self._populate_kosis_list(rows)
+        if rows is not None and not self.kosis_catalog.is_stale(ckey):
+            return
+        key = self.edit_kostat_key.text().strip()
         if not key:
-            QMessageBox.warning(self, "입력 오류", "통계청 인증키를 입력하세요.")
+            if rows is None:
+                QMessageBox.warning(self, "입력 오류", "통계청 인증키를 입력하세요.")
+            return
+        if rows is None:
+            self.kostat_combo.clear()
+            self.status_label.setText("KOSIS 통계목록 불러오는 중...")
+        self._refresh_kosis_catalog(key, parent_id=parent_id)
+
+    def _refresh_kosis_catalog(self, key, parent_id='', table=None):
+        ckey = self.kosis_catalog.meta_key(*table) if table else self.kosis_catalog.list_key(parent_id)
+        if ckey in self._kosis_workers:
+            return
+        worker = CatalogWorker(self.stats_providers['kosis'], key, ckey, parent=self)
+        self._kosis_workers[ckey] = worker
+        worker.done.connect(self._on_kosis_catalog_done)
+        worker.failed.connect(self._on_kosis_catalog_failed)
+        worker.finished.connect(lambda: self._kosis_workers.pop(ckey, None))
+        worker.start()
+
+    def _on_kosis_catalog_done(self, ckey, changed):
+        cur_list = self.kosis_catalog.list_key(self._kosis_path[-1] if self._kosis_path else '')
+        if ckey == cur_list:
+            rows = self.kosis_catalog.get(ckey) or []
+            if changed or self.kostat_combo.count() == 0:
+                self._populate_kosis_list(rows)
+            if not rows:
+                QMessageBox.information(self, "결과 없음", "조회된 결과가 없습니다.")
+            return
+        # 갱신된 메타가 지금 열려 있는 통계표일 때만 다시 채움
+        if self._kosis_table and ckey == self.kosis_catalog.meta_key(*self._kosis_table[:2]):
+            if changed or self.kostat_table.rowCount() == 0:
+                self._populate_kosis_meta(self.kosis_catalog.get(ckey) or {})
+
+    def _on_kosis_catalog_failed(self, ckey, msg):
+        if ckey.startswith('list:') and self.kostat_combo.count() == 0:
+            QMessageBox.critical(self, "요청 실패", f"KOSIS 통계목록 요청 중 오류가 발생했습니다:\n{msg}")
             return
-        # For now, just clear and show a placeholder message in the table
         try:
-            self.kostat_table.clearContents()
-            self.kostat_table.setRowCount(0)
-            self.kostat_table.setColumnCount(1)
-            self.kostat_table.setHorizontalHeaderLabels(["메모"])
-            self.kostat_table.setRowCount(1)
-            self.kostat_table.setItem(0, 0, QTableWidgetItem("통계청 API 호출 로직을 구현하세요."))
+            self.status_label.setText(f"KOSIS 조회 실패: {msg}")
         except Exception:
             pass
 
-    def on_ind_select(self, idx):
-        # display mapped codes and fetch stats detail to populate table
+    def _populate_kosis_list(self, rows):
+        # 빈 첫 항목: 목록을 다시 채워도 첫 항목이 저절로 열리지 않도록
+        self.kostat_combo.clear()
+        self.kostat_combo.addItem("", None)
+        for rec in rows:
+            if rec.get('TBL_ID'):
+                text = f"{rec.get('TBL_NM', '')} ({rec.get('ORG_ID', '')}/{rec.get('TBL_ID', '')})"
+            elif rec.get('LIST_ID'):
+                text = f"[목록] {rec.get('LIST_NM', '') or rec.get('LIST_ID')}"
+            else:
+                continue
+            self.kostat_combo.addItem(text, rec)
         try:
-            pair = self.ind_index_to_code.get(idx, ('', ''))
-            ixcode, statscode = pair if isinstance(pair, (list, tuple)) else ('','')
+            self.status_label.setText(f"KOSIS 통계목록 {self.kostat_combo.count() - 1}건")
         except Exception:
-            ixcode, statscode = '',''
+            pass
+
+    def on_kostat_select(self, idx):
+        rec = self.kostat_combo.itemData(idx)
+        if not isinstance(rec, dict):
+            return
+        if rec.get('TBL_ID'):
+            self._open_kosis_table(rec.get('ORG_ID', ''), rec['TBL_ID'], rec.get('TBL_NM', ''))
+        elif rec.get('LIST_ID'):
+            self._kosis_path.append(rec['LIST_ID'])
+            self._show_kosis_list(rec['LIST_ID'])
+
+    def on_kostat_up(self):
+        if self._kosis_path:
+            self._kosis_path.pop()
+        self._show_kosis_list(self._kosis_path[-1] if self._kosis_path else '')
+
+    def _open_kosis_table(self, org_id, tbl_id, name):
+        self._kosis_table = (org_id, tbl_id, name)
+        ckey = self.kosis_catalog.meta_key(org_id, tbl_id)
+        meta = self.kosis_catalog.get(ckey)
+        if meta is not None:
+            self._populate_kosis_meta(meta)
+        else:
+            self.kostat_table.setRowCount(0)
+        if meta is not None and not self.kosis_catalog.is_stale(ckey):
+            return
+        key = self.edit_kostat_key.text().strip()
+        if not key:
+            QMessageBox.warning(self, "입력 오류", "통계청 인증키를 입력하세요.")
+            return
+        self.status_label.setText(f"KOSIS 통계표 정보 불러오는 중: {name}")
+        self._refresh_kosis_catalog(key, table=(org_id, tbl_id))
+
+    def _populate_kosis_meta(self, meta):
+        """통계표 메타 -> 표(분류/코드/이름/단위) + 수록주기 콤보"""
+        levels = KosisCatalog.levels(meta.get('itm') or [])
+        self._kosis_levels = levels
+        self.kostat_table.setUpdatesEnabled(False)
         try:
-            # show 통계표코드 in the display field (and also show ixcode prefix)
-            self.ind_code_display.setText(f"ix:{ixcode} stats:{statscode}" if (ixcode or statscode) else '')
+            self.kostat_table.clearContents()
+            self.kostat_table.setColumnCount(4)
+            self.kostat_table.setHorizontalHeaderLabels(["분류", "코드", "이름", "단위"])
+            self.kostat_table.setRowCount(sum(len(vals) for _, _, vals in levels))
+            r = 0
+            for li, (obj_id, obj_nm, vals) in enumerate(levels):
+                for code, name, unit in vals:
+                    head = QTableWidgetItem("항목" if obj_id == 'ITEM' else obj_nm)
+                    head.setData(Qt.UserRole, (li, code))
+                    self.kostat_table.setItem(r, 0, head)
+                    self.kostat_table.setItem(r, 1, QTableWidgetItem(code))
+                    self.kostat_table.setItem(r, 2, QTableWidgetItem(name))
+                    self.kostat_table.setItem(r, 3, QTableWidgetItem(unit))
+                    r += 1
+        finally:
+            self.kostat_table.setUpdatesEnabled(True)
+        prev = self.combo_kostat_cycle.currentData()
+        self.combo_kostat_cycle.clear()
+        for se in KosisCatalog.cycles(meta.get('prd')) or list(KosisClient.CYCLES):
+            self.combo_kostat_cycle.addItem(f"{KosisClient.CYCLE_NAMES[se]} ({se})", se)
+        pos = self.combo_kostat_cycle.findData(prev)
+        if pos >= 0:
+            self.combo_kostat_cycle.setCurrentIndex(pos)
+        try:
+            name = self._kosis_table[2] if self._kosis_table else ''
+            self.status_label.setText(f"{name}: 항목/분류값을 선택하고 자료 조회 (분류를 고르지 않으면 전체)")
         except Exception:
             pass
 
-        # If both codes present, call the 상세 API and populate ind_table
-        if ixcode and statscode:
-            try:
-                # Build URL and request
-                base = "https://www.index.go.kr/unity/openApi/stblUserShow.do"
-                params = {
-                    'idntfcId': self.edit_ind_key.text().strip() if getattr(self, 'edit_ind_key', None) else 'H4T022E22214155B',
-                    'ixCode': ixcode,
-                    'statsCode': statscode,
-                }
-                resp = requests.get(base, params=params, timeout=20)
-                resp.raise_for_status()
-                data = resp.content
-            except Exception as e:
-                try:
-                    QMessageBox.critical(self, "요청 실패", f"세부 API 요청 실패:\n{e}")
-                except Exception:
-                    pass
-                return
-
-            try:
-                root = ET.fromstring(data)
-            except Exception as e:
-                # Attempt HTML-table fallback quietly (no dialogs, no raw-file saving)
-                try:
-                    text = resp.text if hasattr(resp, 'text') else (data.decode('utf-8', errors='replace') if isinstance(data, (bytes, bytearray)) else str(data))
-                    parsed_rows = None
-                    # Try BeautifulSoup if available
-                    try:
-                        from bs4 import BeautifulSoup
-                        soup = BeautifulSoup(text, 'html.parser')
-                        table = soup.find('table')
-                        if table:
-                            parsed_rows = []
-                            for tr in table.find_all('tr'):
-                                cols = [td.get_text(strip=True) for td in tr.find_all(['th', 'td'])]
-                                parsed_rows.append(cols)
-                    except Exception:
-                        parsed_rows = None
-
-                    # Regex fallback without writing files or showing dialogs
-                    if parsed_rows is None:
-                        import re, html
-                        m = re.search(r'<table.*?>(.*?)</table>', text, re.S | re.I)
-                        if m:
-                            tbl = m.group(0)
-                            trs = re.findall(r'<tr.*?>(.*?)</tr>', tbl, re.S | re.I)
-                            rows = []
-                            for tr in trs:
-                                tds = re.findall(r'<t[dh].*?>(.*?)</t[dh]>', tr, re.S | re.I)
-                                clean = [re.sub(r'<.*?>', '', td).strip() for td in tds]
-                                clean = [html.unescape(c) for c in clean]
-                                rows.append(clean)
-                            if rows:
-                                parsed_rows = rows
-
-                    if parsed_rows:
-                        maxc = max((len(r) for r in parsed_rows), default=0)
-                        if maxc > 0:
-                            first = parsed_rows[0]
-                            if all(cell for cell in first):
-                                headers = first
-                                data_rows = parsed_rows[1:]
-                            else:
-                                headers = [f'col{i+1}' for i in range(maxc)]
-                                data_rows = parsed_rows
-
-                            try:
-                                self.ind_table.setColumnCount(maxc)
-                                self.ind_table.setHorizontalHeaderLabels(headers)
-                                self.ind_table.setRowCount(len(data_rows))
-                                for r, row in enumerate(data_rows):
-                                    for c in range(maxc):
-                                        val = row[c] if c < len(row) else ''
-                                        self.ind_table.setItem(r, c, QTableWidgetItem(val))
-                            except Exception:
-                                pass
-                        return
-                except Exception:
-                    pass
-
-                # Quiet failure: update status_label if available, but do not show dialogs
-                try:
-                    if hasattr(self, 'status_label') and self.status_label is not None:
-                        self.status_label.setText('세부 API 파싱 실패')
-                except Exception:
-                    pass
-                return
-
-            # find repeated item nodes and build table similar to on_ind_list
-            items = root.findall('.//item') or root.findall('.//list') or root.findall('.//row') or []
-            if not items:
-                for parent in root.iter():
-                    child_tags = [c.tag for c in list(parent) if c.tag]
-                    if not child_tags:
-                        continue
-                    from collections import Counter
-                    cnt = Counter(child_tags)
-                    most_common_tag, count = cnt.most_common(1)[0]
-                    if count > 1:
-                        items = parent.findall(most_common_tag)
-                        if items:
-                            break
-
-            if not items:
-                cols = [c.tag for c in list(root)]
-                rows = [[(c.text or '').strip() if c is not None and c.text else '' for c in list(root)]] if cols else []
-                if not rows:
-                    try:
-                        QMessageBox.information(self, "결과 없음", "조회된 세부 항목이 없습니다.")
-                    except Exception:
-                        pass
-                    return
-                # populate table with single row
-                try:
-                    self.ind_table.setColumnCount(len(cols))
-                    self.ind_table.setHorizontalHeaderLabels(cols)
-                    self.ind_table.setRowCount(len(rows))
-                    for r, row in enumerate(rows):
-                        for c, val in enumerate(row):
-                            self.ind_table.setItem(r, c, QTableWidgetItem(val))
-                except Exception:
-                    pass
-                return
+    def on_kostat_fetch(self):
+        """선택한 항목 x 분류값 조합을 KOSIS에서 받아 한국은행 탭 저장 목록에 시리즈로 추가"""
+        key = self.edit_kostat_key.text().strip()
+        if not key:
+            QMessageBox.warning(self, "입력 오류", "통계청 인증키를 입력하세요.")
+            return
+        if not self._kosis_table or not self._kosis_levels:
+            QMessageBox.warning(self, "입력 오류", "먼저 통계표를 선택하세요.")
+            return
+        if self._kosis_data_worker is not None:
+            QMessageBox.information(self, "조회 중", "이전 KOSIS 자료 조회가 아직 진행 중입니다.")
+            return
+        prd_se = self.combo_kostat_cycle.currentData()
+        y0, y1 = self.edit_kostat_start.text().strip(), self.edit_kostat_end.text().strip()
+        if not prd_se or not (re.fullmatch(r'\d{4}', y0) and re.fullmatch(r'\d{4}', y1)) or y0 > y1:
+            QMessageBox.warning(self, "입력 오류", "수록주기와 시작/종료 연도(YYYY)를 확인하세요.")
+            return
+        chosen = {}
+        for r in range(self.kostat_table.rowCount()):
+            it = self.kostat_table.item(r, 0)
+            if it is not None and it.isSelected():
+                li, code = it.data(Qt.UserRole)
+                chosen.setdefault(li, []).append(code)
+        itm_ids, objs, cells = 'ALL', [], 1
+        for li, (obj_id, _, vals) in enumerate(self._kosis_levels):
+            codes = chosen.get(li) or 'ALL'
+            cells *= len(vals) if codes == 'ALL' else len(codes)
+            if obj_id == 'ITEM':
+                itm_ids = codes
+            else:
+                objs.append(codes)
+        if cells > KosisClient.MAX_SERIES:
+            QMessageBox.warning(self, "선택 과다", f"선택한 조합이 {cells}개입니다. 항목/분류값을 {KosisClient.MAX_SERIES}개 이하로 줄여 주세요.")
+            return
+        start, end = KosisClient.year_bounds(prd_se, y0, y1)
+        org_id, tbl_id, _ = self._kosis_table
+        spec = {'org_id': org_id, 'tbl_id': tbl_id, 'prd_se': prd_se, 'itm_ids': itm_ids, 'objs': objs, 'cells': cells}
+        worker = SeriesFetchWorker(self.stats_providers['kosis'], key, [(spec, start, end)], parent=self)
+        self._kosis_data_worker = worker
+        self.btn_kostat_fetch.setEnabled(False)
+        self.status_label.setText(f"KOSIS 자료 조회 중: {self._kosis_table[2]}")
+        self._kosis_data_failed = False
+        worker.series_ready.connect(self._add_ecos_series)
+        worker.failed.connect(self._on_kosis_data_failed)
+        worker.done.connect(self._on_kosis_data_done)
+
+        def _finished():
+            self._kosis_data_worker = None
+            self.btn_kostat_fetch.setEnabled(True)
+
+        worker.finished.connect(_finished)
+        worker.start()
+
+    def _on_kosis_data_failed(self, spec, msg):
+        self._kosis_data_failed = True
+        QMessageBox.critical(self, "요청 실패", f"KOSIS 자료 조회 실패:\n{msg}")
+
+    def _on_kosis_data_done(self, n_series, fetched):
+        if not n_series:
+            if not self._kosis_data_failed:
+                QMessageBox.information(self, "결과 없음", "조회된 데이터가 없습니다.")
+            return
+        try:
+            self.status_label.setText(f"KOSIS: 시리즈 {n_series}개 (신규 수신 {fetched}건) — 한국은행 탭 저장 목록에 추가됨")
+        except Exception:
+            pass
 
-            # Build column set from all items' child tags
-            col_set = []
-            for it in items:
-                for child in list(it):
-                    if child.tag not in col_set:
-                        col_set.append(child.tag)
+    @perf_action('ind_select')
+    def on_ind_select(self, idx):
+        # display mapped codes and show the detail table (cache first, otherwise fetched in the prefetch worker)
+        try:
+            pair = self.ind_index_to_code.get(idx, ('', ''))
+            ixcode, statscode = pair if isinstance(pair, (list, tuple)) else ('','')
+        except Exception:
+            ixcode, statscode = '',''
+        try:
+            # show 통계표코드 in the display field (and also show ixcode prefix)
+            self.ind_code_display.setText(f"ix:{ixcode} stats:{statscode}" if (ixcode or statscode) else '')
+        except Exception:
+            pass
 
-            # populate rows
+        if not (ixcode and statscode):
+            return
+        upd = self.ind_index_to_upd.get(idx, '')
+        ent = self.ind_detail_cache.get(ixcode, statscode, upd)
+        jobs = [] if ent is not None else [(ixcode, statscode, upd)]
+        if ent is not None:
+            perf_metrics.incr('ind.detail.hit')
+            self._show_ind_detail(ent)
+        else:
+            perf_metrics.incr('ind.detail.miss')
             try:
-                self.ind_table.setColumnCount(len(col_set))
-                self.ind_table.setHorizontalHeaderLabels(col_set)
-                self.ind_table.setRowCount(len(items))
-                for r, it in enumerate(items):
-                    for c, tag in enumerate(col_set):
-                        try:
-                            txt = it.findtext(tag) or ''
-                        except Exception:
-                            txt = ''
-                        txt = (txt or '').strip()
-                        self.ind_table.setItem(r, c, QTableWidgetItem(txt))
+                self.status_label.setText("세부 표 불러오는 중...")
             except Exception:
                 pass
+        self._ind_pending = None if ent is not None else (ixcode, statscode, upd)
+        self._ind_prefetch_push(jobs, front=True)
+        # 다음에 고를 가능성이 높은 이웃 항목과 최근 수정 항목을 미리 받아 둠
+        near = [i for d in range(1, IndPrefetchWorker.NEIGHBORS + 1) for i in (idx + d, idx - d)]
+        recent = list(range(1, IndPrefetchWorker.RECENT + 1))  # 콤보는 수정일 내림차순
+        ahead = []
+        for i in near + recent:
+            pair = self.ind_index_to_code.get(i)
+            if pair and i != idx:
+                ahead.append((pair[0], pair[1], self.ind_index_to_upd.get(i, '')))
+        self._ind_prefetch_push(ahead)
+
+    def _ind_prefetch_push(self, jobs, front=False):
+        if not jobs:
+            return
+        worker = getattr(self, '_ind_prefetch', None)
+        if worker is None:
+            worker = IndPrefetchWorker(self.ind_detail_cache, '', parent=self)
+            worker.loaded.connect(self._on_ind_detail_loaded)
+            worker.failed.connect(self._on_ind_detail_failed)
+            # 마지막 작업을 꺼낸 직후 들어온 작업이 남아 있으면 다시 시작
+            worker.finished.connect(lambda: worker.start() if worker._jobs and not worker._stop else None)
+            self._ind_prefetch = worker
+        worker.service_key = self.edit_ind_key.text().strip() if getattr(self, 'edit_ind_key', None) else 'H4T022E22214155B'
+        worker.push(jobs, front=front)
+        if not worker.isRunning():
+            worker.start()
+
+    def _on_ind_detail_loaded(self, job):
+        if tuple(job) != getattr(self, '_ind_pending', None):
+            return
+        self._ind_pending = None
+        ent = self.ind_detail_cache.get(*job)
+        if ent is not None:
+            self._show_ind_detail(ent)
 
-    def _load_stat_item_list(self, stat_code):
-        if not stat_code:
-            # clear detail
+    def _on_ind_detail_failed(self, job, msg, parse_error):
+        if tuple(job) != getattr(self, '_ind_pending', None):
+            return
+        self._ind_pending = None
+        if parse_error:
+            # Quiet failure: update status_label if available, but do not show dialogs
             try:
-                self.bok_detail_combo.clear()
+                self.status_label.setText('세부 API 파싱 실패')
             except Exception:
                 pass
             return
+        try:
+            QMessageBox.critical(self, "요청 실패", f"세부 API 요청 실패:\n{msg}")
+        except Exception:
+            pass
 
-        key = self.edit_bok_key.text().strip()
-        if not key:
+    def on_ind_to_series(self):
+        """선택한 지표누리 상세 표 -> 시리즈 (시점 열 또는 시점 머리글 기준) 후 저장 목록에 추가"""
+        idx = self.ind_combo.currentIndex()
+        pair = self.ind_index_to_code.get(idx)
+        if not pair:
+            QMessageBox.information(self, "항목 없음", "지표를 선택하세요.")
+            return
+        if getattr(self, '_ind_series_worker', None) is not None:
+            return
+        key = self.edit_ind_key.text().strip()
+        spec = (pair[0], pair[1], self.ind_index_to_upd.get(idx, ''), self.ind_combo.currentText())
+        worker = SeriesFetchWorker(self.stats_providers['ind'], key, [(spec, '', '')], parent=self)
+        self._ind_series_worker = worker
+        self.btn_ind_series.setEnabled(False)
+        worker.series_ready.connect(self._add_ecos_series)
+        failed = []
+
+        def _on_failed(spec, msg):
+            failed.append(msg)
+            QMessageBox.critical(self, "요청 실패", f"지표누리 상세 조회 실패:\n{msg}")
+
+        def _on_done(n_series, fetched):
+            if n_series:
+                self.status_label.setText(f"지표누리: 시리즈 {n_series}개 — 경제지표 탭 저장 목록에 추가됨")
+            elif not failed:
+                QMessageBox.information(self, "변환 불가", "시점 열(또는 시점 머리글)을 찾지 못해 시리즈로 바꿀 수 없습니다.")
+
+        def _on_finished():
+            self._ind_series_worker = None
+            self.btn_ind_series.setEnabled(True)
+
+        worker.failed.connect(_on_failed)
+        worker.done.connect(_on_done)
+        worker.finished.connect(_on_finished)
+        worker.start()
+
+    def _show_ind_detail(self, ent):
+        if not ent.get('rows'):
+            try:
+                QMessageBox.information(self, "결과 없음", "조회된 세부 항목이 없습니다.")
+            except Exception:
+                pass
             return
-
-        service = "StatisticItemList"
-        req_type = "xml"
-        lang = "kr"
-        start = "1"
-        end = "100"  # per request
-
-        base = "https://ecos.bok.or.kr/api"
-        parts = [base, service, key, req_type, lang, start, end, stat_code]
-        url = "/".join(parts)
-
         try:
-            resp = requests.get(url, timeout=15)
-            resp.raise_for_status()
-            data = resp.content
-        except Exception as e:
-            # show but don't block
+            self.status_label.setText(f"세부 표 {len(ent['rows'])}행")
+        except Exception:
+            pass
+        self._fill_ind_table(ent['columns'], ent['rows'], ent.get('types'), ent.get('values'))
+
+    def _load_stat_item_list(self, stat_code):
+        if not stat_code:
+            # clear detail
             try:
-                self.status_label.setText(f"세부목록 조회 실패: {e}")
+                self.bok_detail_combo.clear()
             except Exception:
                 pass
             return
 
-        try:
-            root = ET.fromstring(data)
-        except Exception as e:
+        # 캐시에 있으면 바로 채우고(페이지를 모두 받아 둔 전체 항목), 없거나 오래됐으면 백그라운드 갱신
+        rows = self.ecos_catalog.items(stat_code)
+        if rows is not None:
+            perf_metrics.incr('ecos.catalog.hit')
+            self._populate_stat_items(stat_code, rows)
+        else:
+            perf_metrics.incr('ecos.catalog.miss')
             try:
-                self.status_label.setText(f"세부목목 파싱 실패: {e}")
+                self.bok_detail_combo.clear()
+                self.status_label.setText("세부목록 불러오는 중...")
             except Exception:
                 pass
+        if rows is not None and not self.ecos_catalog.is_stale(stat_code):
             return
 
-        nodes = root.findall('.//list') or root.findall('.//row') or root.findall('.//item')
+        key = self.edit_bok_key.text().strip()
+        if not key:
+            return
+        self._refresh_ecos_catalog(key, stat_code)
 
+    def _populate_stat_items(self, stat_code, rows):
         self.bok_detail_combo.clear()
         self.bok_detail_index_to_pitem = {}
         self.bok_detail_index_to_info = {}
@@ -1571,24 +5564,13 @@ class VWorldAdmCodeGUI(QWidget):
         except Exception:
             pass
 
-        for idx, node in enumerate(nodes):
-            item_name = (node.findtext('ITEM_NAME') or '').strip()
-            cycle = (node.findtext('CYCLE') or '').strip()
-            p_item_code = (node.findtext('P_ITEM_CODE') or '').strip()
-            item_code = (node.findtext('ITEM_CODE') or '').strip()
-            start_time = (node.findtext('START_TIME') or '').strip()
-            end_time = (node.findtext('END_TIME') or '').strip()
-
-            # display as ITEM_NAME_CYCLE_START_TIME_END_TIME (underscore-separated)
-            parts = [item_name, cycle, start_time, end_time]
-            # include only non-empty parts to avoid trailing underscores
-            display = "_".join([p for p in parts if p])
-            if not display:
-                display = ''.join(node.itertext()).strip()[:100]
+        for idx, row in enumerate(rows):
+            info = EcosCatalog.item_info(row)
+            p_item_code = info['P_ITEM_CODE']
 
             # add item after the initial empty item -> mapping index = idx + 1
             add_index = idx + 1
-            self.bok_detail_combo.addItem(display)
+            self.bok_detail_combo.addItem(info['DISPLAY'])
             if p_item_code:
                 try:
                     self.bok_detail_combo.setItemData(add_index, QBrush(QColor('red')), Qt.ForegroundRole)
@@ -1596,15 +5578,9 @@ class VWorldAdmCodeGUI(QWidget):
                     pass
 
             self.bok_detail_index_to_pitem[add_index] = p_item_code
-            self.bok_detail_index_to_info[add_index] = {
-                'CYCLE': cycle,
-                'ITEM_CODE': item_code,
-                'START_TIME': start_time,
-                'END_TIME': end_time,
-                'P_ITEM_CODE': p_item_code,
-            }
+            self.bok_detail_index_to_info[add_index] = info
 
-        if not nodes:
+        if not rows:
             try:
                 self.status_label.setText("세부항목 없음")
             except Exception:
@@ -1753,6 +5729,7 @@ class VWorldAdmCodeGUI(QWidget):
         except Exception:
             pass
 
+    @perf_action('bok_print')
     def on_bok_print(self):
         # Build StatisticSearch URL and display results in table
         key = self.edit_bok_key.text().strip()
@@ -1789,164 +5766,195 @@ class VWorldAdmCodeGUI(QWidget):
         except Exception:
             entry = ''
 
-        # API params
-        service = 'StatisticSearch'
-        req_type = 'xml'
-        lang = 'kr'
-        start_idx = '1'
-        end_cnt = '5000'  # per user request
-
-        # Build path: base/service/key/type/lang/start/end/stat_code/주기/검색시작일자/검색종료일자/통계항목코드1/통계항목코드2/통계항목코드3/통계항목코드4
-        base = 'https://ecos.bok.or.kr/api'
-        parts = [base, service, key, req_type, lang, start_idx, end_cnt, stat_code, cycle, start_val, end_val]
-        # 통계항목코드1..4: put item_code1 then placeholders
-        parts.append(item_code1 or '?')
-        parts.extend(['?', '?'])
-        url = '/'.join(parts)
-
+        # StatisticSearch: 캐시된 시리즈는 마지막 시점 근처부터만 요청해 병합 (페이지는 EcosClient가 병렬 요청)
+        series_key = (stat_code, item_code1, cycle)
         try:
-            resp = requests.get(url, timeout=30)
-            resp.raise_for_status()
-            data = resp.content
+            (series,), fetched = self.stats_providers['ecos'].fetch(key, (series_key, entry), start_val, end_val)
+        except ET.ParseError as e:
+            perf_metrics.error('ecos.search', e)
+            QMessageBox.critical(self, "파싱 실패", f"응답 XML 파싱 실패:\n{e}")
+            return
         except Exception as e:
+            perf_metrics.error('ecos.search', e)
             QMessageBox.critical(self, "요청 실패", f"StatisticSearch 요청 실패:\n{e}")
             return
-
         try:
-            root = ET.fromstring(data)
-        except Exception as e:
-            QMessageBox.critical(self, "파싱 실패", f"응답 XML 파싱 실패:\n{e}")
-            return
-
-        nodes = root.findall('.//list') or root.findall('.//row') or root.findall('.//item')
-        if not nodes:
+            self.status_label.setText(f"StatisticSearch: {len(series)}건 (신규 수신 {fetched}건)")
+        except Exception:
+            pass
+        if not len(series):
             QMessageBox.information(self, "결과 없음", "조회된 데이터가 없습니다.")
             # do not clear existing table; simply return
             return
 
-        # Determine column headers from first node children
-        first = nodes[0]
-        headers = [child.tag for child in list(first)]
-        # unify headers order across nodes
-        cols = headers[:]
-        for n in nodes[1:]:
-            for child in list(n):
-                if child.tag not in cols:
-                    cols.append(child.tag)
+        # 결과는 (STAT_CODE, ITEM_CODE, CYCLE) 키의 typed 시리즈로 저장; 표는 저장소를 보여주는 모델 뷰
+        t_fill = time.perf_counter()
+        try:
+            self._add_ecos_series(series)
+            perf_metrics.record('ecos.search.table_fill', time.perf_counter() - t_fill, rows=len(series))
+        except Exception as e:
+            perf_metrics.error('ecos.search.table_fill', e)
+            QMessageBox.warning(self, "표시 실패", f"결과 표에 표시 중 오류:\n{e}")
+            return
 
-        # Populate table: append rows to existing table without deleting previous data
-        try:
-            # existing headers (if any)
-            exist_col_count = self.bok_result_table.columnCount()
-            existing_headers = [self.bok_result_table.horizontalHeaderItem(i).text() for i in range(exist_col_count)] if exist_col_count > 0 else []
-            # union columns: preserve existing order then append new columns
-            union_cols = existing_headers[:]
-            for c in cols:
-                if c not in union_cols:
-                    union_cols.append(c)
-
-            self.bok_result_table.setColumnCount(len(union_cols))
-            self.bok_result_table.setHorizontalHeaderLabels(union_cols)
-
-            existing_rows = self.bok_result_table.rowCount()
-            self.bok_result_table.setRowCount(existing_rows + len(nodes))
-            for r, node in enumerate(nodes):
-                children = {c.tag: (c.text or '') for c in list(node)}
-                for col in cols:
-                    val = children.get(col, '')
-                    cidx = union_cols.index(col)
-                    # If this is the DATA_VALUE column, format with thousand separators
-                    display_val = val
-                    try:
-                        if col == 'DATA_VALUE' and val is not None and val != '':
-                            s = str(val).replace(',', '').strip()
-                            sign = ''
-                            if s.startswith(('+', '-')):
-                                if s[0] == '-':
-                                    sign = '-'
-                                s = s[1:]
-                            if '.' in s:
-                                left, right = s.split('.', 1)
-                                left_fmt = format(int(left), ',') if left.isdigit() else left
-                                display_val = sign + left_fmt + '.' + right
-                            else:
-                                display_val = sign + format(int(s), ',') if s.isdigit() else val
-                    except Exception:
-                        display_val = val
+    def _add_ecos_series(self, series):
+        """저장소/표에 시리즈를 넣고 새 키면 저장 목록 항목(체크박스 + 삭제)을 추가"""
+        is_new = self.bok_result_model.add_series(series)
+        if is_new:
+            self._add_bok_saved_entry(series.key, series.label)
+        else:
+            # 같은 통계항목/주기를 다시 조회하면 기존 항목의 데이터를 교체
+            try:
+                self.status_label.setText(f"기존 항목 갱신: {series.label} ({len(series)}행)")
+            except Exception:
+                pass
+        self.bok_result_table.resizeColumnsToContents()
+        return is_new
+
+    def _add_bok_saved_entry(self, series_key, label):
+        # saved-list entry with a checked checkbox; the list item carries the series key
+        item = QListWidgetItem()
+        item.setData(Qt.UserRole, series_key)
+        widget = QWidget()
+        hl = QHBoxLayout()
+        chk = QCheckBox(label)
+        chk.setChecked(True)
+        chk.toggled.connect(functools.partial(self._on_bok_saved_toggled, series_key))
+        btn = QPushButton("삭제")
+        try:
+            btn.setFixedWidth(50)
+        except Exception:
+            pass
+        # connect delete with captured item
+        btn.clicked.connect(functools.partial(self._remove_saved_item, item))
+        hl.addWidget(chk)
+        hl.addWidget(btn)
+        hl.setContentsMargins(2, 2, 2, 2)
+        widget.setLayout(hl)
+        self.bok_listbox.addItem(item)
+        self.bok_listbox.setItemWidget(item, widget)
+        try:
+            item.setSizeHint(widget.sizeHint())
+        except Exception:
+            pass
+        return item
 
-                    item = QTableWidgetItem(display_val)
-                    # numeric detection (store raw numeric value in UserRole)
-                    try:
-                        num = float(val.replace(',', ''))
-                        item.setData(Qt.UserRole, num)
-                    except Exception:
-                        pass
-                    self.bok_result_table.setItem(existing_rows + r, cidx, item)
-            # after successfully appending rows, add the saved-list entry with a checked checkbox
+    def on_bok_derive(self):
+        """저장된 목록에서 선택한 항목(없으면 체크된 항목 전체)에 파생 연산을 적용해 목록에 추가"""
+        op = self.combo_bok_derive.currentData()
+        items = self.bok_listbox.selectedItems()
+        if not items:
+            items = []
+            for i in range(self.bok_listbox.count()):
+                it = self.bok_listbox.item(i)
+                w = self.bok_listbox.itemWidget(it)
+                chk = w.findChild(QCheckBox) if w is not None else None
+                if chk is not None and chk.isChecked():
+                    items.append(it)
+        keys = [tuple(it.data(Qt.UserRole)) for it in items if it.data(Qt.UserRole) is not None]
+        if not op or not keys:
+            QMessageBox.information(self, "항목 없음", "파생 시리즈를 만들 저장 항목을 선택하세요.")
+            return
+        existing = {tuple(self.bok_listbox.item(i).data(Qt.UserRole) or ()) for i in range(self.bok_listbox.count())}
+        errors = []
+        added = 0
+        for key in keys:
+            new_key = key + (op,)
+            if new_key in existing:
+                continue
             try:
-                if entry:
-                    item = QListWidgetItem()
-                    widget = QWidget()
-                    hl = QHBoxLayout()
-                    chk = QCheckBox(entry)
-                    chk.setChecked(True)
-                    btn = QPushButton("삭제")
-                    try:
-                        btn.setFixedWidth(50)
-                    except Exception:
-                        pass
-                    # connect delete with captured item
-                    from functools import partial
-                    btn.clicked.connect(partial(self._remove_saved_item, item))
-                    hl.addWidget(chk)
-                    hl.addWidget(btn)
-                    hl.setContentsMargins(2, 2, 2, 2)
-                    widget.setLayout(hl)
-                    self.bok_listbox.addItem(item)
-                    self.bok_listbox.setItemWidget(item, widget)
-                    try:
-                        item.setSizeHint(widget.sizeHint())
-                    except Exception:
-                        pass
-                    if not hasattr(self, 'bok_saved_ranges'):
-                        self.bok_saved_ranges = []
-                    self.bok_saved_ranges.append({'label': entry, 'start': existing_rows, 'count': len(nodes)})
+                ser = self.ecos_derived.get(new_key)
+            except Exception as e:
+                errors.append(f"{' / '.join(key[:3])}: {e}")
+                continue
+            if ser is None:
+                continue
+            self._add_bok_saved_entry(new_key, ser.label)
+            existing.add(new_key)
+            added += 1
+        try:
+            self.status_label.setText(f"파생 시리즈 {added}개 추가")
+        except Exception:
+            pass
+        if errors:
+            QMessageBox.warning(self, "파생 실패", "\n".join(errors[:20]))
+
+    def on_bok_batch(self):
+        key = self.edit_bok_key.text().strip()
+        if not key:
+            QMessageBox.warning(self, "입력 오류", "한국은행 인증키를 입력하세요.")
+            return
+        if getattr(self, '_ecos_batch_worker', None) is not None:
+            QMessageBox.information(self, "조회 중", "이전 여러 항목 조회가 아직 진행 중입니다.")
+            return
+        catalog = self.ecos_catalog.item_catalog()
+        if not catalog:
+            QMessageBox.information(self, "항목 없음", "먼저 통계표를 선택해 세부 항목 목록을 불러오세요.")
+            return
+        dlg = EcosBatchDialog(self, catalog)
+        if dlg.exec_() != QDialog.Accepted:
+            return
+        jobs = dlg.selected_jobs()
+        if not jobs:
+            return
+        plot_after = dlg.chk_plot.isChecked()
+        worker = SeriesFetchWorker(self.stats_providers['ecos'], key,
+                                   [((series_key, label), start, end) for series_key, label, start, end in jobs], parent=self)
+        self._ecos_batch_worker = worker
+        self._ecos_batch_failed = []
+        self.btn_bok_batch.setEnabled(False)
+        worker.series_ready.connect(self._add_ecos_series)
+        worker.failed.connect(lambda spec, msg: self._ecos_batch_failed.append(f"{'/'.join(spec[0])}: {msg}"))
+        worker.progress.connect(lambda done, total: self.status_label.setText(f"여러 항목 조회: {done}/{total}"))
+
+        def _on_done():
+            self._ecos_batch_worker = None
+            self.btn_bok_batch.setEnabled(True)
+            failed = self._ecos_batch_failed
+            if failed:
+                QMessageBox.warning(self, "일부 조회 실패", "\n".join(failed[:20]))
+            if plot_after and len(failed) < len(jobs):
+                self.on_bok_plot()
+
+        worker.finished.connect(_on_done)
+        worker.start()
+
+    def _on_bok_saved_toggled(self, series_key, checked):
+        link = getattr(self, '_bok_plot_link', None)
+        if not link or not plt.fignum_exists(link['fig'].number):
+            return
+        ent = link['series'].get(series_key)
+        if ent is None:
+            try:
+                self.status_label.setText("새로 체크한 항목은 차트를 다시 생성하면 표시됩니다.")
             except Exception:
                 pass
-            self.bok_result_table.resizeColumnsToContents()
-        except Exception as e:
-            QMessageBox.warning(self, "표시 실패", f"결과 표에 표시 중 오류:\n{e}")
             return
+        line, ax, si = ent
+        # 첫 시리즈는 공용 x축을 가진 기본 축이라 선만, 나머지는 twinx 축(눈금 포함)째로 숨김
+        if si == 0:
+            if line is not None:
+                line.set_visible(checked)
+        else:
+            ax.set_visible(checked)
+        link['fig'].canvas.draw_idle()
 
     def _remove_saved_item(self, item):
         try:
             idx = self.bok_listbox.row(item)
             if idx < 0:
                 return
-            # remove mapping
-            mp = None
-            try:
-                mp = self.bok_saved_ranges.pop(idx)
-            except Exception:
-                mp = None
-            # remove table rows corresponding to this saved range
-            if mp:
-                start = int(mp.get('start', 0))
-                cnt = int(mp.get('count', 0))
-                # clamp
-                if cnt > 0:
-                    for _ in range(cnt):
-                        try:
-                            self.bok_result_table.removeRow(start)
-                        except Exception:
-                            pass
-                    # adjust subsequent saved_ranges' start indices
-                    for r in self.bok_saved_ranges:
-                        try:
-                            if r.get('start', 0) > start:
-                                r['start'] = max(0, int(r.get('start', 0)) - cnt)
-                        except Exception:
-                            pass
+            # drop the series from the store; the table model removes its row block in one step
+            series_key = item.data(Qt.UserRole)
+            if series_key is not None and len(series_key) == 3:
+                self.bok_result_model.remove_series(tuple(series_key))
+                self.ecos_derived.discard(series_key)
+                # 원본을 지우면 그 파생 항목도 함께 제거
+                for i in reversed(range(self.bok_listbox.count())):
+                    k = self.bok_listbox.item(i).data(Qt.UserRole)
+                    if k is not None and len(k) > 3 and tuple(k[:3]) == tuple(series_key):
+                        self.bok_listbox.takeItem(i)
+                idx = self.bok_listbox.row(item)
             # remove listbox item
             try:
                 self.bok_listbox.takeItem(idx)
@@ -1970,215 +5978,63 @@ class VWorldAdmCodeGUI(QWidget):
             except Exception:
                 pass
 
+    @perf_action('bok_plot')
     def on_bok_plot(self):
         try:
-            col_count = self.bok_result_table.columnCount()
-            headers = [
-                (self.bok_result_table.horizontalHeaderItem(i).text()
-                 if self.bok_result_table.horizontalHeaderItem(i) else '')
-                for i in range(col_count)
-            ]
-            try:
-                idx_time = headers.index('TIME')
-            except ValueError:
-                idx_time = None
-            try:
-                idx_val = headers.index('DATA_VALUE')
-            except ValueError:
-                idx_val = None
-            try:
-                idx_unit = headers.index('UNIT_NAME')
-            except ValueError:
-                idx_unit = None
-            try:
-                idx_stat = headers.index('STAT_NAME')
-            except ValueError:
-                idx_stat = None
-            try:
-                idx_item1 = headers.index('ITEM_NAME1')
-            except ValueError:
-                idx_item1 = None
-
-            if idx_time is None or idx_val is None:
-                QMessageBox.warning(self, "차트 생성 실패", "TIME 또는 DATA_VALUE 열을 찾을 수 없습니다.")
-                return
-
-            # Build per-saved-entry series (label, times[], values[]) so we can plot multiple series
+            # Build per-saved-entry series (label, times[], values[]) from the typed ECOS store
             series_list = []
             unit = ''
             stat_name = ''
             item1 = ''
-            rows = self.bok_result_table.rowCount()
-            try:
-                # If saved ranges exist and some are checked, build series from each checked saved range
-                if getattr(self, 'bok_saved_ranges', None) and self.bok_listbox.count() > 0:
-                    for i in range(self.bok_listbox.count()):
-                        it = self.bok_listbox.item(i)
-                        if it is None:
-                            continue
-                        w = self.bok_listbox.itemWidget(it)
-                        if w is None:
-                            continue
-                        chk = w.findChild(QCheckBox)
-                        if chk is None or not chk.isChecked():
-                            continue
-                        if i < len(self.bok_saved_ranges):
-                            mp = self.bok_saved_ranges[i]
-                            start = int(mp.get('start', 0))
-                            cnt = int(mp.get('count', 0))
-                            times_s = []
-                            vals_s = []
-                            for r in range(start, start + cnt):
-                                t_item = self.bok_result_table.item(r, idx_time)
-                                v_item = self.bok_result_table.item(r, idx_val)
-                                t = t_item.text() if t_item else ''
-                                v = v_item.text() if v_item else ''
-                                try:
-                                    num = float(str(v).replace(',', ''))
-                                except Exception:
-                                    num = None
-                                # collect per-series
-                                times_s.append(t)
-                                vals_s.append(num)
-                                if idx_unit is not None and not unit:
-                                    u_item = self.bok_result_table.item(r, idx_unit)
-                                    unit = u_item.text() if u_item else ''
-                                if idx_stat is not None and not stat_name:
-                                    s_item = self.bok_result_table.item(r, idx_stat)
-                                    stat_name = s_item.text() if s_item else ''
-                                if idx_item1 is not None and not item1:
-                                    it_item = self.bok_result_table.item(r, idx_item1)
-                                    item1 = it_item.text() if it_item else ''
-                            label = mp.get('label', f'Series {i+1}')
-                            series_list.append({'label': label, 'times': times_s, 'values': vals_s})
-                else:
-                    # fallback: single series containing all rows
-                    times_s = []
-                    vals_s = []
-                    for r in range(rows):
-                        t_item = self.bok_result_table.item(r, idx_time)
-                        v_item = self.bok_result_table.item(r, idx_val)
-                        t = t_item.text() if t_item else ''
-                        v = v_item.text() if v_item else ''
-                        try:
-                            num = float(str(v).replace(',', ''))
-                        except Exception:
-                            num = None
-                        times_s.append(t)
-                        vals_s.append(num)
-                        if idx_unit is not None and not unit:
-                            u_item = self.bok_result_table.item(r, idx_unit)
-                            unit = u_item.text() if u_item else ''
-                        if idx_stat is not None and not stat_name:
-                            s_item = self.bok_result_table.item(r, idx_stat)
-                            stat_name = s_item.text() if s_item else ''
-                        if idx_item1 is not None and not item1:
-                            it_item = self.bok_result_table.item(r, idx_item1)
-                            item1 = it_item.text() if it_item else ''
-                    series_list.append({'label': 'Series 1', 'times': times_s, 'values': vals_s})
-            except Exception:
+            store = self.ecos_store
+            keys = []
+            for i in range(self.bok_listbox.count()):
+                it = self.bok_listbox.item(i)
+                w = self.bok_listbox.itemWidget(it) if it is not None else None
+                chk = w.findChild(QCheckBox) if w is not None else None
+                if chk is None or not chk.isChecked():
+                    continue
+                series_key = it.data(Qt.UserRole)
+                if series_key is not None and tuple(series_key[:3]) in store.series:
+                    keys.append(tuple(series_key))
+            if not keys and not self.bok_listbox.count():
+                keys = list(store.series)
+            for series_key in keys:
+                # 파생 키는 memo된 결과를 받으므로 다시 그려도 재계산하지 않음
+                try:
+                    ser = self.ecos_derived.get(series_key)
+                except Exception as e:
+                    perf_metrics.error('ecos.derived', e)
+                    continue
+                if ser is None:
+                    continue
+                unit = unit or ser.meta.get('UNIT_NAME', '')
+                stat_name = stat_name or ser.meta.get('STAT_NAME', '')
+                item1 = item1 or ser.meta.get('ITEM_NAME1', '')
+                series_list.append({'label': ser.label, 'times': ser.times, 'values': ser.values, 'series_key': series_key,
+                                    'periods': ser.periods(), 'unit': ser.meta.get('UNIT_NAME', '')})
+            if not series_list:
                 QMessageBox.information(self, "차트 없음", "플롯할 숫자 데이터가 없습니다.")
                 return
 
-            # Build union of time labels with granularity handling.
-            # If any series contains monthly (or daily) granularity, produce a monthly
-            # x-axis (YYYYMM). Annual-only values will be mapped to YYYY01 (Jan of year).
-            import re as _re
-
-            def to_yyyymm(t):
-                try:
-                    s = str(t).strip()
-                    # YYYYMMDD -> YYYYMM
-                    m = _re.match(r"^(\d{4})(\d{2})(\d{2})$", s)
-                    if m:
-                        return f"{m.group(1)}{m.group(2)}"
-                    # YYYYMM
-                    m = _re.match(r"^(\d{4})(\d{2})$", s)
-                    if m:
-                        return f"{m.group(1)}{m.group(2)}"
-                    # YYYY-Qn or YYYYQn -> map to quarter start month
-                    mq = _re.search(r"(\d{4})\D*Q(\d)", s, _re.IGNORECASE)
-                    if mq:
-                        y = int(mq.group(1)); q = int(mq.group(2)); mm = (q - 1) * 3 + 1
-                        return f"{y}{mm:02d}"
-                    # YYYY-MM or YYYY.MM or YYYY/MM or YYYY M formats
-                    m2 = _re.match(r"^(\d{4})\D+(\d{1,2})", s)
-                    if m2:
-                        y = int(m2.group(1)); mm = int(m2.group(2))
-                        return f"{y}{mm:02d}"
-                    # pure year YYYY -> map to January of that year
-                    if len(s) >= 4 and s[:4].isdigit():
-                        return f"{s[:4]}01"
-                except Exception:
-                    pass
-                return None
-
-            has_monthly = False
-            for ser in series_list:
-                for t in ser.get('times', []):
-                    if t is None:
-                        continue
-                    # if any time maps to a yyyymm (non-None) and original contains month/day/quarter, treat as monthly axis
-                    s = str(t).strip()
-                    if _re.match(r"^\d{6}$", _re.sub(r"\D", "", s)) and len(_re.sub(r"\D", "", s)) >= 6:
-                        has_monthly = True
-                        break
-                    if _re.search(r"Q", s, _re.IGNORECASE):
-                        has_monthly = True
-                        break
-                if has_monthly:
-                    break
-
-            if has_monthly:
-                # build monthly union keys (YYYYMM)
-                time_set = set()
-                for ser in series_list:
-                    for t in ser.get('times', []):
-                        k = to_yyyymm(t)
-                        if k:
-                            time_set.add(k)
-                union_times = sorted(time_set, key=lambda x: int(x))
-            else:
-                # fallback to year-only axis (as before)
-                time_map = {}
-                for ser in series_list:
-                    for t in ser.get('times', []):
-                        if t is None:
-                            continue
-                        # extract year
-                        m = _re.search(r"(\d{4})", str(t))
-                        if m:
-                            kd = int(m.group(1))
-                            if kd not in time_map:
-                                time_map[kd] = str(kd)
-                union_times = [lbl for kd, lbl in sorted(time_map.items(), key=lambda kv: kv[0])]
+            # 공통 달력: TIME 코드를 기간 서수로 한 번만 변환하고, 가장 세밀한 주기 축에 벡터 연산으로 배치
+            # (세밀한 주기를 거친 축에 놓을 일은 없고, 거친 주기 값은 구간 시작 시점에 표시)
+            with perf_metrics.stage('ecos.plot.align') as st:
+                freq, axis_ords, Y = EcosPeriods.align([(ser['times'], ser['values']) for ser in series_list],
+                                                       parsed=[ser['periods'] for ser in series_list])
+                st['rows'] = int(Y.size)
+            union_times = EcosPeriods.labels(freq, axis_ords) if freq else []
             if not union_times:
                 QMessageBox.information(self, "차트 없음", "플롯할 숫자 데이터가 없습니다.")
                 return
 
-            # map each series to union_times indices
             x = list(range(len(union_times)))
             xticks = union_times
             plotted_series = []
-            for ser in series_list:
-                ymap = [None] * len(union_times)
-                for t, v in zip(ser.get('times', []), ser.get('values', [])):
-                    if t is None:
-                        continue
-                    if has_monthly:
-                        k = to_yyyymm(t)
-                    else:
-                        # year-only mapping
-                        m = _re.search(r"(\d{4})", str(t))
-                        k = m.group(1) if m else None
-                    if k is None:
-                        continue
-                    try:
-                        idx = union_times.index(k)
-                        ymap[idx] = v
-                    except ValueError:
-                        continue
-                plotted_series.append({'label': ser.get('label', ''), 'y': ymap})
+            for si, ser in enumerate(series_list):
+                ymap = [None if np.isnan(v) else v for v in Y[si].tolist()]
+                plotted_series.append({'label': ser.get('label', ''), 'y': ymap, 'y_plot': Y[si], 'series_key': ser.get('series_key'),
+                                       'unit': ser.get('unit', '')})
 
             # Attempt to set a font that supports Korean on Windows/Mac/Linux
             try:
@@ -2193,6 +6049,8 @@ class VWorldAdmCodeGUI(QWidget):
 
             fig = plt.figure(figsize=(10, 5))
             base_ax = fig.add_subplot(111)
+            # hover tooltips are animated artists redrawn over a cached background
+            blit = ChartBlitter(fig)
             # force default marker size to 3 for compact visuals; use doubled size when selected
             marker_size = 3
             try:
@@ -2232,15 +6090,14 @@ class VWorldAdmCodeGUI(QWidget):
             plotted_series_updated = []
             for si, ser in enumerate(plotted_series):
                 ys = ser['y']
-                # convert None to NaN so matplotlib skips plotting those points
-                ys_plot = [float(v) if v is not None else float('nan') for v in ys]
+                # NaN (빈 칸) 은 건너뛰고 값이 있는 위치만 그림
+                ys_plot = ser['y_plot']
                 ax_i = axes[si]
                 color = colors[si % len(colors)]
                 try:
-                    import math
-                    xi = [i for i, vv in enumerate(ys_plot) if not math.isnan(vv)]
-                    yi = [ys_plot[i] for i in xi]
-                    if xi:
+                    xi = np.nonzero(~np.isnan(ys_plot))[0]
+                    yi = ys_plot[xi]
+                    if len(xi):
                         line, = ax_i.plot(xi, yi, marker='o', linestyle='-', label=ser.get('label', ''), color=color)
                     else:
                         # no valid points
@@ -2256,8 +6113,9 @@ class VWorldAdmCodeGUI(QWidget):
 
                 # label each y-axis with series label (and unit if available)
                 ylbl = ser.get('label', '')
-                if unit:
-                    ylbl = f"{ylbl} ({unit})" if ylbl else unit
+                ser_unit = ser.get('unit') or unit
+                if ser_unit:
+                    ylbl = f"{ylbl} ({ser_unit})" if ylbl else ser_unit
                 try:
                     ax_i.set_ylabel(ylbl)
                     # set y-axis label and tick colors to match series color
@@ -2280,41 +6138,37 @@ class VWorldAdmCodeGUI(QWidget):
                     ann = ax_i.annotate("", xy=(0, 0), xytext=(15, 15), textcoords="offset points",
                                         bbox=dict(boxstyle="round", fc="w"), arrowprops=dict(arrowstyle="->"))
                     ann.set_visible(False)
+                    blit.add(ann)
                 except Exception:
                     ann = None
 
-                plotted_series_updated.append({'label': ser.get('label', ''), 'y': ys, 'y_plot': ys_plot, 'ax': ax_i, 'line': line, 'annot': ann})
+                plotted_series_updated.append({'label': ser.get('label', ''), 'y': ys, 'y_plot': ys_plot, 'ax': ax_i, 'line': line, 'annot': ann,
+                                               'series_key': ser.get('series_key'), 'unit': ser_unit})
 
             plotted_series = plotted_series_updated
 
+            # level-of-detail: 보이는 구간의 점이 축 픽셀 폭보다 훨씬 많으면 구간별 min/max만 그림
+            if getattr(self, 'chk_bok_lod', None) is None or self.chk_bok_lod.isChecked():
+                lod = LineLOD(base_ax)
+                for ser in plotted_series:
+                    lod.add(ser.get('line'))
+            else:
+                lod = None
+
+            # 툴팁/선택용 점 화면좌표 격자 인덱스 (확대·이동·창 크기 변경 후 첫 조회에서만 재계산)
+            hit_index = ChartHitIndex(radius=10)
+            for si, ser in enumerate(plotted_series):
+                hit_index.add(ser['ax'], x, ser['y_plot'], keys=[(si, xi) for xi in range(len(x))], artist=ser.get('line'))
+
+            # 저장 목록 체크박스 <-> 선 표시 연결 (창이 열려 있는 동안 다시 그리지 않고 표시만 전환)
+            self._bok_plot_link = {'fig': fig, 'series': {
+                ser['series_key']: (ser.get('line'), ser['ax'], si)
+                for si, ser in enumerate(plotted_series) if ser.get('series_key') is not None}}
+
             # Reduce number of x-tick labels if too many
             max_xticks = 20
-            # Prefer year-aligned ticks: for monthly data use January indices; for quarterly use Q1.
-            import re
-            month_indices = []
-            quarter_indices = []
-            for i, t in enumerate(xticks):
-                s = str(t)
-                # YYYYMM e.g., 201901 or 2019-01 variants
-                m = re.match(r"^(\d{4})(\d{2})$", s)
-                if m:
-                    mm = int(m.group(2))
-                    if mm == 1:
-                        month_indices.append(i)
-                    continue
-                # look for patterns like 2019Q1 or 2019-Q1
-                mq = re.search(r"(\d{4})\D*Q(\d)", s, re.IGNORECASE)
-                if mq:
-                    q = int(mq.group(2))
-                    if q == 1:
-                        quarter_indices.append(i)
-
-            if month_indices:
-                cand = month_indices
-            elif quarter_indices:
-                cand = quarter_indices
-            else:
-                cand = list(range(len(x)))
+            # Prefer year-aligned ticks: 각 연도가 축에서 처음 나오는 위치 (연간 축이면 모든 위치)
+            cand = EcosPeriods.year_starts(freq, axis_ords).tolist()
 
             # If too many candidate ticks, thin them out to respect max_xticks
             if len(cand) > max_xticks:
@@ -2382,6 +6236,8 @@ class VWorldAdmCodeGUI(QWidget):
                 pass
 
             fig.tight_layout(rect=[0, 0.08, 1, 1])
+            if lod is not None:
+                lod.refresh()
 
             def format_num(v):
                 try:
@@ -2406,7 +6262,8 @@ class VWorldAdmCodeGUI(QWidget):
                     ann.xy = (x_val, y_val)
                     label_x = xticks[xi]
                     lbl = ser.get('label', '')
-                    txt = f"{lbl}\n{label_x}\n{format_num(y_val)} {unit if unit else ''}".strip()
+                    ser_unit = ser.get('unit') or unit
+                    txt = f"{lbl}\n{label_x}\n{format_num(y_val)} {ser_unit if ser_unit else ''}".strip()
                     ann.set_text(txt)
                     try:
                         ann.get_bbox_patch().set_alpha(0.9)
@@ -2426,23 +6283,8 @@ class VWorldAdmCodeGUI(QWidget):
                 # show per-series annot when cursor near a point on any axis
                 any_visible = False
                 if event.inaxes in axes and event.xdata is not None and event.ydata is not None:
-                    min_dist = float('inf')
-                    nearest = (None, None)
-                    for si, ser in enumerate(plotted_series):
-                        for xi, yv in enumerate(ser['y']):
-                            if yv is None:
-                                continue
-                            try:
-                                xpix, ypix = ser['ax'].transData.transform((x[xi], yv))
-                            except Exception:
-                                continue
-                            dx = xpix - event.x
-                            dy = ypix - event.y
-                            dist = (dx * dx + dy * dy) ** 0.5
-                            if dist < min_dist:
-                                min_dist = dist
-                                nearest = (si, xi)
-                    if nearest[0] is not None and min_dist < 10:
+                    nearest = hit_index.nearest(event.x, event.y)
+                    if nearest is not None:
                         # hide all annots first
                         for ser in plotted_series:
                             a = ser.get('annot')
@@ -2452,36 +6294,21 @@ class VWorldAdmCodeGUI(QWidget):
                         a = plotted_series[nearest[0]].get('annot')
                         if a is not None:
                             a.set_visible(True)
-                        fig.canvas.draw_idle()
+                        blit.update()
                         any_visible = True
                 if not any_visible:
                     for ser in plotted_series:
                         a = ser.get('annot')
                         if a is not None and a.get_visible():
                             a.set_visible(False)
-                            fig.canvas.draw_idle()
+                            blit.update()
 
             def on_click(event):
                 try:
                     if event.inaxes not in axes or event.button != 1:
                         return
-                    min_dist = float('inf')
-                    nearest = (None, None)
-                    for si, ser in enumerate(plotted_series):
-                        for xi, yv in enumerate(ser['y']):
-                            if yv is None:
-                                continue
-                            try:
-                                xpix, ypix = ser['ax'].transData.transform((x[xi], yv))
-                            except Exception:
-                                continue
-                            dx = xpix - event.x
-                            dy = ypix - event.y
-                            dist = (dx * dx + dy * dy) ** 0.5
-                            if dist < min_dist:
-                                min_dist = dist
-                                nearest = (si, xi)
-                    if nearest[0] is None or min_dist >= 10:
+                    nearest = hit_index.nearest(event.x, event.y)
+                    if nearest is None:
                         return
 
                     si, xi = nearest
@@ -2596,7 +6423,7 @@ class VWorldAdmCodeGUI(QWidget):
         except Exception:
             pass
 
-        # 세부 목록 조회: 서비스는 StatisticItemList, 요청종료건수는 100
+        # 세부 목록: StatisticItemList (캐시 우선, 전체 페이지)
         try:
             self._load_stat_item_list(code)
         except Exception:
@@ -2612,6 +6439,92 @@ class VWorldAdmCodeGUI(QWidget):
         except Exception:
             pass
 
+    def on_apt_bulk(self):
+        """전국 일괄 갱신: 계획(시군구 x 월 x 엔드포인트)과 호출 수 추정을 보여 준 뒤 캐시만 채움"""
+        key = self.edit_apt_key.text().strip()
+        vworld_key = self.edit_key.text().strip()
+        if not key or not vworld_key:
+            QMessageBox.warning(self, "입력 오류", "실거래가 Service Key와 브이월드 API Key가 필요합니다.")
+            return
+        if self._apt_plan_worker is not None or (getattr(self, '_apt_worker', None) is not None
+                                                 and self._apt_worker.isRunning()):
+            QMessageBox.information(self, "진행 중", "이미 조회가 진행 중입니다.")
+            return
+        months = self._months_between(
+            self.combo_apt_year_from.currentText().strip() + self.combo_apt_month_from.currentText().strip(),
+            self.combo_apt_year_to.currentText().strip() + self.combo_apt_month_to.currentText().strip())
+        types = [name for name, chk in self.apt_type_checks.items() if chk.isChecked()] or ['아파트']
+        include_rent = self.chk_rent.isChecked()
+        endpoints = RtmsEndpoint.for_types(types, include_rent)
+        self.rtms_key_pool.set_keys(ServiceKeyPool.parse(key))
+        worker = RtmsPlanWorker(self.rtms_planner, vworld_key, endpoints, months, self.rtms_key_pool, parent=self)
+        self._apt_plan_worker = worker
+        self.btn_apt_bulk.setEnabled(False)
+        self.status_label.setText("전국 일괄 갱신 계획 중...")
+        worker.done.connect(lambda plan: self._on_apt_bulk_plan(plan, types, include_rent, len(endpoints), len(months)))
+        worker.failed.connect(lambda msg: QMessageBox.critical(self, "요청 실패", f"시군구 지역코드 조회 실패:\n{msg}"))
+
+        def _finished():
+            self._apt_plan_worker = None
+            if getattr(self, '_apt_worker', None) is None:
+                self.btn_apt_bulk.setEnabled(True)
+
+        worker.finished.connect(_finished)
+        worker.start()
+
+    def _on_apt_bulk_plan(self, plan, types, include_rent, n_endpoints, n_months):
+        jobs = plan['jobs']
+        pool = self.rtms_key_pool
+        lines = [f"시군구 {len(plan['lawds'])}곳 x {n_months}개월 x 엔드포인트 {n_endpoints}개 = 작업 {len(jobs)}건"
+                 f" (캐시로 끝나는 작업 {plan['cached']}건)", "", "예상 호출 수 / 오늘 남은 한도 (서비스별):"]
+        lines.extend(f"  {svc}: {n:,} / {pool.remaining(svc):,}" for svc, n in plan['calls'].items())
+        quota = f"키 {len(pool.keys)}개 x {pool.quota:,}회/서비스"
+        lines.append("")
+        if plan['days'] > 1:
+            lines.append(f"일일 한도({quota}) 기준 약 {plan['days']}일 분량입니다. "
+                         f"서버가 한도 초과를 알리면 남은 작업은 미뤄 두고, 다음 날 다시 실행하면 캐시된 작업은 건너뜁니다.")
+        else:
+            lines.append(f"일일 한도({quota}) 안에서 끝나는 분량입니다.")
+        lines.append("진행할까요?")
+        self.status_label.setText("대기")
+        if QMessageBox.question(self, "전국 일괄 갱신", "\n".join(lines),
+                                QMessageBox.Yes | QMessageBox.No) != QMessageBox.Yes:
+            return
+        worker = AptFetchWorker([], [], pool, include_rent=include_rent, headers=self.apt_default_headers,
+                                types=types, cache=self.rtms_cache, jobs=jobs, collect=False, parent=self)
+        self._apt_worker = worker
+        self._apt_fetch_warning = ''
+        self.btn_apt_fetch.setEnabled(False)
+        self.btn_apt_bulk.setEnabled(False)
+        self.btn_apt_cancel.setEnabled(True)
+        self.progress_bar.setMaximum(max(1, len(jobs)))
+        self.progress_bar.setValue(0)
+
+        def _progress(cur, total):
+            self.progress_bar.setMaximum(total)
+            self.progress_bar.setValue(cur)
+            self.status_label.setText(f"전국 갱신: {cur}/{total}")
+
+        def _done(_rows):
+            st = worker.stats
+            warn = self._apt_fetch_warning
+            self.status_label.setText(f"전국 갱신 완료: 작업 {st['jobs']}건 (신규 수신 {st['fetched']}건, 거래 {st['rows']:,}건)"
+                                      + (f" ({warn})" if warn else ""))
+
+        def _finished():
+            if self._apt_worker is worker:
+                self._apt_worker = None
+            self.btn_apt_fetch.setEnabled(True)
+            self.btn_apt_bulk.setEnabled(True)
+            self.btn_apt_cancel.setEnabled(False)
+
+        worker.progress.connect(_progress)
+        worker.results_ready.connect(_done)
+        worker.warning.connect(lambda msg: setattr(self, '_apt_fetch_warning', msg))
+        worker.error.connect(lambda msg: QMessageBox.critical(self, "요청 실패", msg))
+        worker.finished.connect(_finished)
+        worker.start()
+
     # =========== 아파트 실거래 관련 메서드 ===========
     def on_apt_fetch(self):
         lawd = self.edit_apt_lawd.text().strip()
@@ -2683,6 +6596,8 @@ class VWorldAdmCodeGUI(QWidget):
         try:
             self.apt_filters = {}
             self.apt_rows_master = []
+            self._apt_store = None
+            self._apt_cube = None
             try:
                 # clear any search-based filters and remove header buttons immediately
                 try:
@@ -2736,8 +6651,9 @@ class VWorldAdmCodeGUI(QWidget):
         # serviceKey: decode percent-encoding before passing to `params`
         # to avoid double-encoding by `requests` (matches browser behavior).
         # Show an example final URL using the first LAWD code
+        keys = ServiceKeyPool.parse(key)
         params = {
-            "serviceKey": requests.utils.unquote(key),
+            "serviceKey": requests.utils.unquote(keys[0]),
             "LAWD_CD": (lawd_list[0] if lawd_list else lawd),
             "DEAL_YMD": from_ym,
             "pageNo": "1",
@@ -2788,7 +6704,12 @@ class VWorldAdmCodeGUI(QWidget):
             include_rent_flag = bool(getattr(self, 'chk_rent', None) and self.chk_rent.isChecked())
         except Exception:
             include_rent_flag = False
-        self._apt_worker = AptFetchWorker(lawd_list, months, key, include_rent=include_rent_flag)
+        types = [name for name, chk in self.apt_type_checks.items() if chk.isChecked()] or ['아파트']
+        self.rtms_key_pool.set_keys(keys)
+        self._apt_worker = AptFetchWorker(lawd_list, months, self.rtms_key_pool, include_rent=include_rent_flag,
+                                          headers=self.apt_default_headers, types=types, cache=self.rtms_cache)
+        worker = self._apt_worker
+        self._apt_fetch_warning = ''
 
         def _on_progress(cur, total):
             try:
@@ -2801,6 +6722,8 @@ class VWorldAdmCodeGUI(QWidget):
                     self._last_progress_total = int(total)
                 except Exception:
                     self._last_progress_total = int(total) if total else 0
+                # 작업 수(종류 x 지역 x 월)는 워커가 정하므로 최대값도 함께 맞춤
+                self.progress_bar.setMaximum(total)
                 self.progress_bar.setValue(cur)
                 self.status_label.setText(f"진행: {cur}/{total}")
                 QApplication.processEvents()
@@ -2809,6 +6732,7 @@ class VWorldAdmCodeGUI(QWidget):
 
         def _on_finished(rows):
             try:
+                n_fetched = len(rows)
                 # sort by 계약일
                 def _parse_date(s):
                     try:
@@ -2874,6 +6798,18 @@ class VWorldAdmCodeGUI(QWidget):
                 # trade_date is at column index 3 in worker row structure
                 rows.sort(key=lambda r: _parse_date(r[3] if len(r) > 3 else ""))
                 self.apt_rows_master = rows
+                # typed column store built once per fetch; charts aggregate over it instead of the Qt table
+                with perf_metrics.stage('apt.store_build') as st:
+                    self._apt_store = AptRowStore.from_rows(rows, self.apt_default_headers)
+                    st['rows'] = len(rows)
+                # rollup cube was filled by the worker while pages arrived; rebuild only if 읍면동 filter dropped rows
+                cube = getattr(worker, 'cube', None)
+                if cube is None or len(rows) != n_fetched or cube.size != n_fetched:
+                    with perf_metrics.stage('apt.cube_build') as st:
+                        cube = AptRollupCube()
+                        cube.add_store(self._apt_store)
+                        st['rows'] = len(rows)
+                self._apt_cube = cube
                 self.apt_filters = {}
                 try:
                     self._update_header_clear_buttons()
@@ -2918,7 +6854,7 @@ class VWorldAdmCodeGUI(QWidget):
                 try:
                     self.apply_apt_filters(progress_callback=_table_progress)
                 except Exception:
-                    self.populate_apt_table(rows, progress_callback=_table_progress)
+                    self.populate_apt_table(rows, progress_callback=_table_progress, master_indices=range(len(rows)))
                 # If we requested a reset of sort state at fetch start, clear sort indicator
                 try:
                     if getattr(self, '_reset_sort_after_fetch', False):
@@ -2951,7 +6887,8 @@ class VWorldAdmCodeGUI(QWidget):
                     self.combo_chart_type.setEnabled(bool(rows))
                 except Exception:
                     pass
-                self.status_label.setText(f"완료: {len(rows)}건")
+                warn = getattr(self, '_apt_fetch_warning', '')
+                self.status_label.setText(f"완료: {len(rows)}건" + (f" ({warn})" if warn else ""))
                 try:
                     # set progress to full (maximum may be months * LAWD count)
                     self.progress_bar.setValue(self.progress_bar.maximum())
@@ -2982,6 +6919,7 @@ class VWorldAdmCodeGUI(QWidget):
         # connect worker result signal (renamed to avoid shadowing QThread.finished)
         self._apt_worker.results_ready.connect(_on_finished)
         self._apt_worker.error.connect(_on_error)
+        self._apt_worker.warning.connect(lambda msg: setattr(self, '_apt_fetch_warning', msg))
         # ensure QThread's built-in finished deletes the thread object
         try:
             self._apt_worker.finished.connect(self._apt_worker.deleteLater)
@@ -3220,8 +7158,10 @@ class VWorldAdmCodeGUI(QWidget):
                 master_idx = None
                 full_row = None
                 try:
-                    if hasattr(self, '_visible_to_master_indices') and row < len(self._visible_to_master_indices):
-                        master_idx = self._visible_to_master_indices[row]
+                    # populate_apt_table stores the master row index on column 0 (survives user sorting)
+                    first = self.apt_table.item(row, 0)
+                    if first is not None and first.data(Qt.UserRole + 1) is not None:
+                        master_idx = int(first.data(Qt.UserRole + 1))
                     if master_idx is not None and master:
                         full_row = master[master_idx]
                     # if mapping not known, try to find a matching master row now (avoid incorrect fallback later)
@@ -3269,8 +7209,9 @@ class VWorldAdmCodeGUI(QWidget):
             try:
                 base_rows = getattr(self, 'apt_rows_master', None)
                 if base_rows:
-                    filtered_rows = [base_rows[i] for i in sel if 0 <= i < len(base_rows)]
-                    self.populate_apt_table(filtered_rows)
+                    sel_idx = [i for i in sel if 0 <= i < len(base_rows)]
+                    filtered_rows = [base_rows[i] for i in sel_idx]
+                    self.populate_apt_table(filtered_rows, master_indices=sel_idx)
                     # mark search-based filter active so header X appears
                     try:
                         self._search_filters = getattr(self, '_search_filters', {}) or {}
@@ -3424,7 +7365,7 @@ class VWorldAdmCodeGUI(QWidget):
                     # remove search filter and restore full master rows
                     self._search_filters.pop(col, None)
                     try:
-                        self.populate_apt_table(self.apt_rows_master or [])
+                        self.populate_apt_table(self.apt_rows_master or [], master_indices=range(len(self.apt_rows_master or [])))
                     except Exception:
                         pass
                     cleared = True
@@ -3443,7 +7384,7 @@ class VWorldAdmCodeGUI(QWidget):
         if not getattr(self, 'apt_rows_master', None):
             return
         if not self.apt_filters:
-            rows = self.apt_rows_master
+            indices = range(len(self.apt_rows_master))
         else:
             def matches_all(row):
                 for col, f in self.apt_filters.items():
@@ -3453,7 +7394,8 @@ class VWorldAdmCodeGUI(QWidget):
                     except Exception:
                         return False
                 return True
-            rows = [r for r in self.apt_rows_master if matches_all(r)]
+            indices = [i for i, r in enumerate(self.apt_rows_master) if matches_all(r)]
+        rows = self.apt_rows_master
         # 추가 필터: 거래유형 체크박스에 따라 매매/전월세만 표시
         try:
             # determine which column index contains 거래유형 dynamically
@@ -3497,23 +7439,24 @@ class VWorldAdmCodeGUI(QWidget):
                 return False
 
             filtered = []
-            for r in rows:
+            for i in indices:
+                r = rows[i]
                 try:
                     if is_rent(r):
                         if getattr(self, 'chk_rent', None) and self.chk_rent.isChecked():
-                            filtered.append(r)
+                            filtered.append(i)
                     else:
                         # 기본적으로 매매로 간주
                         if getattr(self, 'chk_sale', None) and self.chk_sale.isChecked():
-                            filtered.append(r)
+                            filtered.append(i)
                 except Exception:
                     # on error, include the row to avoid silent data loss
-                    filtered.append(r)
-            rows = filtered
+                    filtered.append(i)
+            indices = filtered
         except Exception:
             pass
 
-        self.populate_apt_table(rows, progress_callback=progress_callback)
+        self.populate_apt_table([rows[i] for i in indices], progress_callback=progress_callback, master_indices=indices)
         try:
             self._update_header_clear_buttons()
         except Exception:
@@ -3544,7 +7487,10 @@ class VWorldAdmCodeGUI(QWidget):
                 y += 1
         return months
 
-    def populate_apt_table(self, rows, progress_callback=None):
+    def populate_apt_table(self, rows, progress_callback=None, master_indices=None):
+        t_fill = time.perf_counter()
+        # 표시 행 -> apt_rows_master 인덱스 (모르면 None; 차트/검색은 이 매핑을 사용)
+        self._visible_to_master_indices = list(master_indices) if master_indices is not None else None
         # disable sorting while populating to avoid race/ordering issues
         try:
             was_sorting = self.apt_table.isSortingEnabled()
@@ -3617,6 +7563,7 @@ class VWorldAdmCodeGUI(QWidget):
         total_rows = len(rows)
         r_idx = 0
         for row in rows:
+            master_idx = self._visible_to_master_indices[r_idx] if self._visible_to_master_indices is not None else None
             try:
                 cur_row = self.apt_table.rowCount()
                 try:
@@ -3647,6 +7594,8 @@ class VWorldAdmCodeGUI(QWidget):
                             it = QTableWidgetItem(txt)
                     except Exception:
                         it = QTableWidgetItem(txt)
+                    if c == 0 and master_idx is not None:
+                        it.setData(Qt.UserRole + 1, master_idx)
                     try:
                         self.apt_table.setItem(cur_row, c, it)
                     except Exception:
@@ -3665,6 +7614,8 @@ class VWorldAdmCodeGUI(QWidget):
             self.apt_table.setSortingEnabled(was_sorting)
         except Exception:
             pass
+        perf_metrics.record('apt.table_fill', time.perf_counter() - t_fill, rows=total_rows)
+        self.apt_selection_changed.emit()
 
     def on_apt_save_csv(self):
         lawd = self.edit_apt_lawd.text().strip()
@@ -3687,189 +7638,282 @@ class VWorldAdmCodeGUI(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "저장 실패", str(e))
 
-    def on_apt_chart(self):
-        # Simple chart: plot 거래금액(만원) over 계약일 for visible rows
-        try:
-            try:
-                plt.close('all')
-            except Exception:
-                pass
-            # find column indices
-            date_col = None
-            price_col = None
-            for i in range(self.apt_table.columnCount()):
-                hi = self.apt_table.horizontalHeaderItem(i)
-                if not hi:
-                    continue
-                t = (hi.text() or "").strip()
-                if t == "계약일":
-                    date_col = i
-                if t == "거래금액(만원)":
-                    price_col = i
-            if date_col is None or price_col is None:
-                QMessageBox.information(self, "차트 생성", "계약일 또는 거래금액 열이 없습니다.")
-                return
-            dates = []
-            prices = []
-            for r in range(self.apt_table.rowCount()):
-                try:
-                    di = self.apt_table.item(r, date_col)
-                    pi = self.apt_table.item(r, price_col)
-                    if di is None or pi is None:
-                        continue
-                    ds = di.text().strip()
-                    ps = pi.text().strip()
-                    if not ds or not ps:
-                        continue
-                    # parse price (remove commas, non-digits)
-                    import re
-                    digits = re.sub(r"[^0-9]", "", ps)
-                    # treat parsing failure as 0 per user request
-                    price = int(digits) if digits else 0
-                    # parse date (try common formats)
-                    from datetime import datetime
-                    parsed = None
-                    for fmt in ("%Y-%m-%d", "%Y.%m.%d", "%Y/%m/%d", "%Y%m%d"):
-                        try:
-                            parsed = datetime.strptime(ds, fmt)
-                            break
-                        except Exception:
-                            continue
-                    if parsed is None:
-                        continue
-                    dates.append(parsed)
-                    prices.append(price)
-                except Exception:
-                    continue
-            if not dates:
-                QMessageBox.information(self, "차트 생성", "차트에 그릴 데이터가 없습니다.")
-                return
-            # aggregation by year-month
-            from collections import defaultdict
-            agg = defaultdict(lambda: { 'buy_count':0, 'rent_count':0, 'buy_sum':0, 'rent_sum':0 })
-            for d,p,rtype in zip(dates, prices, [None]*len(dates)):
-                # we didn't store types; re-extract from table per-date is cumbersome,
-                # so instead rebuild from table rows to include type info accurately.
-                pass
-            # Rebuild aggregation from table to include type
-            agg = defaultdict(lambda: { 'buy_count':0, 'rent_count':0, 'buy_sum':0, 'rent_sum':0 })
-            # determine 거래유형 column once (avoid per-row scanning)
-            type_col = None
-            try:
-                for i in range(self.apt_table.columnCount()):
-                    hi = self.apt_table.horizontalHeaderItem(i)
-                    if hi and (hi.text() or "").strip() == '거래유형':
-                        type_col = i
-                        break
-            except Exception:
-                type_col = None
-
-            # use a broader set of rent keywords (match apply_apt_filters logic)
-            rent_keywords = ["전세", "월세", "전월세", "jeonse", "rent", "임대"]
-
-            # collect a small sample of rows for debug to inspect classification
-            sample_rows = []
-
-            for r in range(self.apt_table.rowCount()):
-                try:
-                    di = self.apt_table.item(r, date_col)
-                    pi = self.apt_table.item(r, price_col)
-                    if di is None or pi is None:
-                        continue
-                    ds = (di.text() or "").strip()
-                    ps = (pi.text() or "").strip()
-                    if not ds:
-                        continue
-                    from datetime import datetime
-                    parsed = None
-                    for fmt in ("%Y-%m-%d", "%Y.%m.%d", "%Y/%m/%d", "%Y%m%d"):
-                        try:
-                            parsed = datetime.strptime(ds, fmt)
-                            break
-                        except Exception:
-                            continue
-                    if parsed is None:
-                        continue
-                    ym = parsed.strftime('%Y-%m')
-                    import re
-                    digits = re.sub(r"[^0-9]", "", ps)
-                    price = int(digits) if digits else 0
-
-                    # extract type text from the pre-determined column
-                    ttext = ''
-                    try:
-                        if type_col is not None:
-                            ti_item = self.apt_table.item(r, type_col)
-                            ttext = (ti_item.text() or "") if ti_item is not None else ''
-                    except Exception:
-                        ttext = ''
-                    tnorm = (ttext or "").lower()
-                    is_rent = False
-                    try:
-                        for kw in rent_keywords:
-                            if kw in tnorm:
-                                is_rent = True
-                                break
-                    except Exception:
-                        is_rent = False
-
-                    if is_rent:
-                        agg[ym]['rent_count'] += 1
-                        agg[ym]['rent_sum'] += price
-                    else:
-                        agg[ym]['buy_count'] += 1
-                        agg[ym]['buy_sum'] += price
+    def _apt_chart_source(self):
+        """차트 입력: (AptRowStore, 표시 중인 master 행 인덱스 또는 None)"""
+        master = getattr(self, 'apt_rows_master', None) or []
+        index = getattr(self, '_visible_to_master_indices', None)
+        if master and index is not None:
+            store = getattr(self, '_apt_store', None)
+            if store is None or store.size != len(master):
+                store = AptRowStore.from_rows(master, self.apt_default_headers)
+                self._apt_store = store
+            return store, index
+        # 표시 행과 master의 대응을 모르면 현재 표 내용으로 임시 저장소를 구성
+        headers = []
+        for i in range(self.apt_table.columnCount()):
+            hi = self.apt_table.horizontalHeaderItem(i)
+            headers.append((hi.text() or "").strip() if hi else "")
+        rows = []
+        for r in range(self.apt_table.rowCount()):
+            rows.append([self.apt_table.item(r, c).text() if self.apt_table.item(r, c) else "" for c in range(len(headers))])
+        return AptRowStore.from_rows(rows, headers), None
+
+    def _apt_cube_view(self):
+        """현재 표시가 거래유형 체크박스로만 걸러진 상태면 (큐브, where)를, 아니면 (None, None)"""
+        cube = getattr(self, '_apt_cube', None)
+        master = getattr(self, 'apt_rows_master', None) or []
+        if cube is None or cube.size != len(master) or not master:
+            return None, None
+        if self.apt_filters or getattr(self, '_search_filters', None):
+            return None, None
+        if getattr(self, '_visible_to_master_indices', None) is None:
+            return None, None
+        kinds = set()
+        if self.chk_sale.isChecked():
+            kinds.add(0)
+        if self.chk_rent.isChecked():
+            kinds.add(1)
+        return cube, {'kind': kinds}
+
+    def _apt_monthly_aggregate(self):
+        """(월 ordinal 배열, 건수[월, 거래유형], 합계[월, 거래유형]) 또는 데이터가 없으면 None"""
+        nkinds = len(AptRowStore.KINDS)
+        cube, where = self._apt_cube_view()
+        if cube is not None:
+            perf_metrics.incr('apt.chart.cube_hit')
+            cells = cube.rollup(('month', 'kind'), where)
+            if not cells:
+                return None
+            months = np.array(sorted({k[0] for k in cells}), dtype=np.int64)
+            pos = {m: i for i, m in enumerate(months.tolist())}
+            counts = np.zeros((len(months), nkinds))
+            sums = np.zeros((len(months), nkinds))
+            for (m, k), cell in cells.items():
+                counts[pos[m], k] = cell.count
+                sums[pos[m], k] = cell.sum
+            return months, counts, sums
+        perf_metrics.incr('apt.chart.store_scan')
+        store, index = self._apt_chart_source()
+        if store is None or store.size == 0:
+            return None
+        agg = store.aggregate(index, by=('month', 'kind'))
+        if not len(agg['count']):
+            return None
+        months, _, counts = AptRowStore.pivot(agg, 'month', 'kind', 'count', col_values=range(nkinds))
+        _, _, sums = AptRowStore.pivot(agg, 'month', 'kind', 'sum', col_values=range(nkinds))
+        return months, counts, sums
+
+    def _apt_monthly_quantiles(self, qs=(0.1, 0.5, 0.9)):
+        """(월 ordinal 배열, 거래금액 분위[월, 거래유형, q], ㎡당 분위[월, 거래유형, q]) 또는 None
+
+        큐브 경로는 셀 스케치를 병합한 근사값, 저장소 경로(필터 적용 중)는 표시 행의 정확한 분위수
+        """
+        nkinds = len(AptRowStore.KINDS)
+        cube, where = self._apt_cube_view()
+        if cube is not None:
+            cells = cube.rollup(('month', 'kind'), where)
+            if not cells:
+                return None
+            months = np.array(sorted({k[0] for k in cells}), dtype=np.int64)
+            pos = {m: i for i, m in enumerate(months.tolist())}
+            price = np.full((len(months), nkinds, len(qs)), np.nan)
+            ppa = np.full((len(months), nkinds, len(qs)), np.nan)
+            for (m, k), cell in cells.items():
+                if cell.price_q is not None:
+                    price[pos[m], k] = cell.price_q.quantiles(qs)
+                if cell.ppa_q is not None:
+                    ppa[pos[m], k] = cell.ppa_q.quantiles(qs)
+            return months, price, ppa
+        store, index = self._apt_chart_source()
+        if store is None or store.size == 0:
+            return None
+        agg = store.aggregate(index, by=('month', 'kind'), quantiles=qs)
+        if not len(agg['count']):
+            return None
+        months = None
+        price_grids = []
+        ppa_grids = []
+        for q in qs:
+            tag = f"{int(round(q * 100)):02d}"
+            months, _, g = AptRowStore.pivot(agg, 'month', 'kind', 'q' + tag, col_values=range(nkinds), fill=np.nan)
+            price_grids.append(g)
+            _, _, g = AptRowStore.pivot(agg, 'month', 'kind', 'ppa_q' + tag, col_values=range(nkinds), fill=np.nan)
+            ppa_grids.append(g)
+        return months, np.stack(price_grids, axis=2), np.stack(ppa_grids, axis=2)
+
+    def _show_apt_quantile_chart(self, ctype):
+        # 월별 거래금액 / ㎡당 가격의 중앙값 선 + p10~p90 음영 (거래유형별)
+        with perf_metrics.stage('apt.chart.quantiles') as st:
+            res = self._apt_monthly_quantiles()
+            st['rows'] = 0 if res is None else len(res[0])
+        if res is None:
+            QMessageBox.information(self, "차트 생성", "차트에 그릴 데이터가 없습니다.")
+            return
+        months, price, ppa = res
+        keys = [AptRowStore.month_label(m) for m in months]
+        x = np.arange(len(keys))
+        colors = ('blue', 'orange')
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
+        series = []
+        for k, kname in enumerate(AptRowStore.KINDS):
+            if np.all(np.isnan(price[:, k, 1])):
+                continue
+            label = '매매가' if k == 0 else '보증금'
+            # 거래금액은 억원, ㎡당 가격은 만원 단위로 표시
+            p = price[:, k, :] / 10000.0
+            ax1.plot(x, p[:, 1], marker='o', color=colors[k], label=f'{label} 중앙값(억원)')
+            ax1.fill_between(x, p[:, 0], p[:, 2], color=colors[k], alpha=0.2, label=f'{label} p10~p90')
+            series.append((ax1, f'{kname} {label}(억원)', p))
+            a = ppa[:, k, :]
+            ax2.plot(x, a[:, 1], marker='o', color=colors[k], label=f'{kname} ㎡당 중앙값(만원)')
+            ax2.fill_between(x, a[:, 0], a[:, 2], color=colors[k], alpha=0.2, label=f'{kname} ㎡당 p10~p90')
+            series.append((ax2, f'{kname} ㎡당(만원)', a))
+        ax1.set_title('월별 거래금액 분위수 (p10 / 중앙값 / p90)')
+        ax2.set_title('월별 ㎡당 가격 분위수 (p10 / 중앙값 / p90)')
+        for ax in (ax1, ax2):
+            ax.legend(loc='upper left', fontsize=8)
+            ax.grid(True, alpha=0.3)
+        ax2.set_xticks(x)
+        ax2.set_xticklabels(keys)
+        ax2.tick_params(axis='x', rotation=45)
+        plt.tight_layout()
+
+        annotators = {}
+        blit = ChartBlitter(fig)
+
+        def on_move(event):
+            ax = event.inaxes
+            for a in annotators.values():
+                a.set_visible(False)
+            if ax is not None and event.xdata is not None and len(x):
+                i = int(round(event.xdata))
+                if 0 <= i < len(keys):
+                    lines = [keys[i]]
+                    for sax, name, vals in series:
+                        if sax is ax and not np.isnan(vals[i, 1]):
+                            lines.append(f"{name}: {vals[i, 1]:,.2f} ({vals[i, 0]:,.2f}~{vals[i, 2]:,.2f})")
+                    if len(lines) > 1:
+                        annot = annotators.get(ax)
+                        if annot is None:
+                            annot = annotators[ax] = blit.add(ax.annotate('', xy=(0, 0), xytext=(15, 15), textcoords='offset points',
+                                                                           bbox=dict(boxstyle='round', fc='w'), zorder=10))
+                        annot.xy = (event.xdata, event.ydata)
+                        annot.set_text("\n".join(lines))
+                        annot.set_visible(True)
+            blit.update()
+
+        fig.canvas.mpl_connect('motion_notify_event', on_move)
+        dlg = QDialog(self)
+        dlg.setWindowTitle(f"차트: {ctype}")
+        try:
+            dlg.setWindowFlags(dlg.windowFlags() | Qt.WindowMinMaxButtonsHint)
+        except Exception:
+            pass
+        lay = QVBoxLayout(dlg)
+        canvas = FigureCanvas(fig)
+        try:
+            lay.addWidget(NavigationToolbar(canvas, dlg))
+        except Exception:
+            pass
+        lay.addWidget(canvas)
+        dlg.resize(1000, 700)
+        dlg.exec_()
+        plt.close(fig)
+
+    def _show_apt_summary(self):
+        # 지역 × 면적대 × 거래유형 요약표: 큐브 셀을 합쳐서 표시 (필터가 걸려 있으면 표시 행으로 임시 큐브 구성)
+        cube, where = self._apt_cube_view()
+        if cube is None:
+            store, index = self._apt_chart_source()
+            cube = AptRollupCube()
+            cube.add_store(store, index)
+            where = None
+        cells = cube.rollup(('region', 'band', 'kind'), where)
+        if not cells:
+            QMessageBox.information(self, "차트 생성", "요약할 데이터가 없습니다.")
+            return
+        dlg = QDialog(self)
+        dlg.setWindowTitle("요약: 지역 × 전용면적대 × 거래유형")
+        try:
+            dlg.setWindowFlags(dlg.windowFlags() | Qt.WindowMinMaxButtonsHint)
+        except Exception:
+            pass
+        lay = QVBoxLayout(dlg)
+        tbl = QTableWidget()
+        headers = ["지역코드", "전용면적", "거래유형", "건수", "평균(만원)", "중앙값(만원)", "최소(만원)", "최대(만원)", "㎡당(만원)"]
+        tbl.setColumnCount(len(headers))
+        tbl.setHorizontalHeaderLabels(headers)
+        tbl.setEditTriggers(QTableWidget.NoEditTriggers)
+        tbl.setRowCount(len(cells))
+        for r, ((region, band, kind), cell) in enumerate(sorted(cells.items())):
+            tbl.setItem(r, 0, QTableWidgetItem(str(region)))
+            tbl.setItem(r, 1, QTableWidgetItem(AptRollupCube.band_label(band)))
+            tbl.setItem(r, 2, QTableWidgetItem(AptRowStore.KINDS[kind]))
+            med = cell.price_q.quantile(0.5) if cell.price_q is not None else float('nan')
+            for c, v in enumerate((cell.count, cell.mean, med, cell.min, cell.max, cell.ppa), start=3):
+                it = NumericItem(f"{v:,.0f}" if v == v else "")
+                it.setData(Qt.UserRole, int(v) if v == v else None)
+                tbl.setItem(r, c, it)
+        tbl.setSortingEnabled(True)
+        tbl.resizeColumnsToContents()
+        lay.addWidget(tbl)
+        dlg.resize(800, 500)
+        dlg.exec_()
+
+    def _apt_chart_series(self):
+        """차트용 (월 라벨, 매매 건수, 전월세 건수, 매매 총액(억원), 전월세 총액(억원)) 또는 데이터가 없으면 None"""
+        with perf_metrics.stage('apt.chart.aggregate') as st:
+            monthly = self._apt_monthly_aggregate()
+            st['rows'] = int(monthly[1].sum()) if monthly is not None else 0
+        if monthly is None:
+            return None
+        months, counts, sums = monthly
+        keys = [AptRowStore.month_label(m) for m in months]
+        buy_counts = [int(v) for v in counts[:, 0]]
+        rent_counts = [int(v) for v in counts[:, 1]]
+        # convert totals from 만원 단위 to 억원 단위 (1억원 = 10000만원)
+        buy_sums_y = [round(v / 10000.0, 2) for v in sums[:, 0]]
+        rent_sums_y = [round(v / 10000.0, 2) for v in sums[:, 1]]
+        return keys, buy_counts, rent_counts, buy_sums_y, rent_sums_y
+
+    def _on_apt_selection_changed(self):
+        # 열려 있는 차트 창만 갱신; 같은 이벤트 루프 안의 연속 변경은 한 번으로 합침
+        panel = getattr(self, '_apt_chart_panel', None)
+        if panel is None or not panel.isVisible() or getattr(self, '_apt_chart_refresh_pending', False):
+            return
+        self._apt_chart_refresh_pending = True
+        QTimer.singleShot(0, self._refresh_apt_chart_panel)
 
-                    # record a few sample rows for debug output
-                    if len(sample_rows) < 200:
-                        sample_rows.append((r, ym, ttext, price, ds))
-                except Exception:
-                    continue
+    def _refresh_apt_chart_panel(self):
+        self._apt_chart_refresh_pending = False
+        panel = getattr(self, '_apt_chart_panel', None)
+        if panel is None or not panel.isVisible():
+            return
+        try:
+            with perf_metrics.stage('apt.chart.live'):
+                series = self._apt_chart_series() or ([], [], [], [], [])
+                panel.update_data(panel.mode, *series)
+        except Exception as e:
+            perf_metrics.error('apt.chart.live', e)
 
-            # prepare sorted x-axis
-            keys = sorted(agg.keys())
-            buy_counts = [agg[k]['buy_count'] for k in keys]
-            rent_counts = [agg[k]['rent_count'] for k in keys]
-            buy_sums = [agg[k]['buy_sum'] for k in keys]
-            rent_sums = [agg[k]['rent_sum'] for k in keys]
-            # convert totals from 만원 단위 to 억원 단위 (1억원 = 10000만원)
-            buy_sums_y = [round(v / 10000.0, 2) for v in buy_sums]
-            rent_sums_y = [round(v / 10000.0, 2) for v in rent_sums]
-
-            # Debug: write aggregation summary to debug_logs for inspection
+    @perf_action('apt_chart')
+    def on_apt_chart(self):
+        # Simple chart: plot 거래금액(만원) over 계약일 for visible rows
+        try:
+            if self.combo_chart_type.currentText() == '요약(지역×면적)':
+                self._show_apt_summary()
+                return
+            if self.combo_chart_type.currentText() == '가격분위(p10/중앙/p90)':
+                self._show_apt_quantile_chart(self.combo_chart_type.currentText())
+                return
+            # 표시 중인 행(필터 반영)을 월×거래유형으로 집계 (큐브 셀 또는 타입 저장소)
+            series = self._apt_chart_series()
+            if series is None:
+                QMessageBox.information(self, "차트 생성", "차트에 그릴 데이터가 없습니다.")
+                return
+            keys, buy_counts, rent_counts, buy_sums_y, rent_sums_y = series
             try:
-                logs_dir = os.path.join(os.getcwd(), "debug_logs")
-                os.makedirs(logs_dir, exist_ok=True)
-                ts = int(time.time())
-                dbgfile = os.path.join(logs_dir, f"apt_chart_debug_{ts}.txt")
-                with open(dbgfile, 'w', encoding='utf-8') as fw:
-                    fw.write('keys:\n')
-                    for k in keys:
-                        fw.write(f"{k}\n")
-                    fw.write('\nbuy_counts:\n')
-                    fw.write(','.join(str(x) for x in buy_counts) + '\n')
-                    fw.write('\nrent_counts:\n')
-                    fw.write(','.join(str(x) for x in rent_counts) + '\n')
-                    fw.write('\nbuy_sums_y (억원):\n')
-                    fw.write(','.join(str(x) for x in buy_sums_y) + '\n')
-                    fw.write('\nrent_sums_y (억원):\n')
-                    fw.write(','.join(str(x) for x in rent_sums_y) + '\n')
-                    fw.write('\n# sample classified rows (row_index, ym, 거래유형_text, price(만원), date)\n')
-                    try:
-                        for tup in sample_rows:
-                            fw.write(','.join(str(x) for x in tup) + '\n')
-                    except Exception:
-                        pass
-                    try:
-                        total_rows = self.apt_table.rowCount()
-                        fw.write('\n# table_row_count=%d\n' % total_rows)
-                        fw.write('# total_rows_counted=%d\n' % (sum(buy_counts) + sum(rent_counts)))
-                    except Exception:
-                        pass
-                try:
-                    self.status_label.setText(f"차트 데이터: months={len(keys)}, rent_max={max(rent_counts) if rent_counts else 0}")
-                except Exception:
-                    pass
+                self.status_label.setText(f"차트 데이터: months={len(keys)}, rent_max={max(rent_counts) if rent_counts else 0}")
             except Exception:
                 pass
 
@@ -3893,458 +7937,15 @@ class VWorldAdmCodeGUI(QWidget):
 
             ctype = self.combo_chart_type.currentText() if hasattr(self, 'combo_chart_type') else '기본(혼합)'
             try:
-                if ctype == '서브플롯(4)':
-                    fig, axes = plt.subplots(2,2, figsize=(12,8))
-                    x = list(range(len(keys)))
-                    # bars
-                    bars_rent = axes[0,0].bar(x, rent_counts, color='orange', label='전월세 거래량')
-                    axes[0,0].set_title('월별 전월세 거래량')
-                    bars_buy = axes[0,1].bar(x, buy_counts, color='blue', label='매매 거래량')
-                    axes[0,1].set_title('월별 매매 거래량')
-                    # lines (sums in 억원)
-                    line_buy, = axes[1,0].plot(x, buy_sums_y, marker='o', label='매매 총액(억원)')
-                    axes[1,0].set_title('월별 매매 총액')
-                    line_rent, = axes[1,1].plot(x, rent_sums_y, marker='o', color='orange', label='전월세 총액(억원)')
-                    axes[1,1].set_title('월별 전월세 총액')
-                    # set x ticks
-                    for ax in axes.flatten():
-                        ax.set_xticks(x)
-                        ax.set_xticklabels(keys)
-                        ax.tick_params(axis='x', rotation=45)
-                    plt.tight_layout()
-
-                    # build artist info for tooltip
-                    artists_info = []
-                    for i, bar in enumerate(bars_rent):
-                        bar._series = '전월세 거래량'
-                        bar._x_label = keys[i]
-                        bar._y_value = rent_counts[i]
-                        artists_info.append({'artist': bar, 'type': 'bar', 'series': bar._series, 'x': keys[i], 'y': rent_counts[i]})
-                    for i, bar in enumerate(bars_buy):
-                        bar._series = '매매 거래량'
-                        bar._x_label = keys[i]
-                        bar._y_value = buy_counts[i]
-                        artists_info.append({'artist': bar, 'type': 'bar', 'series': bar._series, 'x': keys[i], 'y': buy_counts[i]})
-                    # lines: add points
-                    for i, xv in enumerate(x):
-                        artists_info.append({'artist': line_buy, 'type': 'line', 'series': '매매 총액(억원)', 'x': keys[i], 'xpos': xv, 'y': buy_sums_y[i]})
-                        artists_info.append({'artist': line_rent, 'type': 'line', 'series': '전월세 총액(억원)', 'x': keys[i], 'xpos': xv, 'y': rent_sums_y[i]})
-
-                    # per-axis annotations and guide lines for tooltip
-                    annotators = {}
-                    # per-axes guide lines for tooltip (data coord line connecting point->tooltip)
-                    line_guides = {}
-
-                    def on_move(event):
-                        if event.inaxes is None:
-                            try:
-                                for a in annotators.values():
-                                    try:
-                                        if a is not None:
-                                            a.set_visible(False)
-                                    except Exception:
-                                        pass
-                            except Exception:
-                                pass
-                            try:
-                                for lg in line_guides.values():
-                                    if lg is not None:
-                                        lg.set_visible(False)
-                            except Exception:
-                                pass
-                            try:
-                                fig.canvas.draw_idle()
-                            except Exception:
-                                pass
-                            return
-                        # prefer line points over bars when both are near
-                        try:
-                            # check lines first
-                            for info in artists_info:
-                                if info['type'] == 'line':
-                                    ax = event.inaxes
-                                    trans = ax.transData
-                                    px = event.x
-                                    py = event.y
-                                    # transform data point to pixel coords
-                                    xpix, ypix = ax.transData.transform((info['xpos'], info['y']))
-                                    dist = ((xpix - px)**2 + (ypix - py)**2)**0.5
-                                    if dist < 8:
-                                        # use per-axis annotator, anchor to data point with offset
-                                        ax_line = event.inaxes
-                                        annot = annotators.get(ax_line)
-                                        if annot is None:
-                                            try:
-                                                annot = ax_line.annotate('', xy=(0,0), xytext=(15,15), textcoords='offset points', bbox=dict(boxstyle='round', fc='w'), zorder=10)
-                                            except Exception:
-                                                annot = None
-                                            annotators[ax_line] = annot
-                                        # format y value
-                                        yval = info['y']
-                                        if '억원' in info['series']:
-                                            text = f"{info['series']}\n{info['x']}\n{yval:.2f}"
-                                        else:
-                                            text = f"{info['series']}\n{info['x']}\n{yval}"
-                                        if annot is not None:
-                                            try:
-                                                annot.xy = (info['xpos'], info['y'])
-                                                annot.set_text(text)
-                                            except Exception:
-                                                try:
-                                                    annot.set_text(text)
-                                                except Exception:
-                                                    pass
-                                        # draw guide line from data point to tooltip
-                                        try:
-                                            ax = event.inaxes
-                                            # data point coords
-                                            dx = info['xpos']
-                                            dy = info['y']
-                                            # tooltip pixel coords
-                                            tp_x, tp_y = (event.x + 15, event.y + 15)
-                                            # convert tooltip pixel to data coords
-                                            try:
-                                                tx, ty = ax.transData.inverted().transform((tp_x, tp_y))
-                                            except Exception:
-                                                tx, ty = dx, dy
-                                            lg = line_guides.get(ax)
-                                            if lg is None:
-                                                try:
-                                                    lg = ax.plot([], [], color='gray', linestyle='--', linewidth=0.8, zorder=2)[0]
-                                                except Exception:
-                                                    lg = None
-                                                line_guides[ax] = lg
-                                            if lg is not None:
-                                                try:
-                                                    lg.set_data([dx, tx], [dy, ty])
-                                                    lg.set_visible(True)
-                                                except Exception:
-                                                    pass
-                                        except Exception:
-                                            pass
-                                        if annot is not None:
-                                            try:
-                                                annot.set_visible(True)
-                                            except Exception:
-                                                pass
-                                        fig.canvas.draw_idle()
-                                        return
-                        except Exception:
-                            pass
-                        try:
-                            # then check bars
-                            for info in artists_info:
-                                if info['type'] == 'bar':
-                                    bar = info['artist']
-                                    contains, _ = bar.contains(event)
-                                    if contains:
-                                        # use per-axis annotator anchored to bar center
-                                        ax_bar = event.inaxes
-                                        annot = annotators.get(ax_bar)
-                                        if annot is None:
-                                            try:
-                                                annot = ax_bar.annotate('', xy=(0,0), xytext=(15,15), textcoords='offset points', bbox=dict(boxstyle='round', fc='w'), zorder=10)
-                                            except Exception:
-                                                annot = None
-                                            annotators[ax_bar] = annot
-                                        # format y value
-                                        yval = info['y']
-                                        text = f"{info['series']}\n{info['x']}\n{yval}"
-                                        if annot is not None:
-                                            try:
-                                                bx = bar.get_x() + bar.get_width()/2.0
-                                                by = bar.get_height()
-                                                annot.xy = (bx, by)
-                                                annot.set_text(text)
-                                            except Exception:
-                                                try:
-                                                    annot.set_text(text)
-                                                except Exception:
-                                                    pass
-                                        try:
-                                            ax = event.inaxes
-                                            # data point coords from bar center
-                                            bx = bar.get_x() + bar.get_width()/2.0
-                                            by = bar.get_height()
-                                            tp_x, tp_y = (event.x + 15, event.y + 15)
-                                            try:
-                                                tx, ty = ax.transData.inverted().transform((tp_x, tp_y))
-                                            except Exception:
-                                                tx, ty = bx, by
-                                            lg = line_guides.get(ax)
-                                            if lg is None:
-                                                try:
-                                                    lg = ax.plot([], [], color='gray', linestyle='--', linewidth=0.8, zorder=2)[0]
-                                                except Exception:
-                                                    lg = None
-                                                line_guides[ax] = lg
-                                            if lg is not None:
-                                                try:
-                                                    lg.set_data([bx, tx], [by, ty])
-                                                    lg.set_visible(True)
-                                                except Exception:
-                                                    pass
-                                        except Exception:
-                                            pass
-                                        annot.set_visible(True)
-                                        fig.canvas.draw_idle()
-                                        return
-                        except Exception:
-                            pass
-                        # hide all annotators and guide lines
-                        try:
-                            for a in annotators.values():
-                                try:
-                                    if a is not None:
-                                        a.set_visible(False)
-                                except Exception:
-                                    pass
-                        except Exception:
-                            pass
-                        try:
-                            for lg in line_guides.values():
-                                if lg is not None:
-                                    lg.set_visible(False)
-                        except Exception:
-                            pass
-                        try:
-                            fig.canvas.draw_idle()
-                        except Exception:
-                            pass
-
-                    fig.canvas.mpl_connect('motion_notify_event', on_move)
-                    try:
-                        from PyQt5.QtWidgets import QDialog, QVBoxLayout
-                        dlg = QDialog(self)
-                        dlg.setWindowTitle(f"차트: {ctype}")
-                        # enable minimize/maximize buttons on the dialog
-                        try:
-                            dlg.setWindowFlags(dlg.windowFlags() | Qt.WindowMinMaxButtonsHint)
-                        except Exception:
-                            pass
-                        lay = QVBoxLayout(dlg)
-                        try:
-                            canvas = FigureCanvas(fig)
-                            # optional toolbar
-                            try:
-                                tb = NavigationToolbar(canvas, dlg)
-                                lay.addWidget(tb)
-                            except Exception:
-                                pass
-                            lay.addWidget(canvas)
-                            dlg.resize(1000, 700)
-                            dlg.exec_()
-                        except Exception:
-                            plt.show()
-                    except Exception:
-                        plt.show()
-                else:
-                    fig, ax1 = plt.subplots(figsize=(12,6))
-                    x = list(range(len(keys)))
-                    bars_rent = ax1.bar(x, rent_counts, label='전월세 거래량', color='orange', alpha=0.6)
-                    bars_buy = ax1.bar(x, buy_counts, label='매매 거래량', color='blue', alpha=0.6, bottom=rent_counts)
-                    ax1.set_xlabel('연-월')
-                    ax1.set_ylabel('거래량')
-                    ax2 = ax1.twinx()
-                    line_buy, = ax2.plot(x, buy_sums_y, label='매매 총액(억원)', color='navy', marker='o')
-                    line_rent, = ax2.plot(x, rent_sums_y, label='전월세 총액(억원)', color='darkorange', marker='o')
-                    ax2.set_ylabel('총액(억원)')
-                    ax1.set_xticks(x)
-                    ax1.set_xticklabels(keys)
-                    ax1.tick_params(axis='x', rotation=45)
-                    lines1, labels1 = ax1.get_legend_handles_labels()
-                    lines2, labels2 = ax2.get_legend_handles_labels()
-                    ax1.legend(lines1+lines2, labels1+labels2, loc='upper left')
-                    plt.title('월별 거래량 및 총액')
-                    plt.tight_layout()
-
-                    # build artist info
-                    artists_info = []
-                    for i, bar in enumerate(bars_rent):
-                        bar._series = '전월세 거래량'
-                        bar._x_label = keys[i]
-                        bar._y_value = rent_counts[i]
-                        artists_info.append({'artist': bar, 'type': 'bar', 'series': bar._series, 'x': keys[i], 'y': rent_counts[i]})
-                    for i, bar in enumerate(bars_buy):
-                        bar._series = '매매 거래량'
-                        bar._x_label = keys[i]
-                        bar._y_value = buy_counts[i]
-                        artists_info.append({'artist': bar, 'type': 'bar', 'series': bar._series, 'x': keys[i], 'y': buy_counts[i]})
-                    for i, xv in enumerate(x):
-                        artists_info.append({'artist': line_buy, 'type': 'line', 'series': '매매 총액(억원)', 'x': keys[i], 'xpos': xv, 'y': buy_sums_y[i]})
-                        artists_info.append({'artist': line_rent, 'type': 'line', 'series': '전월세 총액(억원)', 'x': keys[i], 'xpos': xv, 'y': rent_sums_y[i]})
-
-                    # use per-axis annotators and guide lines; close prior figures to avoid duplicates
-                    try:
-                        plt.close('all')
-                    except Exception:
-                        pass
-                    annotators = {}
-                    line_guides = {}
-
-                    def on_move(event):
-                        # hide when outside axes
-                        if event.inaxes is None:
-                            try:
-                                for a in annotators.values():
-                                    try:
-                                        if a is not None:
-                                            a.set_visible(False)
-                                    except Exception:
-                                        pass
-                            except Exception:
-                                pass
-                            try:
-                                for lg in line_guides.values():
-                                    if lg is not None:
-                                        lg.set_visible(False)
-                            except Exception:
-                                pass
-                            try:
-                                fig.canvas.draw_idle()
-                            except Exception:
-                                pass
-                            return
-
-                        # prefer line point proximity over bars
-                        try:
-                            for info in artists_info:
-                                if info['type'] == 'line':
-                                    art = info['artist']
-                                    ax_used = getattr(art, 'axes', event.inaxes)
-                                    try:
-                                        xpix, ypix = ax_used.transData.transform((info['xpos'], info['y']))
-                                    except Exception:
-                                        continue
-                                    px = event.x; py = event.y
-                                    dist = ((xpix - px)**2 + (ypix - py)**2)**0.5
-                                    if dist < 8:
-                                        annot = annotators.get(ax_used)
-                                        if annot is None:
-                                            try:
-                                                annot = ax_used.annotate('', xy=(0,0), xytext=(15,15), textcoords='offset points', bbox=dict(boxstyle='round', fc='w'), zorder=10)
-                                            except Exception:
-                                                annot = None
-                                            annotators[ax_used] = annot
-                                        yval = info['y']
-                                        if '억원' in info['series']:
-                                            text = f"{info['series']}\n{info['x']}\n{yval:.2f}"
-                                        else:
-                                            text = f"{info['series']}\n{info['x']}\n{yval}"
-                                        if annot is not None:
-                                            try:
-                                                annot.xy = (info['xpos'], info['y'])
-                                                annot.set_text(text)
-                                                annot.set_visible(True)
-                                            except Exception:
-                                                pass
-                                        try:
-                                            tp_x, tp_y = (event.x + 15, event.y + 15)
-                                            try:
-                                                tx, ty = ax_used.transData.inverted().transform((tp_x, tp_y))
-                                            except Exception:
-                                                tx, ty = info['xpos'], info['y']
-                                            lg = line_guides.get(ax_used)
-                                            if lg is None:
-                                                try:
-                                                    lg = ax_used.plot([], [], color='gray', linestyle='--', linewidth=0.8, zorder=2)[0]
-                                                except Exception:
-                                                    lg = None
-                                                line_guides[ax_used] = lg
-                                            if lg is not None:
-                                                try:
-                                                    lg.set_data([info['xpos'], tx], [info['y'], ty])
-                                                    lg.set_visible(True)
-                                                except Exception:
-                                                    pass
-                                        except Exception:
-                                            pass
-                                        try:
-                                            fig.canvas.draw_idle()
-                                        except Exception:
-                                            pass
-                                        return
-                        except Exception:
-                            pass
-
-                        try:
-                            for info in artists_info:
-                                if info['type'] == 'bar':
-                                    bar = info['artist']
-                                    contains, _ = bar.contains(event)
-                                    if contains:
-                                        ax_bar = bar.axes
-                                        annot = annotators.get(ax_bar)
-                                        if annot is None:
-                                            try:
-                                                annot = ax_bar.annotate('', xy=(0,0), xytext=(15,15), textcoords='offset points', bbox=dict(boxstyle='round', fc='w'), zorder=10)
-                                            except Exception:
-                                                annot = None
-                                            annotators[ax_bar] = annot
-                                        yval = info['y']
-                                        text = f"{info['series']}\n{info['x']}\n{yval}"
-                                        if annot is not None:
-                                            try:
-                                                bx = bar.get_x() + bar.get_width()/2.0
-                                                by = bar.get_height()
-                                                annot.xy = (bx, by)
-                                                annot.set_text(text)
-                                                annot.set_visible(True)
-                                            except Exception:
-                                                pass
-                                        try:
-                                            tp_x, tp_y = (event.x + 15, event.y + 15)
-                                            try:
-                                                tx, ty = ax_bar.transData.inverted().transform((tp_x, tp_y))
-                                            except Exception:
-                                                tx, ty = bx, by
-                                            lg = line_guides.get(ax_bar)
-                                            if lg is None:
-                                                try:
-                                                    lg = ax_bar.plot([], [], color='gray', linestyle='--', linewidth=0.8, zorder=2)[0]
-                                                except Exception:
-                                                    lg = None
-                                                line_guides[ax_bar] = lg
-                                            if lg is not None:
-                                                try:
-                                                    lg.set_data([bx, tx], [by, ty])
-                                                    lg.set_visible(True)
-                                                except Exception:
-                                                    pass
-                                        except Exception:
-                                            pass
-                                        try:
-                                            fig.canvas.draw_idle()
-                                        except Exception:
-                                            pass
-                                        return
-                        except Exception:
-                            pass
-                    fig.canvas.mpl_connect('motion_notify_event', on_move)
-                    try:
-                        from PyQt5.QtWidgets import QDialog, QVBoxLayout
-                        dlg = QDialog(self)
-                        dlg.setWindowTitle(f"차트: {ctype}")
-                        # enable minimize/maximize buttons on the dialog
-                        try:
-                            dlg.setWindowFlags(dlg.windowFlags() | Qt.WindowMinMaxButtonsHint)
-                        except Exception:
-                            pass
-                        lay = QVBoxLayout(dlg)
-                        try:
-                            canvas = FigureCanvas(fig)
-                            try:
-                                tb = NavigationToolbar(canvas, dlg)
-                                lay.addWidget(tb)
-                            except Exception:
-                                pass
-                            lay.addWidget(canvas)
-                            dlg.resize(1000, 700)
-                            dlg.exec_()
-                        except Exception:
-                            plt.show()
-                    except Exception:
-                        plt.show()
+                # 차트 창은 한 번만 만들고 이후에는 막대 높이/선 데이터만 갱신 (비모달)
+                panel = getattr(self, '_apt_chart_panel', None)
+                if panel is None:
+                    panel = self._apt_chart_panel = AptChartPanel(self)
+                with perf_metrics.stage('apt.chart.render'):
+                    panel.update_data(ctype, keys, buy_counts, rent_counts, buy_sums_y, rent_sums_y)
+                panel.show()
+                panel.raise_()
+                panel.activateWindow()
             except Exception as e:
                 QMessageBox.critical(self, "차트 생성 실패", str(e))
         except Exception as e:
@@ -4377,6 +7978,14 @@ class VWorldAdmCodeGUI(QWidget):
                     pass
         except Exception:
             pass
+        # 지표누리 세부표 프리패치 워커 정리
+        try:
+            p = getattr(self, '_ind_prefetch', None)
+            if p is not None and p.isRunning():
+                p.stop()
+                p.wait(3000)
+        except Exception:
+            pass
         try:
             super().closeEvent(event)
         except Exception:
@@ -4660,11 +8269,22 @@ class AptTradeGUI(QWidget):
  
 # Worker thread to fetch apartment trade data to avoid blocking UI
 class AptFetchWorker(QThread):
+    """실거래가 조회 엔진: (엔드포인트 x 지역코드 x 계약년월) 작업을 동시에 받아 한 표 배치의 행으로 합침
+
+    types: RtmsEndpoint.TYPE_NAMES 중 선택한 부동산 종류, include_rent면 전월세 API가 있는 종류는 전월세도 조회.
+    jobs: 미리 정한 작업 목록(RtmsBulkPlanner.plan)을 그 순서대로 실행; collect=False면 캐시만 채우고
+    행은 모으지 않음(전국 일괄 갱신). service_key는 키 하나 또는 ServiceKeyPool(여러 키에 나눠 요청).
+    일부 작업만 실패하면 나머지 결과와 함께 warning, 모두 실패하면 error.
+    """
     progress = pyqtSignal(int, int)  # current, total
     results_ready = pyqtSignal(list)
     error = pyqtSignal(str)
+    warning = pyqtSignal(str)
+    MAX_WORKERS = 6
+    WINDOW_PER_WORKER = 2  # 작업 스레드당 동시에 제출해 두는 작업 수
 
-    def __init__(self, lawd, months, service_key, include_rent=False, parent=None):
+    def __init__(self, lawd, months, service_key, include_rent=False, headers=None, parent=None,
+                 types=('아파트',), cache=None, max_workers=None, jobs=None, collect=True):
         super().__init__(parent)
         # `lawd` may be a single LAWD string or a list of LAWD strings.
         if isinstance(lawd, (list, tuple)):
@@ -4672,239 +8292,284 @@ class AptFetchWorker(QThread):
         else:
             self.lawd_list = [lawd]
         self.months = months
-        self.service_key = service_key
+        self.keys = service_key if isinstance(service_key, ServiceKeyPool) else ServiceKeyPool([service_key])
         self.include_rent = bool(include_rent)
+        self.endpoints = RtmsEndpoint.for_types(types, self.include_rent)
+        self.jobs = list(jobs) if jobs is not None else None
+        self.collect = bool(collect)
+        self.cache = cache
+        self.client = RtmsClient(cache)
+        self.stats = {'jobs': 0, 'fetched': 0, 'rows': 0}
+        self.max_workers = max_workers or self.MAX_WORKERS
+        # row layout headers (same as the GUI table) and the rollup cube filled while rows arrive
+        self.headers = list(headers or [])
+        self.cube = AptRollupCube()
         self._stop = False
 
     def stop(self):
-        # signal to stop after current request finishes
+        # 진행 중인 요청은 끝까지, 아직 시작하지 않은 작업은 취소
         self._stop = True
 
-    def run(self):
-        import requests, xml.etree.ElementTree as ET, time, re
-        rows = []
-        # total progress is (#lawd * #months); guard against zero
-        total = max(1, len(self.months) * max(1, len([l for l in self.lawd_list if l])))
-        logs_dir = os.path.join(os.getcwd(), "debug_logs")
-        try:
-            os.makedirs(logs_dir, exist_ok=True)
-        except Exception:
-            pass
-
-        def _find_text(item, candidates):
-            for cand in candidates:
-                try:
-                    v = item.findtext(cand)
-                except Exception:
-                    v = None
-                if v:
-                    return v
-            low_cands = [c.lower() for c in candidates]
-            for child in list(item):
-                t = (child.tag or "").lower()
-                for lc in low_cands:
-                    if lc in t:
-                        return child.text or ""
-            return ""
-
-        def _norm_amount(s):
-            if not s:
-                return ""
-            try:
-                return re.sub(r"[^0-9]", "", s)
-            except Exception:
-                return s
-
-        def _norm_rgst(s):
-            if not s:
-                return ""
-            try:
-                s2 = s.strip()
-                m = re.match(r"^(\d{2})[.\-/](\d{1,2})[.\-/](\d{1,2})$", s2)
-                if m:
-                    yy = int(m.group(1)); yyyy = 2000 + yy if yy < 100 else yy
-                    mm = int(m.group(2)); dd = int(m.group(3))
-                    return f"{yyyy:04d}-{mm:02d}-{dd:02d}"
-                m2 = re.match(r"^(\d{4})[.\-/](\d{1,2})[.\-/](\d{1,2})$", s2)
-                if m2:
-                    yyyy = int(m2.group(1)); mm = int(m2.group(2)); dd = int(m2.group(3))
-                    return f"{yyyy:04d}-{mm:02d}-{dd:02d}"
-                return s2
-            except Exception:
-                return s
+    def _fetch(self, job):
+        if self._stop:
+            return None, False
+        endpoint, lawd, ym = job
+        rows, fetched = self.client.fetch(endpoint, self.keys, lawd, ym, self.headers)
+        if not self.collect:
+            return len(rows), fetched
+        if rows:
+            # 큐브는 잠금으로 보호되므로 작업 스레드에서 바로 갱신
+            with perf_metrics.stage('apt.cube_update') as st:
+                self.cube.add_rows(rows, self.headers)
+                st['rows'] = len(rows)
+        return rows, fetched
 
+    def run(self):
+        with perf_metrics.profile('apt_fetch'), perf_metrics.stage('apt.fetch_total'):
+            self._run()
+
+    def _run(self):
+        from concurrent.futures import wait, FIRST_COMPLETED
+        from itertools import islice
+        # 작업은 하나씩 꺼내 제출하고 동시에 걸어 둔 작업은 WINDOW_PER_WORKER x 작업 스레드 수로 제한
+        # (전국 x 수년 x 전 종류면 수십만 건이라 한 번에 제출하면 future만으로 수백 MB)
+        jobs = self.jobs
+        if jobs is None:
+            lawds = [lawd for lawd in self.lawd_list if lawd]
+            n_jobs = len(self.endpoints) * len(lawds) * len(self.months)
+            jobs = ((ep, lawd, ym) for ep in self.endpoints for lawd in lawds for ym in self.months)
+        else:
+            n_jobs = len(jobs)
+        total = max(1, n_jobs)
+        # 요청 순서(종류 -> 지역 -> 월)대로 결과를 이어 붙이기 위해 작업 번호로 보관 (collect일 때만)
+        results = {}
+        failures = []
+        deferred = []  # 모든 키가 한도 초과/키 오류로 제외돼 받지 못한 작업 (캐시에 없으므로 다음 실행 때 이어서 받음)
         step = 0
-        for lawd in self.lawd_list:
-            if not lawd:
-                continue
-            for ym in self.months:
-                if getattr(self, '_stop', False):
-                    self.error.emit('취소됨')
-                    return
-                url = "https://apis.data.go.kr/1613000/RTMSDataSvcAptTrade/getRTMSDataSvcAptTrade"
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
-                    "Accept": "application/xml, text/xml, */*;q=0.01",
-                }
-                # paginate trade results (API returns up to 1000 rows per page)
-                page = 1
-                while True:
-                    if getattr(self, '_stop', False):
-                        self.error.emit('취소됨')
-                        return
-                    params = {
-                        "serviceKey": requests.utils.unquote(self.service_key),
-                        "LAWD_CD": lawd,
-                        "DEAL_YMD": ym,
-                        "pageNo": str(page),
-                        "numOfRows": "1000",
-                    }
-                    try:
-                        resp = requests.get(url, params=params, timeout=30, headers=headers)
-                        resp.raise_for_status()
-                    except Exception as e:
-                        self.error.emit(str(e))
-                        return
-                    # save raw response (per-page)
-                    try:
-                        ts = int(time.time())
-                        fname = os.path.join(logs_dir, f"debug_response_{lawd}_{ym}_p{page}_{ts}.xml")
-                        with open(fname, "wb") as fw:
-                            fw.write(resp.content)
-                        meta = os.path.join(logs_dir, f"debug_response_{lawd}_{ym}_p{page}_{ts}.meta.txt")
-                        with open(meta, "w", encoding='utf-8') as fm:
-                            fm.write(f"url: {resp.url}\nstatus: {resp.status_code}\nheaders: {dict(resp.headers)}\n")
-                    except Exception:
-                        pass
+        workers = max(1, min(self.max_workers, n_jobs or 1))
+        window = workers * self.WINDOW_PER_WORKER
+        queue = enumerate(jobs)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {}
+
+            def fill():
+                for i, job in islice(queue, window - len(pending)):
+                    pending[pool.submit(self._fetch, job)] = (i, job)
+
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    i, job = pending.pop(fut)
                     try:
-                        root = ET.fromstring(resp.content)
+                        part, fetched = fut.result()
+                        self.stats['jobs'] += 1
+                        self.stats['fetched'] += int(fetched)
+                        self.stats['rows'] += part if isinstance(part, int) else len(part or ())
+                        if part and self.collect:
+                            results[i] = part
+                    except RtmsQuotaError as e:
+                        if not deferred:
+                            perf_metrics.error('apt.job', e)
+                        deferred.append(str(e))
                     except Exception as e:
-                        self.error.emit(f"XML parse error ({ym} p{page}): {e}")
-                        return
-                    items = root.findall("body/items/item")
-                    if not items:
-                        break
-                    for it in items:
-                        trade_date = f"{it.findtext('dealYear') or ''}-{it.findtext('dealMonth') or ''}-{it.findtext('dealDay') or ''}"
-                        raw_amount = it.findtext("dealAmount") or ""
-                        amount_norm = _norm_amount(raw_amount)
-                        rgst_raw = it.findtext("rgstDate") or _find_text(it, ["registDay", "등기일자", "registrationDate", "rgstDate"])
-                        rgst_norm = _norm_rgst(rgst_raw)
-                        row = [
-                            it.findtext("aptNm") or "",
-                            it.findtext("aptDong") or _find_text(it, ["aptDong", "단지동", "동", "apt_dong"]),
-                            it.findtext("excluUseAr") or "",
-                            trade_date,
-                            amount_norm,
-                            it.findtext("floor") or "",
-                            it.findtext("buildYear") or "",
-                            it.findtext("umdNm") or "",
-                            it.findtext("jibun") or "",
-                            it.findtext("sggCd") or "",
-                            (it.findtext("dealingGbn") or _find_text(it, ["tradeType", "거래유형", "dealType", "dealingGbn"])),
-                            (it.findtext("estateAgentSggNm") or _find_text(it, ["bcnstAddr", "brokerAddr", "중개사소재지", "bcnstc", "estateAgentSggNm"])),
-                            rgst_norm,
-                            (it.findtext("slerGbn") or _find_text(it, ["seller", "거래주체정보_매도자", "매도자", "tradePartSeller", "slerGbn"])),
-                            _find_text(it, ["buyer", "거래주체정보_매수자", "매수자", "tradePartBuyer"]),
-                            _find_text(it, ["rentYn", "토지임대부", "landLease", "isLandLeaseApt"]),
-                        ]
-                        # pad trade rows with empty rent-related columns to keep column alignment
-                        try:
-                            row.insert(5, "")
-                        except Exception:
-                            pass
-                        row.extend(["", "", "", "", ""])  # 계약기간, ContractType, 갱신권사용, 종전보증금, 종전월세
-                        rows.append(row)
-                    # if fewer than page size, no more pages
-                    if len(items) < 1000:
-                        break
-                    page += 1
-                # if rent data requested, also call rent API for same lawd/ym
-                if getattr(self, 'include_rent', False):
+                        ep, lawd, ym = job
+                        perf_metrics.error('apt.job', e)
+                        failures.append(f"{ep.type_name}{'(전월세)' if ep.rent else ''} {lawd} {ym}: {e}")
+                    step += 1
                     try:
-                        url_r = "https://apis.data.go.kr/1613000/RTMSDataSvcAptRent/getRTMSDataSvcAptRent"
-                        page_r = 1
-                        while True:
-                            if getattr(self, '_stop', False):
-                                self.error.emit('취소됨')
-                                return
-                            params_r = {
-                                "serviceKey": requests.utils.unquote(self.service_key),
-                                "LAWD_CD": lawd,
-                                "DEAL_YMD": ym,
-                                "pageNo": str(page_r),
-                                "numOfRows": "1000",
-                            }
-                            try:
-                                resp_r = requests.get(url_r, params=params_r, timeout=30, headers=headers)
-                                resp_r.raise_for_status()
-                            except Exception:
-                                break
-                            # parse rent XML
-                            try:
-                                root_r = ET.fromstring(resp_r.content)
-                                items_r = root_r.findall("body/items/item")
-                            except Exception:
-                                items_r = []
-                            if not items_r:
-                                break
-                            for it2 in items_r:
-                                # rent items may use different tag names; use _find_text to discover
-                                trade_date_r = f"{it2.findtext('dealYear') or ''}-{it2.findtext('dealMonth') or ''}-{it2.findtext('dealDay') or ''}"
-                                # deposit(보증금) -> 거래금액, monthlyRent -> 월세(만원)
-                                raw_deposit = _find_text(it2, ["deposit", "보증금", "전세금", "rentMoney", "depositAmount"]) or ""
-                                deposit_norm = _norm_amount(raw_deposit)
-                                raw_month = _find_text(it2, ["monthlyRent", "월세", "rentFee"]) or ""
-                                month_norm = _norm_amount(raw_month)
-                                rgst_raw_r = _find_text(it2, ["rgstDate", "등기일자", "registrationDate"]) or ""
-                                rgst_norm_r = _norm_rgst(rgst_raw_r)
-                                # additional rent-specific fields
-                                contract_term = _find_text(it2, ["contractTerm", "계약기간"]) or ""
-                                contract_type = _find_text(it2, ["contractType", "ContractType"]) or ""
-                                use_rr = _find_text(it2, ["useRRRight", "갱신권사용"]) or ""
-                                pre_deposit = _find_text(it2, ["preDeposit", "종전보증금"]) or ""
-                                pre_month = _find_text(it2, ["preMonthlyRent", "종전월세"]) or ""
-
-                                row_r = [
-                                    it2.findtext("aptNm") or _find_text(it2, ["aptName", "단지명"]),
-                                    it2.findtext("aptDong") or _find_text(it2, ["aptDong", "동"]),
-                                    it2.findtext("excluUseAr") or _find_text(it2, ["excluUseAr", "전용면적"]),
-                                    trade_date_r,
-                                    deposit_norm,
-                                    it2.findtext("floor") or _find_text(it2, ["floor", "층"]),
-                                    it2.findtext("buildYear") or _find_text(it2, ["buildYear", "건축년도"]),
-                                    it2.findtext("umdNm") or _find_text(it2, ["umdNm", "법정동"]),
-                                    it2.findtext("jibun") or _find_text(it2, ["jibun", "지번"]),
-                                    it2.findtext("sggCd") or _find_text(it2, ["sggCd", "지역코드"]),
-                                    # 거래유형: 전월세 구분
-                                    (it2.findtext("dealingGbn") or _find_text(it2, ["tradeType", "거래유형", "dealType"])) or "전월세",
-                                    _find_text(it2, ["estateAgentSggNm", "중개사소재지"]),
-                                    rgst_norm_r,
-                                    _find_text(it2, ["slerGbn", "seller"]),
-                                    _find_text(it2, ["buyer", "매수자"]),
-                                    _find_text(it2, ["rentYn", "토지임대부"]),
-                                ]
-                                # insert 월세 value at index 5 (between 거래금액 and 층), then append remaining rent-specific columns
-                                try:
-                                    row_r.insert(5, month_norm)
-                                except Exception:
-                                    # if insert fails, append at end
-                                    row_r.append(month_norm)
-                                row_r.extend([contract_term, contract_type, use_rr, pre_deposit, pre_month])
-                                rows.append(row_r)
-                            # if fewer than page size, done
-                            if len(items_r) < 1000:
-                                break
-                            page_r += 1
+                        self.progress.emit(step, total)
                     except Exception:
-                        # ignore rent errors per-month and continue
                         pass
-                step += 1
+                if self._stop:
+                    for f in pending:
+                        f.cancel()
+                    break
+                fill()
+        if self.cache is not None:
+            try:
+                self.cache.save_volume()
+            except Exception as e:
+                perf_metrics.error('apt.cache.volume', e)
+        try:
+            self.keys.save()
+        except Exception as e:
+            perf_metrics.error('apt.key_usage', e)
+        if self._stop:
+            self.error.emit('취소됨')
+            return
+        if n_jobs and len(failures) + len(deferred) == n_jobs:
+            self.error.emit((failures or deferred)[0])
+            return
+        rows = []
+        for i in sorted(results):
+            rows.extend(results[i])
+        notes = []
+        if deferred:
+            notes.append(f"한도 소진으로 미룬 작업 {len(deferred)}건 (다시 실행하면 이어서 받음)")
+        if failures:
+            more = f" 외 {len(failures) - 1}건" if len(failures) > 1 else ""
+            notes.append(f"일부 조회 실패 {len(failures)}/{n_jobs}건: {failures[0]}{more}")
+        if notes:
+            self.warning.emit(" / ".join(notes))
+        self.results_ready.emit(rows)
+
+
+class RtmsPlanWorker(QThread):
+    """전국 시군구 지역코드를 받아(또는 캐시에서) 일괄 조회 계획을 세움 — 브이월드 요청이 GUI를 막지 않도록"""
+    done = pyqtSignal(object)  # RtmsBulkPlanner.plan 결과 + 'lawds'
+    failed = pyqtSignal(str)
+
+    def __init__(self, planner, vworld_key, endpoints, months, keys=None, parent=None):
+        super().__init__(parent)
+        self.planner = planner
+        self.keys = keys
+        self.vworld_key = vworld_key
+        self.endpoints = endpoints
+        self.months = months
+
+    def run(self):
+        try:
+            with perf_metrics.stage('apt.bulk_plan'):
+                lawds = [c for c, _ in self.planner.lawd_codes(self.vworld_key)]
+                plan = self.planner.plan(self.endpoints, lawds, self.months, self.keys)
+        except Exception as e:
+            perf_metrics.error('apt.bulk_plan', e)
+            self.failed.emit(str(e))
+            return
+        plan['lawds'] = lawds
+        self.done.emit(plan)
+
+
+class CatalogWorker(QThread):
+    """출처(StatsProvider) 목록 한 단계를 백그라운드에서 받아 캐시 갱신 (node 의미는 출처별)"""
+    done = pyqtSignal(object, bool)  # node, changed
+    failed = pyqtSignal(object, str)  # node, message
+
+    def __init__(self, provider, service_key, node=None, parent=None):
+        super().__init__(parent)
+        self.provider = provider
+        self.service_key = service_key
+        self.node = node
+
+    def run(self):
+        try:
+            changed = self.provider.refresh_catalog(self.service_key, self.node)
+        except Exception as e:
+            perf_metrics.error(f"catalog.{self.provider.NAME}", e)
+            self.failed.emit(self.node, str(e))
+            return
+        self.done.emit(self.node, changed)
+
+
+class SeriesFetchWorker(QThread):
+    """출처(StatsProvider)의 시리즈 조회 여러 건을 GUI 스레드 밖에서 동시에 실행
+
+    jobs: [(spec, start, end)] ; 받은 시리즈마다 series_ready(EcosSeries), 끝나면 done(시리즈 수, 새로 받은 행 수)
+    """
+    progress = pyqtSignal(int, int)  # done, total
+    series_ready = pyqtSignal(object)
+    failed = pyqtSignal(object, str)  # spec, message
+    done = pyqtSignal(int, int)
+
+    def __init__(self, provider, service_key, jobs, max_workers=6, parent=None):
+        super().__init__(parent)
+        self.provider = provider
+        self.service_key = service_key
+        self.jobs = list(jobs)
+        self.max_workers = max_workers
+        self._stop = False
+
+    def stop(self):
+        self._stop = True
+
+    def _fetch(self, job):
+        spec, start, end = job
+        if self._stop:
+            return [], 0
+        return self.provider.fetch(self.service_key, spec, start, end)
+
+    def run(self):
+        from concurrent.futures import as_completed
+        total = len(self.jobs)
+        done = n_series = n_fetched = 0
+        stage = f"series.{self.provider.NAME}"
+        with perf_metrics.stage(stage) as st, ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, total)),
+                                                                 initializer=_mark_fanout_thread) as pool:
+            futures = {pool.submit(self._fetch, job): job for job in self.jobs}
+            for fut in as_completed(futures):
+                job = futures[fut]
                 try:
-                    self.progress.emit(min(step, total), total)
-                except Exception:
+                    series, fetched = fut.result()
+                    n_fetched += fetched
+                    for ser in series:
+                        self.series_ready.emit(ser)
+                        n_series += 1
+                        st['rows'] = st.get('rows', 0) + len(ser)
+                except Exception as e:
+                    perf_metrics.error(stage, e)
+                    self.failed.emit(job[0], str(e))
+                done += 1
+                self.progress.emit(done, total)
+        self.done.emit(n_series, n_fetched)
+
+
+class IndPrefetchWorker(QThread):
+    """지표누리 상세 표를 백그라운드에서 받아 IndDetailCache에 채움
+
+    작업은 (지표코드, 통계표코드, 수정일). 지금 선택한 항목은 push(front=True)로 맨 앞에 넣고,
+    이웃/최근 수정 항목은 뒤에 쌓아 미리 받음. 이미 최신 캐시가 있는 항목은 건너뜀.
+    """
+    loaded = pyqtSignal(object)  # (ixcode, statscode, upd)
+    failed = pyqtSignal(object, str, bool)  # job, message, 파싱 실패 여부
+    NEIGHBORS = 2  # 선택 항목 앞뒤로 미리 받을 개수
+    RECENT = 5  # 최근 수정된(목록 맨 위) 항목 수
+
+    def __init__(self, cache, service_key, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.service_key = service_key
+        self._jobs = deque()
+        self._lock = threading.Lock()
+        self._stop = False
+
+    def push(self, jobs, front=False):
+        with self._lock:
+            for job in (reversed(jobs) if front else jobs):
+                try:
+                    self._jobs.remove(job)
+                except ValueError:
                     pass
-        self.results_ready.emit(rows)
+                if front:
+                    self._jobs.appendleft(job)
+                else:
+                    self._jobs.append(job)
+
+    def stop(self):
+        self._stop = True
+
+    def run(self):
+        while not self._stop:
+            with self._lock:
+                if not self._jobs:
+                    return
+                job = self._jobs.popleft()
+            ixcode, statscode, upd = job
+            if self.cache.get(ixcode, statscode, upd) is not None:
+                perf_metrics.incr('ind.detail.prefetch_skip')
+                self.loaded.emit(job)
+                continue
+            try:
+                self.cache.fetch(self.service_key, ixcode, statscode, upd)
+            except ValueError as e:
+                self.failed.emit(job, str(e), True)
+                continue
+            except Exception as e:
+                perf_metrics.error('ind.detail', e)
+                self.failed.emit(job, str(e), False)
+                continue
+            self.loaded.emit(job)
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -0,0 +1,134 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+import address_search as A
+
+OK = (b"<response><header><resultCode>000</resultCode></header><body><items>"
+      b"<item><dealYear>2024</dealYear><dealMonth>1</dealMonth><dealDay>2</dealDay><dealAmount>10,000</dealAmount></item>"
+      b"</items><totalCount>1</totalCount></body></response>")
+LIMITED = (b"<response><header><resultCode>22</resultCode>"
+           b"<resultMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</resultMsg></header></response>")
+
+
+class FakeResponse:
+    def __init__(self, status=200, content=OK, headers=None):
+        self.status_code = status
+        self.content = content
+        self.headers = headers or {}
+        self.url = 'https://apis.data.go.kr/fake'
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+
+class FakeSession:
+    """키마다 미리 정한 응답을 차례로 돌려주고(마지막 응답은 반복) 요청한 키를 기록"""
+
+    def __init__(self, script):
+        self.script = {k: list(v) for k, v in script.items()}
+        self.calls = []
+
+    def get(self, url, params=None, **kwargs):
+        key = params['serviceKey']
+        self.calls.append(key)
+        queue = self.script[key]
+        return queue.pop(0) if len(queue) > 1 else queue[0]
+
+
+class FastClient(A.RtmsClient):
+    BACKOFF = 0.0
+
+
+class RtmsKeyPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # 오류 응답 덤프(debug_logs)가 저장소가 아닌 임시 폴더에 쌓이도록
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.endpoint = A.RtmsEndpoint.for_types(['아파트'])[0]
+        self.service = self.endpoint.service
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def _pool(self, keys):
+        return A.ServiceKeyPool(keys, path=os.path.join(self.tmp.name, 'key_usage.json'), quota=100)
+
+    def _client(self, script):
+        client = FastClient()
+        client.session = FakeSession(script)
+        return client
+
+    def test_429_is_retried_on_same_key_without_exhausting_it(self):
+        throttled = FakeResponse(429, b'', {'Retry-After': '0'})
+        client = self._client({'KA': [throttled, throttled, FakeResponse()], 'KB': [FakeResponse()]})
+        pool = self._pool(['KA', 'KB'])
+        items, total = client.get_page_pooled(self.endpoint, pool, '11110', '202401', 1)
+        self.assertEqual((len(items), total), (1, 1))
+        self.assertEqual(client.session.calls, ['KA', 'KA', 'KA'])
+        self.assertEqual(pool.used('KA', self.service), 1)
+        self.assertEqual(pool.remaining(self.service), 199)
+
+    def test_persistent_429_fails_the_page_but_keeps_the_key(self):
+        client = self._client({'KA': [FakeResponse(429, b'')], 'KB': [FakeResponse()]})
+        pool = self._pool(['KA', 'KB'])
+        with self.assertRaises(requests.HTTPError):
+            client.get_page_pooled(self.endpoint, pool, '11110', '202401', 1)
+        self.assertEqual(len(client.session.calls), FastClient.RETRIES + 1)
+        self.assertLess(pool.used('KA', self.service), pool.quota)
+
+    def test_5xx_is_retried(self):
+        client = self._client({'KA': [FakeResponse(503, b''), FakeResponse()]})
+        items, _ = client.get_page_pooled(self.endpoint, self._pool(['KA']), '11110', '202401', 1)
+        self.assertEqual(len(items), 1)
+
+    def test_quota_code_and_403_move_to_next_key(self):
+        client = self._client({'KA': [FakeResponse(content=LIMITED)], 'KB': [FakeResponse(403, b'')],
+                               'KC': [FakeResponse()]})
+        pool = self._pool(['KA', 'KB', 'KC'])
+        items, _ = client.get_page_pooled(self.endpoint, pool, '11110', '202401', 1)
+        self.assertEqual(len(items), 1)
+        self.assertEqual(sorted(client.session.calls), ['KA', 'KB', 'KC'])
+        self.assertEqual(pool.used('KA', self.service), 1)
+        # 서버가 거부한 키는 남은 한도 추정에서 빠짐
+        self.assertEqual(pool.remaining(self.service), pool.quota - 1)
+
+    def test_exhausted_keys_stop_after_one_attempt_each(self):
+        client = self._client({'KA': [FakeResponse(content=LIMITED)], 'KB': [FakeResponse(401, b'')]})
+        pool = self._pool(['KA', 'KB'])
+        with self.assertRaises(A.RtmsQuotaError):
+            client.get_page_pooled(self.endpoint, pool, '11110', '202401', 1)
+        self.assertEqual(sorted(client.session.calls), ['KA', 'KB'])
+        self.assertEqual(pool.remaining(self.service), 0)
+        # 남은 키가 없으면 요청 없이 바로 실패
+        with self.assertRaises(A.RtmsQuotaError):
+            client.get_page_pooled(self.endpoint, pool, '11110', '202402', 1)
+        self.assertEqual(len(client.session.calls), 2)
+
+    def test_local_quota_does_not_block_requests(self):
+        pool = A.ServiceKeyPool(['KA'], path=os.path.join(self.tmp.name, 'key_usage.json'), quota=2)
+        for _ in range(5):
+            self.assertEqual(pool.acquire(self.service), 'KA')
+        self.assertEqual(pool.remaining(self.service), 0)
+
+    def test_usage_and_exhausted_keys_are_persisted_per_day(self):
+        pool = self._pool(['KA', 'KB'])
+        for _ in range(3):
+            pool.acquire(self.service)
+        pool.exhaust('KB', self.service)
+        pool.save()
+        again = self._pool(['KA', 'KB'])
+        self.assertEqual(again.used('KA', self.service) + again.used('KB', self.service), 3)
+        self.assertEqual({again.acquire(self.service) for _ in range(3)}, {'KA'})
+
+
+if __name__ == '__main__':
+    unittest.main()